@@ -0,0 +1,123 @@
+"""
+Measure event-loop lag caused by logging on the repository hot path.
+
+Simulates clients polling job progress while a probe task measures how late the
+event loop wakes it up. Compares the previous synchronous handlers against the
+queue-based pipeline from config.logging, with and without DEBUG sampling.
+
+    python -m benchmarks.logging_latency [--polls 20000] [--clients 50]
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from config.logging import setup_logging, shutdown_logging
+from src.domain import SummaryProgress, SummaryStatus
+from src.infrastructure import InMemorySummaryRepository
+
+
+PROBE_INTERVAL = 0.001
+
+
+def configure_synchronous(log_file: str, stream) -> None:
+    """The previous setup: console and file handlers attached directly to loggers"""
+    shutdown_logging()
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s")
+    handlers: List[logging.Handler] = [logging.StreamHandler(stream), logging.FileHandler(log_file)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    src_logger = logging.getLogger("src")
+    for handler in list(src_logger.handlers):
+        src_logger.removeHandler(handler)
+    for handler in handlers:
+        src_logger.addHandler(handler)
+    src_logger.setLevel(logging.DEBUG)
+    src_logger.propagate = False
+
+
+async def probe_lag(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def poll(repository: InMemorySummaryRepository, request_id: str, polls: int) -> None:
+    progress = SummaryProgress(
+        request_id=request_id,
+        current_document_index=0,
+        total_documents=polls,
+        current_summary="",
+        status=SummaryStatus.IN_PROGRESS
+    )
+    for i in range(polls):
+        progress.current_document_index = i
+        await repository.save_progress(progress)
+        await repository.get_progress(request_id)
+        await asyncio.sleep(0)
+
+
+async def run_workload(polls: int, clients: int) -> Dict[str, float]:
+    repository = InMemorySummaryRepository()
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(lags, stop))
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(poll(repository, f"job-{i}", polls // clients) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await probe
+    lags.sort()
+    return {
+        "wall_s": elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] * 1000,
+        "lag_max_ms": lags[-1] * 1000
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--polls", type=int, default=20000, help="Total progress polls across all clients")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent polling clients")
+    args = parser.parse_args()
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["LOG_FILE"] = os.path.join(tmp, "bench.log")
+        with open(os.path.join(tmp, "console.log"), "w") as console:
+            with contextlib.redirect_stdout(console):
+                configure_synchronous(os.environ["LOG_FILE"], console)
+                results["synchronous"] = asyncio.run(run_workload(args.polls, args.clients))
+                
+                setup_logging("DEBUG", log_format="text")
+                results["queued"] = asyncio.run(run_workload(args.polls, args.clients))
+                
+                setup_logging("DEBUG", log_format="json")
+                results["queued+json"] = asyncio.run(run_workload(args.polls, args.clients))
+                
+                setup_logging("DEBUG", log_format="json", debug_sample_every=10)
+                results["queued+sampled(1/10)"] = asyncio.run(run_workload(args.polls, args.clients))
+                shutdown_logging()
+    
+    print(f"{'pipeline':<22}{'wall s':>10}{'lag p50 ms':>12}{'lag p99 ms':>12}{'lag max ms':>12}")
+    for name, stats in results.items():
+        print(
+            f"{name:<22}{stats['wall_s']:>10.3f}{stats['lag_p50_ms']:>12.3f}"
+            f"{stats['lag_p99_ms']:>12.3f}{stats['lag_max_ms']:>12.3f}",
+            file=sys.stdout
+        )
+
+
+if __name__ == "__main__":
+    main()
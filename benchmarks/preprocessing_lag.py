@@ -0,0 +1,108 @@
+"""
+Measure event-loop lag caused by document preprocessing.
+
+Simulates concurrent hierarchical requests whose markdown is parsed before any LLM
+call, while a probe task measures how late the event loop wakes it up. Compares
+parsing inline on the event loop against the ProcessPoolPreprocessor.
+
+    python -m benchmarks.preprocessing_lag [--requests 20] [--documents 8] [--sections 400]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from src.domain import prepare_batch
+from src.infrastructure import ProcessPoolPreprocessor
+
+
+PROBE_INTERVAL = 0.001
+
+
+def make_document(number: int, sections: int) -> str:
+    parts = [f"# Document {number}", "Introductory paragraph. " * 20]
+    for section in range(sections):
+        parts.append(f"## Section {section}")
+        parts.append(f"Body text for section {section} of document {number}. " * 10)
+        parts.append(f"### Detail {section}")
+        parts.append("- a bullet point\n- another bullet point\n" * 3)
+    return "\n\n".join(parts)
+
+
+async def probe_lag(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run_workload(contents: List[List[str]], preprocessor) -> Dict[str, float]:
+    async def inline(request: List[str]):
+        return prepare_batch(request)
+    
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(lags, stop))
+    
+    start = time.perf_counter()
+    prepare = preprocessor.prepare if preprocessor else inline
+    await asyncio.gather(*(prepare(request) for request in contents))
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await probe
+    lags.sort()
+    return {
+        "wall_s": elapsed,
+        "probes": len(lags),
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p99_ms": lags[max(int(len(lags) * 0.99) - 1, 0)] * 1000,
+        "lag_max_ms": lags[-1] * 1000
+    }
+
+
+async def run_all(contents: List[List[str]], workers: int) -> Dict[str, Dict[str, float]]:
+    results = {"inline": await run_workload(contents, None)}
+    
+    preprocessor = ProcessPoolPreprocessor(max_workers=workers)
+    try:
+        # Start the workers outside the measurement
+        await preprocessor.prepare(contents[0])
+        results[f"process pool ({workers})"] = await run_workload(contents, preprocessor)
+    finally:
+        await preprocessor.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="Concurrent hierarchical requests")
+    parser.add_argument("--documents", type=int, default=8, help="Documents per request")
+    parser.add_argument("--sections", type=int, default=400, help="Sections per document")
+    parser.add_argument(
+        "--workers", type=int, default=min(4, os.cpu_count() or 1), help="Preprocessing worker processes"
+    )
+    args = parser.parse_args()
+    
+    contents = [
+        [make_document(document, args.sections) for document in range(args.documents)]
+        for _ in range(args.requests)
+    ]
+    results = asyncio.run(run_all(contents, args.workers))
+    
+    # Workers only run beside the event loop when there are cores to spare
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'preprocessing':<22}{'wall s':>10}{'probes':>8}{'lag p50 ms':>12}{'lag p99 ms':>12}{'lag max ms':>12}")
+    for name, stats in results.items():
+        print(
+            f"{name:<22}{stats['wall_s']:>10.3f}{stats['probes']:>8}{stats['lag_p50_ms']:>12.3f}"
+            f"{stats['lag_p99_ms']:>12.3f}{stats['lag_max_ms']:>12.3f}",
+            file=sys.stdout
+        )
+
+
+if __name__ == "__main__":
+    main()
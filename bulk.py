@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from config.logging import setup_logging, shutdown_logging
+from src.domain import Document, LLMService, SummaryRequest, SummaryStatus, SummaryStrategy
+from src.infrastructure import InMemorySummaryRepository, build_llm_service
+from src.use_cases import SummaryUseCase
+
+
+logger = logging.getLogger("src.bulk")
+
+MANIFEST_SUFFIXES = (".ndjson", ".jsonl")
+
+
+@dataclass
+class BulkItem:
+    """One summary job: an id unique within the run plus its documents, or why it could not be read"""
+    item_id: str
+    source: str
+    documents: List[Document]
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkStats:
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def iter_items(source: str, pattern: str = "**/*.md") -> Iterator[BulkItem]:
+    """
+    Yield jobs lazily from a directory tree, a glob or an NDJSON manifest.
+    
+    Manifest lines are objects with an optional "id" and one of "path" (relative to
+    the manifest), "content" (with optional "title") or "documents" (a list of
+    {"content", "title", "metadata"} objects summarized together).
+    
+    Files that cannot be read as UTF-8 and malformed manifest lines are yielded as
+    items carrying an error, so one bad input fails alone instead of ending the run.
+    """
+    if os.path.isdir(source):
+        root = Path(source)
+        for path in sorted(root.glob(pattern)):
+            if path.is_file():
+                yield _file_item(path, path.relative_to(root).as_posix())
+    elif source.endswith(MANIFEST_SUFFIXES) and os.path.isfile(source):
+        yield from _iter_manifest(Path(source))
+    else:
+        for name in sorted(glob.iglob(source, recursive=True)):
+            path = Path(name)
+            if path.is_file():
+                yield _file_item(path, path.as_posix())
+
+
+def _file_item(path: Path, item_id: str) -> BulkItem:
+    try:
+        content = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return BulkItem(item_id=item_id, source=str(path), documents=[], error=f"Could not read {path}: {e}")
+    return BulkItem(item_id=item_id, source=str(path), documents=[Document(content=content, title=path.stem)])
+
+
+def _iter_manifest(manifest: Path) -> Iterator[BulkItem]:
+    # Read as bytes so an undecodable line only fails that line
+    with manifest.open("rb") as lines:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = _manifest_item(manifest, line, line_number)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                item = BulkItem(
+                    item_id=f"{manifest.name}:{line_number}",
+                    source=f"{manifest}:{line_number}",
+                    documents=[],
+                    error=f"Invalid manifest line: {e!r}"
+                )
+            yield item
+
+
+def _manifest_item(manifest: Path, line: bytes, line_number: int) -> BulkItem:
+    entry: Dict[str, Any] = json.loads(line)
+    # Manifests often carry numeric ids; item ids name output files, so they are strings
+    item_id = str(entry["id"]) if entry.get("id") not in (None, "") else None
+    if "path" in entry:
+        return _file_item(manifest.parent / entry["path"], item_id or str(entry["path"]))
+    
+    if "documents" in entry:
+        documents = [
+            Document(content=doc["content"], title=doc.get("title"), metadata=doc.get("metadata"))
+            for doc in entry["documents"]
+        ]
+    else:
+        documents = [Document(content=entry["content"], title=entry.get("title"))]
+    return BulkItem(
+        item_id=item_id or f"{manifest.name}:{line_number}",
+        source=f"{manifest}:{line_number}",
+        documents=documents
+    )
+
+
+class ResultWriter:
+    """
+    Writes results as they finish and remembers what is already done.
+    
+    A *.jsonl output gets one line per result, flushed immediately; a directory output
+    gets one markdown file per item, written atomically and named after the full item id
+    (a.md becomes a.md.summary.md), so sources differing only in extension do not
+    collide. Either way, a rerun of the same backfill skips every item with a completed
+    result and retries failed ones.
+    """
+    
+    def __init__(self, output: str):
+        self.output = Path(output)
+        self.jsonl = output.endswith(".jsonl")
+        self._handle = None
+        
+        if self.jsonl:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            self.output.mkdir(parents=True, exist_ok=True)
+    
+    def completed_ids(self) -> Set[str]:
+        if not self.jsonl:
+            return set()
+        
+        completed: Set[str] = set()
+        if self.output.exists():
+            with self.output.open(encoding="utf-8") as lines:
+                for line in lines:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave the last line truncated
+                        continue
+                    if record.get("status") == SummaryStatus.COMPLETED.value:
+                        completed.add(record["id"])
+        return completed
+    
+    def is_completed(self, item_id: str, completed: Set[str]) -> bool:
+        if self.jsonl:
+            return item_id in completed
+        return self._summary_path(item_id).exists()
+    
+    def write(self, item: BulkItem, status: SummaryStatus, summary: str, error: Optional[str]) -> None:
+        if self.jsonl:
+            if self._handle is None:
+                self._handle = self.output.open("a", encoding="utf-8")
+            record = {
+                "id": item.item_id,
+                "source": item.source,
+                "status": status.value,
+                "summary": summary,
+                "error": error
+            }
+            self._handle.write(json.dumps(record) + "\n")
+            self._handle.flush()
+            return
+        
+        if status != SummaryStatus.COMPLETED:
+            # Failed items leave no file behind and are retried on the next run
+            return
+        path = self._summary_path(item.item_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".partial")
+        partial.write_text(summary, encoding="utf-8")
+        os.replace(partial, path)
+    
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+    
+    def _summary_path(self, item_id: str) -> Path:
+        # Keep ids from escaping the output directory
+        parts = [part.replace(":", "_") for part in Path(item_id).parts if part not in ("..", "/", "\\")]
+        path = self.output.joinpath(*parts)
+        return path.with_name(path.name + ".summary.md")
+
+
+async def run_bulk(
+    items: Iterator[BulkItem],
+    service: SummaryUseCase,
+    repository: InMemorySummaryRepository,
+    writer: ResultWriter,
+    concurrency: int = 16,
+    strategy: SummaryStrategy = SummaryStrategy.REFINE
+) -> BulkStats:
+    """
+    Summarize items with at most `concurrency` jobs in flight.
+    
+    Items are pulled from the iterator through a bounded queue, so memory stays flat
+    however many files the backfill covers.
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency must be positive")
+    
+    stats = BulkStats()
+    completed = writer.completed_ids()
+    queue: "asyncio.Queue[Optional[BulkItem]]" = asyncio.Queue(maxsize=concurrency * 2)
+    started = time.monotonic()
+    
+    async def produce():
+        for item in items:
+            if writer.is_completed(item.item_id, completed):
+                stats.skipped += 1
+                continue
+            if item.error is not None:
+                writer.write(item, SummaryStatus.FAILED, "", item.error)
+                stats.failed += 1
+                logger.warning("Skipping %s: %s", item.source, item.error)
+                continue
+            await queue.put(item)
+        for _ in range(concurrency):
+            await queue.put(None)
+    
+    async def work():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            
+            request = SummaryRequest(request_id=item.item_id, documents=item.documents, strategy=strategy)
+            result = await service.create_summary(request)
+            writer.write(item, result.status, result.summary, result.error_message)
+            repository.discard(item.item_id)
+            
+            if result.status == SummaryStatus.COMPLETED:
+                stats.completed += 1
+            else:
+                stats.failed += 1
+                logger.warning("Failed to summarize %s: %s", item.source, result.error_message)
+            
+            done = stats.completed + stats.failed
+            if done % 100 == 0:
+                rate = done / max(time.monotonic() - started, 1e-9)
+                logger.info("Summarized %s items (%s failed, %.1f/s)", done, stats.failed, rate)
+    
+    producer = asyncio.create_task(produce())
+    try:
+        await asyncio.gather(producer, *(work() for _ in range(concurrency)))
+    finally:
+        producer.cancel()
+        writer.close()
+    
+    stats.elapsed_seconds = time.monotonic() - started
+    return stats
+
+
+def build_service(llm_service: LLMService, summary_token_budget: Optional[int] = None) -> SummaryUseCase:
+    return SummaryUseCase(llm_service, InMemorySummaryRepository(), summary_token_budget=summary_token_budget)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Summarize a directory, glob or NDJSON manifest of markdown documents")
+    parser.add_argument("source", help="Directory, glob pattern or .ndjson/.jsonl manifest")
+    parser.add_argument("output", help="Output directory, or a .jsonl file for one result per line")
+    parser.add_argument("--pattern", default="**/*.md", help="File pattern used when source is a directory")
+    parser.add_argument("--concurrency", type=int, default=16, help="Summary jobs in flight at once")
+    parser.add_argument(
+        "--strategy",
+        choices=[strategy.value for strategy in SummaryStrategy],
+        default=SummaryStrategy.REFINE.value
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+    
+    anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not anthropic_api_key:
+        raise ValueError("ANTHROPIC_API_KEY environment variable is required")
+    
+    # Same model routing and circuit breaker as the HTTP service
+    llm_service = build_llm_service(
+        anthropic_api_key,
+        os.getenv("LLM_MODEL") or None,
+        os.getenv("LLM_REFINE_MODEL") or None,
+        os.getenv("LLM_FINAL_MODEL") or None,
+        os.getenv("LLM_FALLBACK_MODEL") or None
+    )
+    summary_token_budget = os.getenv("SUMMARY_TOKEN_BUDGET")
+    service = build_service(llm_service, int(summary_token_budget) if summary_token_budget else None)
+    
+    try:
+        stats = asyncio.run(run_bulk(
+            iter_items(args.source, args.pattern),
+            service,
+            service.repository,
+            ResultWriter(args.output),
+            concurrency=args.concurrency,
+            strategy=SummaryStrategy(args.strategy)
+        ))
+    finally:
+        shutdown_logging()
+    
+    print(
+        f"completed={stats.completed} failed={stats.failed} skipped={stats.skipped} "
+        f"elapsed={stats.elapsed_seconds:.1f}s"
+    )
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from config.logging import setup_logging, shutdown_logging
+from src.domain import Document, JobPriority, SummaryStrategy
+from src.domain.tokens import CHARS_PER_TOKEN
+from src.web import create_app
+
+
+logger = logging.getLogger("src.capacity")
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+@dataclass
+class TraceEntry:
+    """One recorded request: its arrival time relative to the first one, and its payload"""
+    offset_seconds: float
+    documents: List[Document]
+    strategy: Optional[SummaryStrategy] = None
+    tenant: str = "default"
+    priority: JobPriority = JobPriority.BATCH
+
+
+@dataclass
+class ScenarioResult:
+    """How one configuration handled the trace; durations are in production seconds"""
+    concurrency: int
+    strategy: str
+    submitted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+    duration_seconds: float = 0.0
+    latency_p50_seconds: Optional[float] = None
+    latency_p99_seconds: Optional[float] = None
+    queue_wait_p99_seconds: Optional[float] = None
+    llm_calls: int = 0
+    rate_limited: int = 0
+    provider_errors: int = 0
+    peak_llm_in_flight: int = 0
+    cost_usd: float = 0.0
+    
+    @property
+    def throughput_per_minute(self) -> float:
+        return self.completed / self.duration_seconds * 60 if self.duration_seconds else 0.0
+
+
+def synthesize_document(tokens: int, section_tokens: int = 400) -> str:
+    """Markdown of roughly `tokens` tokens, split under headings like a real document"""
+    paragraph = "Recorded document text standing in for the original content. "
+    sections = []
+    remaining = tokens * CHARS_PER_TOKEN
+    number = 1
+    while remaining > 0:
+        size = min(remaining, section_tokens * CHARS_PER_TOKEN)
+        body = (paragraph * (size // len(paragraph) + 1))[:size]
+        sections.append(f"## Section {number}\n\n{body}")
+        remaining -= size
+        number += 1
+    return "# Document\n\n" + "\n\n".join(sections)
+
+
+def load_trace(path: str) -> List[TraceEntry]:
+    """
+    Read an NDJSON trace, one request per line, in any order.
+    
+    Each line has either "offset_seconds" or an epoch "timestamp" (made relative to the
+    earliest), plus "documents" ({"content", "title"} objects) or "document_tokens" (a
+    list of document sizes, synthesized so that recorded traces need not carry content).
+    "strategy", "tenant" and "priority" are optional, as in the API.
+    """
+    raw: List[Tuple[float, Dict[str, Any]]] = []
+    with Path(path).open(encoding="utf-8") as lines:
+        for line in lines:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            raw.append((float(entry.get("offset_seconds", entry.get("timestamp", 0.0))), entry))
+    if not raw:
+        return []
+    
+    start = min(at for at, _ in raw)
+    trace = []
+    for at, entry in sorted(raw, key=lambda pair: pair[0]):
+        if "documents" in entry:
+            documents = [Document(content=doc["content"], title=doc.get("title")) for doc in entry["documents"]]
+        else:
+            documents = [Document(content=synthesize_document(tokens)) for tokens in entry["document_tokens"]]
+        trace.append(TraceEntry(
+            offset_seconds=at - start,
+            documents=documents,
+            strategy=SummaryStrategy(entry["strategy"]) if entry.get("strategy") else None,
+            tenant=entry.get("tenant", "default"),
+            priority=JobPriority(entry.get("priority", JobPriority.BATCH.value))
+        ))
+    return trace
+
+
+def synthetic_trace(
+    requests: int,
+    rate_per_second: float,
+    document_tokens: int = 3000,
+    documents_per_request: int = 3,
+    seed: Optional[int] = None
+) -> List[TraceEntry]:
+    """Poisson arrivals of identically shaped requests"""
+    generator = random.Random(seed)
+    document = synthesize_document(document_tokens)
+    trace = []
+    at = 0.0
+    for _ in range(requests):
+        trace.append(TraceEntry(offset_seconds=at, documents=[Document(content=document)] * documents_per_request))
+        at += generator.expovariate(rate_per_second)
+    return trace
+
+
+async def run_scenario(
+    trace: List[TraceEntry],
+    concurrency: int,
+    strategy: Optional[SummaryStrategy] = None,
+    speedup: float = 20.0,
+    simulator_options: Optional[Dict[str, Any]] = None,
+    app_options: Optional[Dict[str, Any]] = None,
+    poll_interval: float = 0.02
+) -> ScenarioResult:
+    """
+    Replay the trace against a fresh service backed by the LLM simulator, with arrivals
+    and the simulated provider both running `speedup` times faster than recorded.
+    """
+    # Metrics sit behind the debug token, so each run mounts them with a throwaway one
+    debug_token = secrets.token_urlsafe()
+    app = create_app(
+        llm_backend="simulated",
+        simulator_options={**(simulator_options or {}), "speedup": speedup},
+        max_concurrent_jobs=concurrency,
+        debug_token=debug_token,
+        **(app_options or {})
+    )
+    result = ScenarioResult(concurrency=concurrency, strategy=strategy.value if strategy else "trace")
+    latencies: List[float] = []
+    
+    # ASGITransport sends no lifespan events, so run startup and shutdown around the replay
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://capacity"
+    ) as client:
+        started = time.monotonic()
+        
+        async def replay(entry: TraceEntry) -> None:
+            await asyncio.sleep(max(0.0, entry.offset_seconds / speedup - (time.monotonic() - started)))
+            submitted_at = time.monotonic()
+            result.submitted += 1
+            response = await client.post("/summaries", json={
+                "documents": [{"content": doc.content, "title": doc.title} for doc in entry.documents],
+                "strategy": (strategy or entry.strategy or SummaryStrategy.REFINE).value,
+                "tenant": entry.tenant,
+                "priority": entry.priority.value
+            })
+            if response.status_code != 200:
+                result.rejected += 1
+                return
+            
+            request_id = response.json()["request_id"]
+            while True:
+                status = (await client.get(f"/summaries/{request_id}")).json()["status"]
+                if status in TERMINAL_STATUSES:
+                    break
+                await asyncio.sleep(poll_interval)
+            latencies.append((time.monotonic() - submitted_at) * speedup)
+            if status == "completed":
+                result.completed += 1
+            else:
+                result.failed += 1
+        
+        await asyncio.gather(*(replay(entry) for entry in trace))
+        result.duration_seconds = (time.monotonic() - started) * speedup
+        metrics = (await client.get("/metrics", headers={"Authorization": f"Bearer {debug_token}"})).json()
+    
+    latencies.sort()
+    if latencies:
+        result.latency_p50_seconds = latencies[len(latencies) // 2]
+        result.latency_p99_seconds = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+    waits = [
+        tenant["queue_wait_p99_seconds"]
+        for tenant in metrics["tenants"].values()
+        if tenant["queue_wait_p99_seconds"] is not None
+    ]
+    result.queue_wait_p99_seconds = max(waits) * speedup if waits else None
+    simulator = metrics["llm_simulator"]
+    result.llm_calls = simulator["calls"]
+    result.rate_limited = simulator["rate_limited"]
+    result.provider_errors = simulator["errors"]
+    result.peak_llm_in_flight = simulator["peak_in_flight"]
+    result.cost_usd = sum(model["cost_usd"] for model in metrics["models"].values())
+    return result
+
+
+def format_report(results: List[ScenarioResult]) -> str:
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+    
+    header = (
+        f"{'strategy':<18}{'conc':>5}{'sent':>6}{'429':>6}{'done':>6}{'fail':>6}{'jobs/min':>10}"
+        f"{'p50 s':>8}{'p99 s':>8}{'wait p99':>10}{'calls':>7}{'llm 429':>9}{'llm err':>9}{'peak':>6}{'cost $':>9}"
+    )
+    rows = [header]
+    for result in results:
+        rows.append(
+            f"{result.strategy:<18}{result.concurrency:>5}{result.submitted:>6}{result.rejected:>6}"
+            f"{result.completed:>6}{result.failed:>6}{result.throughput_per_minute:>10.1f}"
+            f"{seconds(result.latency_p50_seconds):>8}{seconds(result.latency_p99_seconds):>8}"
+            f"{seconds(result.queue_wait_p99_seconds):>10}{result.llm_calls:>7}{result.rate_limited:>9}"
+            f"{result.provider_errors:>9}{result.peak_llm_in_flight:>6}{result.cost_usd:>9.2f}"
+        )
+    return "\n".join(rows)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay a request trace against the service with a simulated LLM provider and "
+                    "compare concurrency settings and strategies"
+    )
+    parser.add_argument("trace", nargs="?", help="NDJSON request trace; omit for synthetic Poisson traffic")
+    parser.add_argument("--requests", type=int, default=100, help="Synthetic requests to generate")
+    parser.add_argument("--rate", type=float, default=0.5, help="Synthetic arrivals per second")
+    parser.add_argument("--document-tokens", type=int, default=3000, help="Synthetic document size")
+    parser.add_argument("--documents", type=int, default=3, help="Synthetic documents per request")
+    parser.add_argument("--speedup", type=float, default=20.0, help="Replay this many times faster than recorded")
+    parser.add_argument("--concurrency", default="4,8,16", help="Comma-separated MAX_CONCURRENT_JOBS values to compare")
+    parser.add_argument(
+        "--strategies",
+        default="trace",
+        help="Comma-separated strategies to compare, or 'trace' to keep each request's own"
+    )
+    parser.add_argument("--tokens-per-second", type=float, default=60.0, help="Simulated output tokens per second")
+    parser.add_argument("--ttft", type=float, default=0.8, help="Simulated time to first token, in seconds")
+    parser.add_argument("--rpm", type=float, help="Provider requests-per-minute limit")
+    parser.add_argument("--itpm", type=float, help="Provider input-tokens-per-minute limit")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of provider attempts that fail with 529")
+    parser.add_argument("--model", default="claude-3-5-sonnet-latest", help="Model whose prices are applied")
+    parser.add_argument("--admission-capacity-tokens", type=int, help="As ADMISSION_CAPACITY_TOKENS")
+    parser.add_argument("--summary-token-budget", type=int, help="As SUMMARY_TOKEN_BUDGET")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for arrivals, jitter and errors")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    # Simulated failures are expected; keep their logs out of the report
+    setup_logging(os.getenv("LOG_LEVEL", "CRITICAL"))
+    
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = synthetic_trace(args.requests, args.rate, args.document_tokens, args.documents, seed=args.seed)
+    strategies = [None if name == "trace" else SummaryStrategy(name) for name in args.strategies.split(",")]
+    simulator_options = {
+        "tokens_per_second": args.tokens_per_second,
+        "time_to_first_token": args.ttft,
+        "requests_per_minute": args.rpm,
+        "input_tokens_per_minute": args.itpm,
+        "error_rate": args.error_rate,
+        "model_name": args.model,
+        "seed": args.seed
+    }
+    app_options = {
+        "admission_capacity_tokens": args.admission_capacity_tokens,
+        "summary_token_budget": args.summary_token_budget
+    }
+    
+    results = []
+    try:
+        for strategy in strategies:
+            for concurrency in (int(value) for value in args.concurrency.split(",")):
+                results.append(asyncio.run(run_scenario(
+                    trace, concurrency, strategy, args.speedup, simulator_options, app_options
+                )))
+    finally:
+        shutdown_logging()
+    
+    print(format_report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
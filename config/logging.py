@@ -1,77 +1,177 @@
+import atexit
+import copy
+import json
 import logging
-import logging.config
+import logging.handlers
 import os
-from typing import Dict, Any
+import queue
+import sys
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
 
-def setup_logging(level: str = "INFO") -> None:
-    """Setup logging configuration for the application"""
+_STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Argument types that cannot change between the log call and the listener formatting it
+_IMMUTABLE_ARG_TYPES = (str, bytes, int, float, complex, type(None))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON objects, including any `extra` fields"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Let through one in every `sample_every` DEBUG records per call site"""
+    
+    def __init__(self, sample_every: int = 1):
+        super().__init__()
+        if sample_every <= 0:
+            raise ValueError("sample_every must be positive")
+        self.sample_every = sample_every
+        self._counts: Dict[Tuple[str, int], int] = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.sample_every == 1:
+            return True
+        
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts[key]
+            self._counts[key] = count + 1
+        return count % self.sample_every == 0
+
+
+class DeferredFormattingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+    
+    The stock handler merges args into the message before enqueueing, which keeps the
+    formatting cost on the caller (the event loop). Records here never leave the
+    process, so they are passed through unformatted as long as their args are
+    immutable; any other argument could be mutated before the listener thread gets
+    to it, so those messages are merged on the caller as usual.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        args = record.args.values() if isinstance(record.args, dict) else record.args or ()
+        if not all(isinstance(arg, _IMMUTABLE_ARG_TYPES) for arg in args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_format: Optional[str] = None,
+    debug_sample_every: Optional[int] = None
+) -> None:
+    """
+    Setup logging configuration for the application.
+    
+    Loggers only enqueue records; a background listener thread formats them and does
+    the console and file I/O, so no logging call blocks the event loop on disk writes.
+    """
+    global _listener
     
     log_level = getattr(logging, level.upper(), logging.INFO)
+    log_format = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+    if debug_sample_every is None:
+        debug_sample_every = int(os.getenv("LOG_DEBUG_SAMPLE_EVERY", "1"))
     
-    config: Dict[str, Any] = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "standard": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S"
-            },
-            "detailed": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S"
-            }
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": log_level,
-                "formatter": "standard",
-                "stream": "ext://sys.stdout"
-            },
-            "file": {
-                "class": "logging.FileHandler",
-                "level": log_level,
-                "formatter": "detailed",
-                "filename": os.getenv("LOG_FILE", "logs/summary_service.log"),
-                "mode": "a"
-            }
-        },
-        "loggers": {
-            "src": {
-                "level": log_level,
-                "handlers": ["console", "file"],
-                "propagate": False
-            },
-            "uvicorn": {
-                "level": log_level,
-                "handlers": ["console", "file"],
-                "propagate": False
-            },
-            "uvicorn.access": {
-                "level": log_level,
-                "handlers": ["console", "file"],
-                "propagate": False
-            }
-        },
-        "root": {
-            "level": log_level,
-            "handlers": ["console", "file"]
-        }
-    }
+    if log_format == "json":
+        console_formatter: logging.Formatter = JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%S%z")
+        file_formatter: logging.Formatter = console_formatter
+    else:
+        console_formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s] %(name)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+        )
+        file_formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+        )
     
     # Create logs directory if it doesn't exist
-    log_file = config["handlers"]["file"]["filename"]
+    log_file = os.getenv("LOG_FILE", "logs/summary_service.log")
     log_dir = os.path.dirname(log_file)
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir, exist_ok=True)
     
-    logging.config.dictConfig(config)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(log_level)
+    console_handler.setFormatter(console_formatter)
+    
+    file_handler = logging.FileHandler(log_file, mode="a")
+    file_handler.setLevel(log_level)
+    file_handler.setFormatter(file_formatter)
+    
+    shutdown_logging()
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = DeferredFormattingQueueHandler(log_queue)
+    queue_handler.setLevel(log_level)
+    queue_handler.addFilter(DebugSamplingFilter(debug_sample_every))
+    
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    
+    # uvicorn must be run with log_config=None, or it replaces these handlers with its own
+    for name in ("src", "uvicorn", "uvicorn.error", "uvicorn.access"):
+        _attach_handlers(logging.getLogger(name), [queue_handler], log_level, propagate=False)
+    _attach_handlers(logging.getLogger(), [queue_handler], log_level, propagate=True)
     
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured with level: {level}")
+    logger.info("Logging configured with level: %s, format: %s", level, log_format)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the given name"""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
+
+
+def _attach_handlers(
+    logger: logging.Logger,
+    handlers: List[logging.Handler],
+    level: int,
+    propagate: bool
+) -> None:
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    for handler in handlers:
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = propagate
+    logger.disabled = False
+
+
+atexit.register(shutdown_logging)
@@ -1,21 +1,124 @@
 import os
+from typing import Any, Dict, get_args, get_type_hints
 import uvicorn
 from config.logging import setup_logging
+from src.infrastructure import SimulatedLLMService
 from src.web import create_app
 
 
+def parse_float_mapping(value: str) -> Dict[str, float]:
+    """Parse "name=number,..." into a mapping"""
+    mapping = {}
+    for entry in value.split(","):
+        if entry.strip():
+            name, _, number = entry.partition("=")
+            mapping[name.strip()] = float(number)
+    return mapping
+
+
+def parse_tenant_weights(value: str) -> Dict[str, float]:
+    """Parse "tenant=weight,..." into a weight mapping"""
+    return parse_float_mapping(value)
+
+
+def parse_simulator_options(value: str) -> Dict[str, Any]:
+    """Parse "name=value,..." into SimulatedLLMService options, each converted to its parameter's type"""
+    hints = get_type_hints(SimulatedLLMService.__init__)
+    options: Dict[str, Any] = {}
+    for entry in value.split(","):
+        if entry.strip():
+            name, _, raw = entry.partition("=")
+            name = name.strip()
+            # Optional[int] converts as int
+            kinds = [kind for kind in get_args(hints.get(name)) or [hints.get(name)] if kind is not type(None)]
+            if len(kinds) != 1 or kinds[0] not in (int, float, str):
+                raise ValueError(f"Unknown simulator option: {name}")
+            options[name] = kinds[0](raw.strip())
+    return options
+
+
 def main():
     # Setup logging
     log_level = os.getenv("LOG_LEVEL", "INFO")
     setup_logging(log_level)
     
+    # "simulated" serves load tests from a modelled provider instead of Anthropic
+    llm_backend = os.getenv("LLM_BACKEND", "anthropic")
+    # Simulator settings, e.g. "tokens_per_second=60,requests_per_minute=50,speedup=1"
+    simulator_options = os.getenv("SIMULATOR_OPTIONS")
+    
     # Get Anthropic API key
     anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not anthropic_api_key:
+    if not anthropic_api_key and llm_backend == "anthropic":
         raise ValueError("ANTHROPIC_API_KEY environment variable is required")
     
+    # Optional cap on the running summary size re-sent on every refine step
+    summary_token_budget = os.getenv("SUMMARY_TOKEN_BUDGET")
+    max_concurrent_jobs = os.getenv("MAX_CONCURRENT_JOBS")
+    
+    # Models per summarization stage; refine and final stages default to LLM_MODEL
+    model_name = os.getenv("LLM_MODEL")
+    refine_model_name = os.getenv("LLM_REFINE_MODEL")
+    final_model_name = os.getenv("LLM_FINAL_MODEL")
+    fallback_model_name = os.getenv("LLM_FALLBACK_MODEL")
+    
+    # Admission control: estimated tokens allowed in flight and what to do beyond that
+    admission_capacity_tokens = os.getenv("ADMISSION_CAPACITY_TOKENS")
+    admission_policy = os.getenv("ADMISSION_POLICY", "defer")
+    max_job_tokens = os.getenv("MAX_JOB_TOKENS")
+    admission_max_deferred_tokens = os.getenv("ADMISSION_MAX_DEFERRED_TOKENS")
+    
+    # Fair-share weights per tenant, e.g. "search=3,reports=1"; unlisted tenants weigh 1
+    tenant_weights = os.getenv("TENANT_WEIGHTS")
+    
+    # Shared Redis-protocol store; required when running more than one worker process
+    redis_url = os.getenv("REDIS_URL")
+    
+    # Durable SQLite job queue shared by worker processes on one host or volume
+    job_queue_path = os.getenv("JOB_QUEUE_PATH")
+    job_lease_seconds = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    
+    # Compression for stored summaries and job payloads: auto (zstd if installed, else zlib), zlib, zstd or none
+    storage_compression = os.getenv("STORAGE_COMPRESSION", "auto")
+    
+    # Worker processes for document parsing; unset or 0 parses on the event loop
+    preprocess_workers = os.getenv("PREPROCESS_WORKERS")
+    
+    # Bearer token for /debug/profile and /debug/memory; unset leaves them unmounted
+    debug_token = os.getenv("DEBUG_TOKEN") or None
+    slow_callback_ms = float(os.getenv("SLOW_CALLBACK_MS", "100"))
+    
+    # Optional secret used to sign completion webhooks
+    webhook_secret = os.getenv("WEBHOOK_SECRET")
+    # Callbacks to loopback, private and link-local addresses are refused unless allowed
+    webhook_allow_private_targets = os.getenv("WEBHOOK_ALLOW_PRIVATE_TARGETS", "false").lower() in ("1", "true", "yes")
+    
     # Create FastAPI app
-    app = create_app(anthropic_api_key=anthropic_api_key)
+    app = create_app(
+        anthropic_api_key=anthropic_api_key,
+        summary_token_budget=int(summary_token_budget) if summary_token_budget else None,
+        max_concurrent_jobs=int(max_concurrent_jobs) if max_concurrent_jobs else None,
+        webhook_secret=webhook_secret or None,
+        webhook_allow_private_targets=webhook_allow_private_targets,
+        model_name=model_name or None,
+        refine_model_name=refine_model_name or None,
+        final_model_name=final_model_name or None,
+        fallback_model_name=fallback_model_name or None,
+        admission_capacity_tokens=int(admission_capacity_tokens) if admission_capacity_tokens else None,
+        admission_policy=admission_policy,
+        max_job_tokens=int(max_job_tokens) if max_job_tokens else None,
+        admission_max_deferred_tokens=int(admission_max_deferred_tokens) if admission_max_deferred_tokens else None,
+        tenant_weights=parse_tenant_weights(tenant_weights) if tenant_weights else None,
+        redis_url=redis_url or None,
+        job_queue_path=job_queue_path or None,
+        job_lease_seconds=job_lease_seconds,
+        storage_compression=storage_compression,
+        preprocess_workers=int(preprocess_workers) if preprocess_workers else None,
+        debug_token=debug_token,
+        slow_callback_ms=slow_callback_ms,
+        llm_backend=llm_backend,
+        simulator_options=parse_simulator_options(simulator_options) if simulator_options else None
+    )
     
     # Run the server
     host = os.getenv("HOST", "0.0.0.0")
@@ -26,7 +129,9 @@ def main():
         host=host,
         port=port,
         log_level=log_level.lower(),
-        access_log=True
+        access_log=True,
+        # Keep the queue handlers setup_logging attached to the uvicorn loggers
+        log_config=None
     )
 
 
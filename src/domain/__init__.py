@@ -1,5 +1,31 @@
-from .models import Document, SummaryRequest, SummaryResult, SummaryProgress, SummaryStatus
-from .interfaces import SummaryRepository, LLMService, SummaryService
+from .models import (
+    Document,
+    SummaryRequest,
+    SummaryResult,
+    SummaryProgress,
+    SummaryStatus,
+    SummaryStrategy,
+    JobPriority,
+    JobKind,
+    QueuedJob,
+    SummaryListing,
+    SummaryPage,
+    TokenUsage
+)
+from .interfaces import (
+    SummaryRepository,
+    LLMService,
+    SummaryService,
+    CompletionNotifier,
+    DocumentPreprocessor,
+    JobQueue,
+    LEASE_LOST
+)
+from .tokens import estimate_tokens
+from .usage import UsageMeter, record_usage, track_usage
+from .outline import OutlineSection, OutlineSpan, build_outline, parse_outline, scan_outline
+from .listing import decode_cursor, encode_cursor
+from .preprocessing import PreparedDocument, prepare_batch, prepare_document, prepare_scanned, scan_batch
 
 __all__ = [
     'Document',
@@ -7,7 +33,34 @@ __all__ = [
     'SummaryResult',
     'SummaryProgress',
     'SummaryStatus',
+    'SummaryStrategy',
+    'JobPriority',
+    'JobKind',
+    'QueuedJob',
+    'SummaryListing',
+    'SummaryPage',
+    'TokenUsage',
     'SummaryRepository',
     'LLMService',
-    'SummaryService'
+    'SummaryService',
+    'CompletionNotifier',
+    'DocumentPreprocessor',
+    'JobQueue',
+    'LEASE_LOST',
+    'estimate_tokens',
+    'UsageMeter',
+    'record_usage',
+    'track_usage',
+    'OutlineSection',
+    'OutlineSpan',
+    'build_outline',
+    'parse_outline',
+    'scan_outline',
+    'encode_cursor',
+    'decode_cursor',
+    'PreparedDocument',
+    'prepare_batch',
+    'prepare_document',
+    'prepare_scanned',
+    'scan_batch'
 ]
\ No newline at end of file
@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
-from .models import SummaryRequest, SummaryResult, SummaryProgress
+from .models import (
+    JobKind,
+    QueuedJob,
+    SummaryPage,
+    SummaryProgress,
+    SummaryRequest,
+    SummaryResult,
+    SummaryStatus
+)
+from .preprocessing import PreparedDocument
 
 
 class SummaryRepository(ABC):
@@ -20,6 +29,29 @@ class SummaryRepository(ABC):
     @abstractmethod
     async def get_result(self, request_id: str) -> Optional[SummaryResult]:
         pass
+    
+    @abstractmethod
+    async def replace_result(self, result: SummaryResult, expected_version: int) -> bool:
+        """
+        Save result only while the stored result is still at expected_version; returns
+        False, saving nothing, when another writer replaced it first.
+        """
+        pass
+    
+    @abstractmethod
+    async def list_summaries(
+        self,
+        status: Optional[SummaryStatus] = None,
+        tenant: Optional[str] = None,
+        since: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> SummaryPage:
+        """
+        Requests in creation order, optionally filtered by latest status, tenant and
+        creation time (epoch seconds); pass a page's next_cursor to get the next page.
+        """
+        pass
 
 
 class LLMService(ABC):
@@ -30,6 +62,27 @@ class LLMService(ABC):
     @abstractmethod
     async def refine_summary(self, existing_summary: str, new_content: str) -> str:
         pass
+    
+    @abstractmethod
+    async def condense_summary(self, summary: str, max_tokens: int) -> str:
+        pass
+    
+    @abstractmethod
+    async def consolidate_summaries(self, partial_summaries: str) -> str:
+        pass
+
+
+class DocumentPreprocessor(ABC):
+    @abstractmethod
+    async def prepare(self, contents: List[str]) -> List[PreparedDocument]:
+        """Parse and measure documents, returning results in input order"""
+        pass
+
+
+class CompletionNotifier(ABC):
+    @abstractmethod
+    async def notify(self, callback_url: str, result: SummaryResult) -> None:
+        pass
 
 
 class SummaryService(ABC):
@@ -37,6 +90,53 @@ class SummaryService(ABC):
     async def create_summary(self, request: SummaryRequest) -> SummaryResult:
         pass
     
+    @abstractmethod
+    async def append_documents(self, request: SummaryRequest) -> SummaryResult:
+        pass
+    
     @abstractmethod
     async def get_summary_status(self, request_id: str) -> Optional[SummaryProgress]:
-        pass
\ No newline at end of file
+        pass
+
+
+# Cancellation message of a job whose queue lease passed to another worker; the new
+# owner records the job's outcome, so the cancelled run must not
+LEASE_LOST = "Job lease lost to another worker"
+
+
+class JobQueue(ABC):
+    @abstractmethod
+    async def enqueue(self, request: SummaryRequest, kind: JobKind) -> str:
+        pass
+    
+    @abstractmethod
+    async def claim(self, worker_id: str, lease_seconds: float) -> Optional[QueuedJob]:
+        pass
+    
+    @abstractmethod
+    async def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        pass
+    
+    @abstractmethod
+    async def complete(self, job_id: str, worker_id: str) -> None:
+        pass
+    
+    @abstractmethod
+    async def release(self, job_id: str, worker_id: str, error: str) -> None:
+        pass
+    
+    @abstractmethod
+    async def cancel(self, request_id: str) -> bool:
+        pass
+    
+    @abstractmethod
+    async def request_cancel(self, request_id: str) -> bool:
+        pass
+    
+    @abstractmethod
+    async def cancel_requested(self, job_id: str) -> bool:
+        pass
+    
+    @abstractmethod
+    async def reap_expired(self) -> List[QueuedJob]:
+        pass
@@ -0,0 +1,18 @@
+import base64
+import binascii
+import json
+from typing import Tuple
+
+
+def encode_cursor(created_at: float, request_id: str) -> str:
+    """Opaque position after a listing entry; listing order is (created_at, request_id)"""
+    raw = json.dumps([created_at, request_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        created_at, request_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(created_at), str(request_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
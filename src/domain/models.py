@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 from enum import Enum
 
@@ -8,6 +8,28 @@ class SummaryStatus(Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class SummaryStrategy(Enum):
+    REFINE = "refine"
+    HIERARCHICAL = "hierarchical"
+    PIPELINED_REFINE = "pipelined_refine"
+
+
+class JobPriority(Enum):
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+    
+    @property
+    def rank(self) -> int:
+        """Lower ranks are always scheduled first"""
+        return 0 if self is JobPriority.INTERACTIVE else 1
+
+
+class JobKind(Enum):
+    CREATE = "create"
+    APPEND = "append"
 
 
 @dataclass
@@ -17,10 +39,32 @@ class Document:
     metadata: Optional[dict] = None
 
 
+@dataclass
+class TokenUsage:
+    input_tokens: int = 0
+    output_tokens: int = 0
+    llm_calls: int = 0
+    cost_usd: float = 0.0
+    
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+    
+    def add(self, other: "TokenUsage") -> None:
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.llm_calls += other.llm_calls
+        self.cost_usd += other.cost_usd
+
+
 @dataclass
 class SummaryRequest:
     documents: List[Document]
     request_id: str
+    strategy: SummaryStrategy = SummaryStrategy.REFINE
+    callback_url: Optional[str] = None
+    tenant: str = "default"
+    priority: JobPriority = JobPriority.BATCH
 
 
 @dataclass
@@ -29,6 +73,11 @@ class SummaryResult:
     summary: str
     status: SummaryStatus
     error_message: Optional[str] = None
+    version: int = 1
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    tenant: str = "default"
+    # Documents folded into the summary; 0 on results stored before it was tracked
+    document_count: int = 0
 
 
 @dataclass
@@ -37,4 +86,32 @@ class SummaryProgress:
     current_document_index: int
     total_documents: int
     current_summary: str
-    status: SummaryStatus
\ No newline at end of file
+    status: SummaryStatus
+    version: int = 1
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    tenant: str = "default"
+
+
+@dataclass
+class SummaryListing:
+    """Index entry for one request: its latest status, without the summary text"""
+    request_id: str
+    status: SummaryStatus
+    tenant: str
+    created_at: float
+    updated_at: float
+    version: int = 1
+
+
+@dataclass
+class SummaryPage:
+    items: List[SummaryListing]
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class QueuedJob:
+    job_id: str
+    kind: JobKind
+    request: SummaryRequest
+    attempts: int = 0
@@ -0,0 +1,89 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+# Characters str.splitlines() ends a line on
+_LINE_BREAKS = "\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+# One section as offsets into its document: (level, title_start, title_end, body_start, body_end)
+OutlineSpan = Tuple[int, int, int, int, int]
+
+
+@dataclass
+class OutlineSection:
+    """A markdown section: its heading, own body text and nested subsections"""
+    level: int
+    title: Optional[str]
+    body: str = ""
+    children: List["OutlineSection"] = field(default_factory=list)
+    
+    @property
+    def heading(self) -> str:
+        if self.title is None:
+            return ""
+        return f"{'#' * self.level} {self.title}"
+    
+    def to_markdown(self) -> str:
+        """Reassemble the section, including all subsections, as markdown"""
+        parts = [part for part in (self.heading, self.body.strip()) if part]
+        parts.extend(child.to_markdown() for child in self.children)
+        return "\n\n".join(parts)
+
+
+def parse_outline(markdown: str) -> OutlineSection:
+    """Parse ATX headings into a section tree rooted at a level-0 preamble section"""
+    return build_outline(markdown, scan_outline(markdown))
+
+
+def scan_outline(markdown: str) -> List[OutlineSpan]:
+    """
+    Locate every section of a document in order, the level-0 preamble first.
+    
+    Only offsets are returned, so the result stays small when it crosses a process
+    boundary; build_outline turns it into sections.
+    """
+    spans: List[OutlineSpan] = []
+    level, title_start, title_end, body_start = 0, 0, 0, 0
+    in_fence = False
+    offset = 0
+    
+    for raw_line in markdown.splitlines(keepends=True):
+        line = raw_line.rstrip(_LINE_BREAKS)
+        line_start, offset = offset, offset + len(raw_line)
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        
+        match = None if in_fence else _HEADING_PATTERN.match(line)
+        if not match:
+            continue
+        
+        spans.append((level, title_start, title_end, body_start, line_start))
+        level = len(match.group(1))
+        title_start, title_end = line_start + match.start(2), line_start + match.end(2)
+        body_start = offset
+    
+    spans.append((level, title_start, title_end, body_start, len(markdown)))
+    return spans
+
+
+def build_outline(markdown: str, spans: List[OutlineSpan]) -> OutlineSection:
+    """Assemble the section tree of a document from its scan_outline spans"""
+    sections = [
+        OutlineSection(
+            level=level,
+            title=markdown[title_start:title_end] if level else None,
+            body="\n".join(markdown[body_start:body_end].splitlines()).strip()
+        )
+        for level, title_start, title_end, body_start, body_end in spans
+    ]
+    root = sections[0]
+    stack = [root]
+    for section in sections[1:]:
+        while stack[-1].level >= section.level:
+            stack.pop()
+        stack[-1].children.append(section)
+        stack.append(section)
+    return root
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import List
+
+from .outline import OutlineSection, OutlineSpan, build_outline, parse_outline, scan_outline
+from .tokens import estimate_tokens
+
+
+@dataclass
+class PreparedDocument:
+    """CPU-bound per-document work, done once before any LLM call"""
+    outline: OutlineSection
+    tokens: int
+
+
+def prepare_document(content: str) -> PreparedDocument:
+    return PreparedDocument(outline=parse_outline(content), tokens=estimate_tokens(content))
+
+
+def prepare_batch(contents: List[str]) -> List[PreparedDocument]:
+    return [prepare_document(content) for content in contents]
+
+
+def scan_batch(contents: List[str]) -> List[List[OutlineSpan]]:
+    """Scan several documents; module-level so process pools can pickle it by reference"""
+    return [scan_outline(content) for content in contents]
+
+
+def prepare_scanned(content: str, spans: List[OutlineSpan]) -> PreparedDocument:
+    """Finish preparing a document from its scan_batch spans"""
+    return PreparedDocument(outline=build_outline(content, spans), tokens=estimate_tokens(content))
@@ -0,0 +1,12 @@
+import math
+
+
+# Rough characters-per-token ratio for English markdown with Claude tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token count estimate used for budgeting without a tokenizer round-trip"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
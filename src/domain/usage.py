@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from .models import TokenUsage
+
+
+# Usage of the summary job running in the current task; child tasks inherit it
+_current_usage: ContextVar[Optional[TokenUsage]] = ContextVar("current_usage", default=None)
+
+
+@contextmanager
+def track_usage(usage: Optional[TokenUsage] = None) -> Iterator[TokenUsage]:
+    """Attribute every LLM call made inside the block, including from spawned tasks, to usage"""
+    usage = usage if usage is not None else TokenUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def record_usage(usage: TokenUsage) -> None:
+    """Add one LLM call's usage to the job being tracked, if any"""
+    current = _current_usage.get()
+    if current is not None:
+        current.add(usage)
+
+
+class UsageMeter:
+    """Process-wide token and cost totals per model"""
+    
+    def __init__(self) -> None:
+        self._models: Dict[str, TokenUsage] = {}
+    
+    def record(self, model_name: str, usage: TokenUsage) -> None:
+        self._models.setdefault(model_name, TokenUsage()).add(usage)
+    
+    def snapshot(self) -> Dict[str, TokenUsage]:
+        return {name: TokenUsage(**vars(usage)) for name, usage in self._models.items()}
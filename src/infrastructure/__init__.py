@@ -1,4 +1,31 @@
 from .llm_service import LangChainLLMService
+from .routing_llm_service import RoutingLLMService, build_llm_service
+from .circuit_breaker import CircuitBreakerLLMService, CircuitOpenError, CircuitState
+from .compression import CompressionStats, TextCodec
+from .loop_monitor import LoopMonitor, LoopStall
+from .process_pool import ProcessPoolPreprocessor
 from .repository import InMemorySummaryRepository
+from .redis_repository import RedisSummaryRepository
+from .simulated_llm_service import SimulatedAPIError, SimulatedLLMService
+from .sqlite_job_queue import SQLiteJobQueue
+from .webhook_notifier import WebhookNotifier
 
-__all__ = ['LangChainLLMService', 'InMemorySummaryRepository']
\ No newline at end of file
+__all__ = [
+    'LangChainLLMService',
+    'RoutingLLMService',
+    'build_llm_service',
+    'CircuitBreakerLLMService',
+    'CircuitOpenError',
+    'CircuitState',
+    'CompressionStats',
+    'TextCodec',
+    'LoopMonitor',
+    'LoopStall',
+    'ProcessPoolPreprocessor',
+    'InMemorySummaryRepository',
+    'RedisSummaryRepository',
+    'SimulatedAPIError',
+    'SimulatedLLMService',
+    'SQLiteJobQueue',
+    'WebhookNotifier'
+]
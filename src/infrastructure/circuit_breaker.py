@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from src.domain.interfaces import LLMService
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when the primary LLM is unavailable and no fallback is configured"""
+
+
+class CircuitBreakerLLMService(LLMService):
+    """
+    Circuit breaker around a primary LLMService with an optional fallback.
+    
+    Outcomes of the last window_size primary calls are tracked; errors and calls slower
+    than latency_threshold count as failures. Once at least min_calls outcomes are
+    recorded and the failure rate reaches failure_rate_threshold, the circuit opens and
+    calls go to the fallback. After reset_timeout seconds up to half_open_max_calls
+    probe calls are let through to the primary: a healthy probe closes the circuit, a
+    failed one opens it again. Only probes decide a half-open circuit; calls that
+    started before it opened are not counted. While closed, a failed primary call is
+    retried once on the fallback.
+    """
+    
+    def __init__(
+        self,
+        primary: LLMService,
+        fallback: Optional[LLMService] = None,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        latency_threshold: float = 60.0,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        if window_size <= 0 or min_calls <= 0 or half_open_max_calls <= 0:
+            raise ValueError("window_size, min_calls and half_open_max_calls must be positive")
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        
+        self.primary = primary
+        self.fallback = fallback
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._fallback_calls = 0
+        logger.info("Initialized circuit breaker (fallback configured: %s)", fallback is not None)
+    
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+    
+    @property
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failure_rate": round(self.failure_rate, 3),
+            "recorded_calls": len(self._outcomes),
+            "fallback_configured": self.fallback is not None,
+            "fallback_calls": self._fallback_calls
+        }
+    
+    async def generate_initial_summary(self, content: str) -> str:
+        return await self._call("initial", lambda service: service.generate_initial_summary(content))
+    
+    async def refine_summary(self, existing_summary: str, new_content: str) -> str:
+        return await self._call("refine", lambda service: service.refine_summary(existing_summary, new_content))
+    
+    async def condense_summary(self, summary: str, max_tokens: int) -> str:
+        return await self._call("condense", lambda service: service.condense_summary(summary, max_tokens))
+    
+    async def consolidate_summaries(self, partial_summaries: str) -> str:
+        return await self._call("consolidate", lambda service: service.consolidate_summaries(partial_summaries))
+    
+    async def _call(self, stage: str, invoke: Callable[[LLMService], Awaitable[str]]) -> str:
+        probe = False
+        state = self.state
+        if state == CircuitState.OPEN or (
+            state == CircuitState.HALF_OPEN and self._probes_in_flight >= self.half_open_max_calls
+        ):
+            return await self._call_fallback(stage, invoke)
+        if state == CircuitState.HALF_OPEN:
+            probe = True
+            self._probes_in_flight += 1
+        
+        start = time.monotonic()
+        try:
+            result = await invoke(self.primary)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record(False, probe)
+            if self.fallback is None:
+                raise
+            logger.warning("Primary LLM failed on %s stage, retrying on fallback: %s", stage, e)
+            return await self._call_fallback(stage, invoke)
+        finally:
+            if probe:
+                self._probes_in_flight -= 1
+        
+        elapsed = time.monotonic() - start
+        if elapsed > self.latency_threshold:
+            logger.warning(
+                "Primary LLM %s stage took %.1fs, over %.1fs threshold", stage, elapsed, self.latency_threshold
+            )
+        self._record(elapsed <= self.latency_threshold, probe)
+        return result
+    
+    async def _call_fallback(self, stage: str, invoke: Callable[[LLMService], Awaitable[str]]) -> str:
+        if self.fallback is None:
+            raise CircuitOpenError(f"Primary LLM circuit is {self._state.value} and no fallback is configured")
+        self._fallback_calls += 1
+        logger.debug("Routing %s stage to fallback LLM", stage)
+        return await invoke(self.fallback)
+    
+    def _record(self, success: bool, probe: bool) -> None:
+        if probe or self._state == CircuitState.HALF_OPEN:
+            # A probe's circuit may have been reopened by another probe since it started
+            if probe and self._state == CircuitState.HALF_OPEN:
+                self._transition(CircuitState.CLOSED if success else CircuitState.OPEN)
+            return
+        
+        self._outcomes.append(success)
+        if (
+            self._state == CircuitState.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and self.failure_rate >= self.failure_rate_threshold
+        ):
+            self._transition(CircuitState.OPEN)
+    
+    def _transition(self, state: CircuitState) -> None:
+        if state == self._state:
+            return
+        logger.warning("LLM circuit breaker %s -> %s", self._state.value, state.value)
+        self._state = state
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CircuitState.CLOSED:
+            self._outcomes.clear()
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, cast
+
+from src.domain import SummaryProgress, SummaryResult
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+# One-byte tag in front of every encoded value
+_RAW = b"r"
+_ZLIB = b"z"
+_ZSTD = b"s"
+
+
+@dataclass
+class CompressionStats:
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+    compressions: int = 0
+    decompressions: int = 0
+    compress_seconds: float = 0.0
+    decompress_seconds: float = 0.0
+    
+    @property
+    def ratio(self) -> float:
+        """Raw size over stored size; above 1 means compression is saving space"""
+        return self.raw_bytes / self.stored_bytes if self.stored_bytes else 1.0
+
+
+class TextCodec:
+    """
+    Compresses large text fields for storage.
+    
+    "auto" uses zstd when the zstandard package is installed and zlib otherwise; "none"
+    stores text as UTF-8. Values shorter than min_size bytes are stored raw, where the
+    compression header would cost more than it saves. Every value carries a one-byte
+    tag, so data written with one algorithm stays readable after switching.
+    
+    encode_async() compresses values of offload_size characters or more in a worker
+    thread (zlib and zstd release the GIL), so large summaries do not stall the loop.
+    """
+    
+    def __init__(
+        self,
+        algorithm: str = "auto",
+        min_size: int = 1024,
+        level: Optional[int] = None,
+        offload_size: int = 64 * 1024
+    ):
+        if algorithm == "auto":
+            algorithm = "zstd" if zstandard is not None else "zlib"
+        if algorithm not in ("zstd", "zlib", "none"):
+            raise ValueError(f"Unknown compression algorithm: {algorithm}")
+        if algorithm == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        
+        self.algorithm = algorithm
+        self.min_size = min_size
+        self.level = level
+        self.offload_size = offload_size
+        self.stats = CompressionStats()
+        logger.info("Storage compression: %s (values from %s bytes)", algorithm, min_size)
+    
+    def encode(self, text: str) -> bytes:
+        raw = text.encode("utf-8")
+        started = time.perf_counter()
+        if self.algorithm == "none" or len(raw) < self.min_size:
+            encoded = _RAW + raw
+        elif self.algorithm == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.level if self.level is not None else 3)
+            encoded = _ZSTD + compressor.compress(raw)
+        else:
+            encoded = _ZLIB + zlib.compress(raw, self.level if self.level is not None else 6)
+        
+        self.stats.compress_seconds += time.perf_counter() - started
+        self.stats.compressions += 1
+        self.stats.raw_bytes += len(raw)
+        self.stats.stored_bytes += len(encoded)
+        return encoded
+    
+    async def encode_async(self, text: str) -> bytes:
+        if self.algorithm == "none" or len(text) < self.offload_size:
+            return self.encode(text)
+        return await asyncio.to_thread(self.encode, text)
+    
+    def decode(self, data: bytes) -> str:
+        tag, payload = data[:1], data[1:]
+        started = time.perf_counter()
+        if tag == _RAW:
+            raw = payload
+        elif tag == _ZLIB:
+            raw = zlib.decompress(payload)
+        elif tag == _ZSTD:
+            if zstandard is None:
+                raise ValueError("Stored value is zstd-compressed but zstandard is not installed")
+            raw = zstandard.ZstdDecompressor().decompress(payload)
+        else:
+            raise ValueError(f"Unknown compression tag: {tag!r}")
+        
+        self.stats.decompress_seconds += time.perf_counter() - started
+        self.stats.decompressions += 1
+        return raw.decode("utf-8")
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "algorithm": self.algorithm,
+            "raw_bytes": self.stats.raw_bytes,
+            "stored_bytes": self.stats.stored_bytes,
+            "ratio": round(self.stats.ratio, 2),
+            "compressions": self.stats.compressions,
+            "decompressions": self.stats.decompressions,
+            "compress_seconds": round(self.stats.compress_seconds, 4),
+            "decompress_seconds": round(self.stats.decompress_seconds, 4)
+        }
+
+
+class CompressedText:
+    """Encoded text that is only decoded when first read"""
+    
+    __slots__ = ("data", "codec")
+    
+    def __init__(self, data: bytes, codec: TextCodec):
+        self.data = data
+        self.codec = codec
+
+
+def _lazy_text(name: str) -> property:
+    attribute = f"_{name}"
+    
+    def get(self: Any) -> str:
+        value = self.__dict__[attribute]
+        if isinstance(value, CompressedText):
+            value = value.codec.decode(value.data)
+            self.__dict__[attribute] = value
+        return cast(str, value)
+    
+    def set(self: Any, value: Any) -> None:
+        self.__dict__[attribute] = value
+    
+    return property(get, set)
+
+
+def _field_values(record: Any) -> tuple:
+    return tuple(getattr(record, field.name) for field in fields(record))
+
+
+class LazySummaryResult(SummaryResult):
+    """SummaryResult whose summary is decompressed on first access"""
+    summary = _lazy_text("summary")
+    
+    def __eq__(self, other: Any) -> bool:
+        # Compares equal to an eagerly loaded result with the same fields
+        if not isinstance(other, SummaryResult):
+            return NotImplemented
+        return _field_values(self) == _field_values(other)
+
+
+class LazySummaryProgress(SummaryProgress):
+    """SummaryProgress whose current summary is decompressed on first access"""
+    current_summary = _lazy_text("current_summary")
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SummaryProgress):
+            return NotImplemented
+        return _field_values(self) == _field_values(other)
+
+
+async def encode_text(record: Any, name: str, codec: TextCodec) -> bytes:
+    """Encode a record's text field, reusing the stored bytes if it was loaded and never read"""
+    value = record.__dict__.get(f"_{name}")
+    if isinstance(value, CompressedText) and value.codec is codec:
+        # e.g. a status change on a record read back from storage
+        return value.data
+    return await codec.encode_async(getattr(record, name))
+
+
+async def compress_result(result: SummaryResult, codec: TextCodec) -> LazySummaryResult:
+    values = {field.name: getattr(result, field.name) for field in fields(result) if field.name != "summary"}
+    values["summary"] = CompressedText(await encode_text(result, "summary", codec), codec)
+    return LazySummaryResult(**values)
+
+
+async def compress_progress(progress: SummaryProgress, codec: TextCodec) -> LazySummaryProgress:
+    values = {
+        field.name: getattr(progress, field.name) for field in fields(progress) if field.name != "current_summary"
+    }
+    values["current_summary"] = CompressedText(await encode_text(progress, "current_summary", codec), codec)
+    return LazySummaryProgress(**values)
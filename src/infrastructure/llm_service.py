@@ -1,26 +1,60 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from langchain.chat_models import init_chat_model
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
+from src.domain import TokenUsage, UsageMeter, record_usage
 from src.domain.interfaces import LLMService
 
 
 logger = logging.getLogger(__name__)
 
+# USD per million input / output tokens, matched by longest model name prefix
+MODEL_PRICES_PER_MTOK: Dict[str, Tuple[float, float]] = {
+    "claude-3-haiku": (0.25, 1.25),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-7-sonnet": (3.00, 15.00),
+    "claude-3-opus": (15.00, 75.00),
+    "claude-sonnet-4": (3.00, 15.00),
+    "claude-opus-4": (15.00, 75.00)
+}
+
+
+def model_prices(model_name: str) -> Optional[Tuple[float, float]]:
+    matches = [prefix for prefix in MODEL_PRICES_PER_MTOK if model_name.startswith(prefix)]
+    return MODEL_PRICES_PER_MTOK[max(matches, key=len)] if matches else None
+
 
 class LangChainLLMService(LLMService):
-    def __init__(self, api_key: Optional[str] = None, model_name: str = "claude-3-5-sonnet-latest"):
+    """
+    LLMService backed by a LangChain chat model.
+    
+    Token usage reported with each model response is attributed to the summary job
+    being tracked (see track_usage), priced from MODEL_PRICES_PER_MTOK, and added to
+    the per-model totals of usage_meter when one is given.
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_name: str = "claude-3-5-sonnet-latest",
+        usage_meter: Optional[UsageMeter] = None
+    ):
         self.model_name = model_name
+        self.usage_meter = usage_meter
+        self.prices = model_prices(model_name)
         self.llm = init_chat_model(model_name, model_provider="anthropic", api_key=api_key)
+        self.output_parser = StrOutputParser()
         
         # Initial summary prompt
         self.summarize_prompt = ChatPromptTemplate([
             ("human", "Write a concise summary of the following markdown content: {context}")
         ])
-        self.initial_summary_chain = self.summarize_prompt | self.llm | StrOutputParser()
+        self.initial_summary_chain = self.summarize_prompt | self.llm
         
         # Refining summary prompt
         self.refine_template = """
@@ -37,29 +71,107 @@ New markdown content:
 Given the new content, refine the original summary. The output should be well-formatted markdown.
 """
         self.refine_prompt = ChatPromptTemplate([("human", self.refine_template)])
-        self.refine_summary_chain = self.refine_prompt | self.llm | StrOutputParser()
+        self.refine_summary_chain = self.refine_prompt | self.llm
+        
+        # Condensing summary prompt
+        self.condense_template = """
+Condense the following markdown summary to at most {max_words} words.
+Keep every key fact, name and figure; drop repetition and filler.
+The output should be well-formatted markdown.
+
+Summary:
+------------
+{summary}
+------------
+"""
+        self.condense_prompt = ChatPromptTemplate([("human", self.condense_template)])
+        self.condense_summary_chain = self.condense_prompt | self.llm
+        
+        # Consolidating partial summaries prompt
+        self.consolidate_template = """
+Produce a final summary in markdown format from the partial summaries below.
+Each partial summary is introduced by the heading of the part it covers.
+Merge them into one coherent summary, removing overlap while keeping the key points of every part.
+
+Partial summaries:
+------------
+{context}
+------------
+"""
+        self.consolidate_prompt = ChatPromptTemplate([("human", self.consolidate_template)])
+        self.consolidate_summaries_chain = self.consolidate_prompt | self.llm
         
-        logger.info(f"Initialized LangChain LLM service with model: {model_name}")
+        logger.info("Initialized LangChain LLM service with model: %s", model_name)
     
     async def generate_initial_summary(self, content: str) -> str:
         logger.debug("Generating initial summary")
         try:
-            summary = await self.initial_summary_chain.ainvoke({"context": content})
-            logger.debug(f"Generated initial summary: {len(summary)} characters")
+            summary = await self._invoke(self.initial_summary_chain, {"context": content})
+            logger.debug("Generated initial summary: %s characters", len(summary))
             return summary
         except Exception as e:
-            logger.error(f"Error generating initial summary: {str(e)}")
+            logger.error("Error generating initial summary: %s", e)
             raise
     
     async def refine_summary(self, existing_summary: str, new_content: str) -> str:
         logger.debug("Refining existing summary with new content")
         try:
-            refined_summary = await self.refine_summary_chain.ainvoke({
+            refined_summary = await self._invoke(self.refine_summary_chain, {
                 "existing_answer": existing_summary,
                 "context": new_content
             })
-            logger.debug(f"Refined summary: {len(refined_summary)} characters")
+            logger.debug("Refined summary: %s characters", len(refined_summary))
             return refined_summary
         except Exception as e:
-            logger.error(f"Error refining summary: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error("Error refining summary: %s", e)
+            raise
+    
+    async def condense_summary(self, summary: str, max_tokens: int) -> str:
+        logger.debug("Condensing summary to roughly %s tokens", max_tokens)
+        try:
+            condensed_summary = await self._invoke(self.condense_summary_chain, {
+                "summary": summary,
+                # Prompts speak in words; ~0.75 words per token
+                "max_words": max(1, int(max_tokens * 0.75))
+            })
+            logger.debug("Condensed summary: %s characters", len(condensed_summary))
+            return condensed_summary
+        except Exception as e:
+            logger.error("Error condensing summary: %s", e)
+            raise
+    
+    async def consolidate_summaries(self, partial_summaries: str) -> str:
+        logger.debug("Consolidating partial summaries")
+        try:
+            summary = await self._invoke(self.consolidate_summaries_chain, {"context": partial_summaries})
+            logger.debug("Consolidated summary: %s characters", len(summary))
+            return summary
+        except Exception as e:
+            logger.error("Error consolidating summaries: %s", e)
+            raise
+    
+    async def _invoke(self, chain: Runnable, inputs: Dict[str, Any]) -> str:
+        message = await chain.ainvoke(inputs)
+        self._record_usage(message)
+        return self.output_parser.invoke(message)
+    
+    def _record_usage(self, message: Any) -> None:
+        metadata = getattr(message, "usage_metadata", None)
+        if not isinstance(metadata, dict) or not metadata:
+            # Older integrations only expose the provider's raw usage block
+            response_metadata = getattr(message, "response_metadata", None)
+            metadata = response_metadata.get("usage") if isinstance(response_metadata, dict) else None
+            metadata = metadata if isinstance(metadata, dict) else {}
+        
+        usage = TokenUsage(
+            input_tokens=metadata.get("input_tokens", 0) or 0,
+            output_tokens=metadata.get("output_tokens", 0) or 0,
+            llm_calls=1
+        )
+        if self.prices:
+            input_price, output_price = self.prices
+            usage.cost_usd = (usage.input_tokens * input_price + usage.output_tokens * output_price) / 1_000_000
+        
+        record_usage(usage)
+        if self.usage_meter is not None:
+            self.usage_meter.record(self.model_name, usage)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoopStall:
+    """One period during which the event loop was blocked, and what was running"""
+    task: str
+    location: str
+    detected_at: float
+    blocked_seconds: float
+    stack: List[str] = field(default_factory=list)
+
+
+class LoopMonitor:
+    """
+    Samples event-loop lag and names the code that blocks the loop.
+    
+    A heartbeat coroutine wakes every interval and records how late it woke. A watchdog
+    thread watches the heartbeat; once the loop has not ticked for slow_callback_seconds
+    it captures the loop thread's stack and current task while the blocking code is
+    still running, so the stall is attributed to the coroutine that caused it rather
+    than to whatever ran next. Unlike asyncio debug mode this costs one wakeup per
+    interval and works with any event loop implementation.
+    """
+    
+    def __init__(
+        self,
+        interval: float = 0.05,
+        slow_callback_seconds: float = 0.1,
+        window: int = 1200,
+        max_stalls: int = 20
+    ):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if slow_callback_seconds <= 0:
+            raise ValueError("slow_callback_seconds must be positive")
+        
+        self.interval = interval
+        self.slow_callback_seconds = slow_callback_seconds
+        self._lags: Deque[float] = deque(maxlen=window)
+        self._stalls: Deque[LoopStall] = deque(maxlen=max_stalls)
+        self._stall_count = 0
+        self._pending: Optional[LoopStall] = None
+        self._lock = threading.Lock()
+        self._last_tick = time.perf_counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+    
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._stopped.clear()
+        self._heartbeat = asyncio.create_task(self._beat(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info("Event-loop monitor started (stall threshold %.0f ms)", self.slow_callback_seconds * 1000)
+    
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+    
+    def snapshot(self) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+        with self._lock:
+            stalls = list(self._stalls)
+            stall_count = self._stall_count
+        return {
+            "samples": len(lags),
+            "lag_p50_ms": round(statistics.median(lags) * 1000, 3) if lags else 0.0,
+            "lag_p99_ms": round(lags[max(int(len(lags) * 0.99) - 1, 0)] * 1000, 3) if lags else 0.0,
+            "lag_max_ms": round(lags[-1] * 1000, 3) if lags else 0.0,
+            "stalls": stall_count,
+            "recent_stalls": [
+                {
+                    "task": stall.task,
+                    "location": stall.location,
+                    "detected_at": stall.detected_at,
+                    "blocked_ms": round(stall.blocked_seconds * 1000, 3)
+                }
+                for stall in reversed(stalls)
+            ]
+        }
+    
+    async def _beat(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(now - started - self.interval, 0.0)
+            self._lags.append(lag)
+            with self._lock:
+                self._last_tick = now
+                stall, self._pending = self._pending, None
+            if stall is not None:
+                stall.blocked_seconds = max(stall.blocked_seconds, lag)
+                logger.warning(
+                    "Event loop blocked for %.0f ms by %s at %s\n%s",
+                    stall.blocked_seconds * 1000, stall.task, stall.location, "".join(stall.stack)
+                )
+    
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                blocked = time.perf_counter() - self._last_tick - self.interval
+                if self._pending is not None or blocked < self.slow_callback_seconds:
+                    continue
+                self._pending = self._capture(blocked)
+                self._stalls.append(self._pending)
+                self._stall_count += 1
+    
+    def _capture(self, blocked: float) -> LoopStall:
+        frame = sys._current_frames().get(self._loop_thread_id) if self._loop_thread_id is not None else None
+        stack = traceback.format_stack(frame) if frame is not None else []
+        task = asyncio.current_task(self._loop)
+        if task is None:
+            description = "a non-task callback"
+        else:
+            coro = task.get_coro()
+            description = f"task {task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+        location = "unknown"
+        if frame is not None:
+            location = f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        return LoopStall(
+            task=description,
+            location=location,
+            detected_at=time.time(),
+            blocked_seconds=blocked,
+            stack=stack[-15:]
+        )
@@ -0,0 +1,314 @@
+import json
+import logging
+import time
+from dataclasses import asdict, fields
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union, cast
+
+from redis import asyncio as aioredis
+from redis.exceptions import WatchError
+
+from src.domain import (
+    SummaryListing,
+    SummaryPage,
+    SummaryProgress,
+    SummaryResult,
+    SummaryRepository,
+    SummaryStatus,
+    TokenUsage,
+    decode_cursor,
+    encode_cursor
+)
+
+from .compression import CompressedText, LazySummaryProgress, LazySummaryResult, TextCodec, encode_text
+
+
+logger = logging.getLogger(__name__)
+
+
+R = TypeVar("R", SummaryProgress, SummaryResult)
+
+# Field holding each record's large text, stored compressed after the JSON header
+_TEXT_FIELDS = {SummaryProgress: "current_summary", SummaryResult: "summary"}
+
+_FINISHED = (SummaryStatus.COMPLETED, SummaryStatus.FAILED, SummaryStatus.CANCELLED)
+
+
+def _text_field(record: Any) -> str:
+    return _TEXT_FIELDS[SummaryProgress if isinstance(record, SummaryProgress) else SummaryResult]
+
+
+def _meta(record: Any, text_field: str) -> Dict[str, Any]:
+    meta = {field.name: getattr(record, field.name) for field in fields(record) if field.name != text_field}
+    meta["status"] = record.status.value
+    meta["usage"] = asdict(record.usage)
+    return meta
+
+
+async def _dump(record: Any, codec: TextCodec) -> bytes:
+    text_field = _text_field(record)
+    text = await encode_text(record, text_field, codec)
+    return json.dumps(_meta(record, text_field)).encode("utf-8") + b"\n" + text
+
+
+def _event(kind: str, record: Any) -> str:
+    # Events only say what changed; subscribers read the record itself if they need it
+    return json.dumps({
+        "kind": kind,
+        "request_id": record.request_id,
+        "status": record.status.value,
+        "version": record.version
+    })
+
+
+def _load(cls: Type[R], raw: Optional[Union[str, bytes]], codec: TextCodec) -> Optional[R]:
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    if raw.startswith(b"{") and b"\n" not in raw:
+        # Written before compression: the whole record as one JSON object
+        return _load_json(cls, raw)
+    header, _, text = raw.partition(b"\n")
+    payload: Dict[str, Any] = json.loads(header)
+    payload["status"] = SummaryStatus(payload["status"])
+    payload["usage"] = TokenUsage(**payload.get("usage", {}))
+    payload[_TEXT_FIELDS[cls]] = CompressedText(text, codec)
+    return cast(R, (LazySummaryProgress if cls is SummaryProgress else LazySummaryResult)(**payload))
+
+
+def _load_json(cls: Type[R], raw: Union[str, bytes]) -> R:
+    payload: Dict[str, Any] = json.loads(raw)
+    payload["status"] = SummaryStatus(payload["status"])
+    payload["usage"] = TokenUsage(**payload.get("usage", {}))
+    return cls(**payload)
+
+
+def _load_listing(raw: Optional[Union[str, bytes]]) -> Optional[SummaryListing]:
+    if raw is None:
+        return None
+    payload: Dict[str, Any] = json.loads(raw)
+    payload["status"] = SummaryStatus(payload["status"])
+    return SummaryListing(**payload)
+
+
+class RedisSummaryRepository(SummaryRepository):
+    """
+    SummaryRepository backed by any Redis-protocol server, shared by all worker processes.
+    
+    Each record is stored under `{prefix}:progress:{id}` / `{prefix}:result:{id}` as a
+    JSON header followed by the summary text, encoded by codec; records read back only
+    decompress the text when it is accessed, and records stored as plain JSON before
+    compression was introduced are still read. A save writes the record and publishes
+    its id, status and version on `{prefix}:events:{id}`, so pollers on other workers
+    see the same state and subscribers are told about every change. Connections come
+    from a shared pool.
+    
+    Saves also maintain a small listing record per request and sorted sets scored by
+    creation time for every status/tenant filter combination, so list_summaries reads
+    one page of an index instead of scanning keys. Both the API and worker processes
+    write records of the same request, so a save WATCHes the listing and the record and
+    applies the record, listing, index and event changes in one MULTI transaction,
+    retrying if another process changed either in between; replace_result checks the
+    stored version inside the same watch. Index members whose records expired are
+    dropped when a listing runs into them.
+    """
+    
+    def __init__(
+        self,
+        client: "aioredis.Redis",
+        key_prefix: str = "summary",
+        ttl_seconds: Optional[int] = None,
+        codec: Optional[TextCodec] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.client = client
+        self._clock = clock
+        self.codec = codec or TextCodec("none")
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        logger.info("Initialized Redis summary repository with prefix %s", key_prefix)
+    
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        max_connections: int = 50,
+        key_prefix: str = "summary",
+        ttl_seconds: Optional[int] = None,
+        codec: Optional[TextCodec] = None
+    ) -> "RedisSummaryRepository":
+        pool = aioredis.ConnectionPool.from_url(url, max_connections=max_connections)
+        return cls(aioredis.Redis(connection_pool=pool), key_prefix=key_prefix, ttl_seconds=ttl_seconds, codec=codec)
+    
+    async def save_progress(self, progress: SummaryProgress) -> None:
+        logger.debug("Saving progress for request %s", progress.request_id)
+        await self._save("progress", progress, await _dump(progress, self.codec))
+    
+    async def get_progress(self, request_id: str) -> Optional[SummaryProgress]:
+        logger.debug("Getting progress for request %s", request_id)
+        return _load(SummaryProgress, await self.client.get(self._key("progress", request_id)), self.codec)
+    
+    async def save_result(self, result: SummaryResult) -> None:
+        logger.debug("Saving result for request %s", result.request_id)
+        await self._save("result", result, await _dump(result, self.codec))
+    
+    async def get_result(self, request_id: str) -> Optional[SummaryResult]:
+        logger.debug("Getting result for request %s", request_id)
+        return _load(SummaryResult, await self.client.get(self._key("result", request_id)), self.codec)
+    
+    async def replace_result(self, result: SummaryResult, expected_version: int) -> bool:
+        logger.debug("Replacing version %s of result for request %s", expected_version, result.request_id)
+        payload = await _dump(result, self.codec)
+        return await self._save("result", result, payload, expected_version=expected_version)
+    
+    async def list_summaries(
+        self,
+        status: Optional[SummaryStatus] = None,
+        tenant: Optional[str] = None,
+        since: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> SummaryPage:
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        
+        index = self._index_key(status, tenant)
+        after = decode_cursor(cursor) if cursor is not None else None
+        low = max(since if since is not None else float("-inf"), after[0] if after else float("-inf"))
+        
+        # One extra entry tells whether another page follows
+        entries: List[Tuple[float, str]] = []
+        offset = 0
+        while len(entries) <= limit:
+            batch = cast(List[Tuple[bytes, float]], await self.client.zrangebyscore(
+                index, low, "+inf", start=offset, num=limit + 1, withscores=True
+            ))
+            for member, score in batch:
+                entry = (score, member.decode("utf-8"))
+                # Entries sharing the cursor's creation time are ordered by request id
+                if after is None or entry > after:
+                    entries.append(entry)
+            if len(batch) <= limit:
+                break
+            offset += len(batch)
+        
+        page = entries[:limit]
+        records = await self.client.mget([self._key("listing", request_id) for _, request_id in page]) if page else []
+        items = []
+        expired = []
+        for (_, request_id), raw in zip(page, records):
+            listing = _load_listing(raw)
+            if listing is None:
+                expired.append(request_id)
+            else:
+                items.append(listing)
+        if expired:
+            await self.client.zrem(index, *expired)
+        
+        return SummaryPage(items=items, next_cursor=encode_cursor(*page[-1]) if len(entries) > limit else None)
+    
+    async def subscribe(self, request_id: str) -> AsyncIterator[SummaryProgress]:
+        """
+        Yield the current progress of a request, then each update any worker saves, until
+        the request completes, fails or is cancelled. The subscription starts before the
+        current state is read, so no update is missed; one may be yielded twice.
+        """
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self._key("events", request_id))
+        try:
+            progress = await self.get_progress(request_id)
+            if progress is not None:
+                yield progress
+            listing = _load_listing(await self.client.get(self._key("listing", request_id)))
+            if listing is not None and listing.status in _FINISHED:
+                return
+            
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                event = json.loads(message["data"])
+                if event["kind"] == "progress":
+                    progress = await self.get_progress(request_id)
+                    if progress is not None:
+                        yield progress
+                if SummaryStatus(event["status"]) in _FINISHED:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+    
+    async def close(self) -> None:
+        await self.client.aclose()
+    
+    async def _save(
+        self,
+        kind: str,
+        record: Union[SummaryProgress, SummaryResult],
+        payload: bytes,
+        expected_version: Optional[int] = None
+    ) -> bool:
+        """Write one record atomically; with expected_version, only over a result at that version"""
+        request_id = record.request_id
+        listing_key = self._key("listing", request_id)
+        record_key = self._key(kind, request_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(listing_key, record_key)
+                    if expected_version is not None:
+                        current = _load(SummaryResult, await pipe.get(record_key), self.codec)
+                        if current is None or current.version != expected_version:
+                            return False
+                    previous = _load_listing(await pipe.get(listing_key))
+                    pipe.multi()
+                    self._queue_save(pipe, kind, record, payload, previous)
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    logger.debug("Listing of request %s changed during save; retrying", request_id)
+    
+    def _queue_save(
+        self,
+        pipe: Any,
+        kind: str,
+        record: Union[SummaryProgress, SummaryResult],
+        payload: bytes,
+        previous: Optional[SummaryListing]
+    ) -> None:
+        """Queue the writes of one save on a pipeline in MULTI mode"""
+        request_id = record.request_id
+        now = self._clock()
+        listing = SummaryListing(
+            request_id=request_id,
+            status=record.status,
+            tenant=previous.tenant if previous else record.tenant,
+            created_at=previous.created_at if previous else now,
+            updated_at=now,
+            version=record.version
+        )
+        meta = asdict(listing)
+        meta["status"] = listing.status.value
+        
+        pipe.set(self._key(kind, request_id), payload, ex=self.ttl_seconds)
+        pipe.set(self._key("listing", request_id), json.dumps(meta), ex=self.ttl_seconds)
+        if previous is None:
+            for index in (self._index_key(None, None), self._index_key(None, listing.tenant)):
+                pipe.zadd(index, {request_id: listing.created_at})
+        if previous is None or previous.status != listing.status:
+            if previous is not None:
+                for status_tenant in ((previous.status, None), (previous.status, listing.tenant)):
+                    pipe.zrem(self._index_key(*status_tenant), request_id)
+            for status_tenant in ((listing.status, None), (listing.status, listing.tenant)):
+                pipe.zadd(self._index_key(*status_tenant), {request_id: listing.created_at})
+        pipe.publish(self._key("events", request_id), _event(kind, record))
+    
+    def _key(self, kind: str, request_id: str) -> str:
+        return f"{self.key_prefix}:{kind}:{request_id}"
+    
+    def _index_key(self, status: Optional[SummaryStatus], tenant: Optional[str]) -> str:
+        key = f"{self.key_prefix}:index"
+        if status is not None:
+            key += f":status:{status.value}"
+        if tenant is not None:
+            key += f":tenant:{tenant}"
+        return key
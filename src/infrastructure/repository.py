@@ -1,32 +1,155 @@
+import bisect
+import copy
 import logging
-from typing import Dict, Optional
+import time
+from collections import defaultdict
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
-from src.domain import SummaryProgress, SummaryResult, SummaryRepository
+from src.domain import (
+    SummaryListing,
+    SummaryPage,
+    SummaryProgress,
+    SummaryResult,
+    SummaryRepository,
+    SummaryStatus,
+    decode_cursor,
+    encode_cursor
+)
+
+from .compression import TextCodec, compress_progress, compress_result
 
 
 logger = logging.getLogger(__name__)
 
+# Listing indexes are keyed by (status, tenant), None meaning "any"
+IndexKey = Tuple[Optional[SummaryStatus], Optional[str]]
+
+R = TypeVar("R", SummaryProgress, SummaryResult)
+
 
 class InMemorySummaryRepository(SummaryRepository):
-    """In-memory implementation of SummaryRepository for development/testing"""
+    """
+    In-memory implementation of SummaryRepository for development/testing.
+    
+    With a codec, summaries are held compressed and records come back with their
+    summary text decompressed only when it is read.
     
-    def __init__(self):
+    Every save also updates a listing entry per request and sorted (created_at,
+    request_id) indexes for each status/tenant filter combination, so a listing page
+    costs a binary search plus the page itself.
+    """
+    
+    def __init__(self, codec: Optional[TextCodec] = None, clock: Callable[[], float] = time.time):
+        self.codec = codec
+        self._clock = clock
         self._progress: Dict[str, SummaryProgress] = {}
         self._results: Dict[str, SummaryResult] = {}
+        self._listings: Dict[str, SummaryListing] = {}
+        self._indexes: Dict[IndexKey, List[Tuple[float, str]]] = defaultdict(list)
         logger.info("Initialized in-memory summary repository")
     
     async def save_progress(self, progress: SummaryProgress) -> None:
-        logger.debug(f"Saving progress for request {progress.request_id}")
-        self._progress[progress.request_id] = progress
+        logger.debug("Saving progress for request %s", progress.request_id)
+        self._progress[progress.request_id] = await compress_progress(progress, self.codec) if self.codec else progress
+        self._update_listing(progress)
     
     async def get_progress(self, request_id: str) -> Optional[SummaryProgress]:
-        logger.debug(f"Getting progress for request {request_id}")
-        return self._progress.get(request_id)
+        logger.debug("Getting progress for request %s", request_id)
+        return self._load(self._progress.get(request_id))
     
     async def save_result(self, result: SummaryResult) -> None:
-        logger.debug(f"Saving result for request {result.request_id}")
-        self._results[result.request_id] = result
+        logger.debug("Saving result for request %s", result.request_id)
+        self._results[result.request_id] = await compress_result(result, self.codec) if self.codec else result
+        self._update_listing(result)
     
     async def get_result(self, request_id: str) -> Optional[SummaryResult]:
-        logger.debug(f"Getting result for request {request_id}")
-        return self._results.get(request_id)
\ No newline at end of file
+        logger.debug("Getting result for request %s", request_id)
+        return self._load(self._results.get(request_id))
+    
+    async def replace_result(self, result: SummaryResult, expected_version: int) -> bool:
+        current = self._results.get(result.request_id)
+        if current is None or current.version != expected_version:
+            return False
+        await self.save_result(result)
+        return True
+    
+    async def list_summaries(
+        self,
+        status: Optional[SummaryStatus] = None,
+        tenant: Optional[str] = None,
+        since: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> SummaryPage:
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        
+        index = self._indexes.get((status, tenant), [])
+        start = bisect.bisect_left(index, (since, "")) if since is not None else 0
+        if cursor is not None:
+            start = max(start, bisect.bisect_right(index, decode_cursor(cursor)))
+        
+        page = index[start:start + limit]
+        return SummaryPage(
+            items=[replace(self._listings[request_id]) for _, request_id in page],
+            next_cursor=encode_cursor(*page[-1]) if start + limit < len(index) else None
+        )
+    
+    def discard(self, request_id: str) -> None:
+        """Drop stored progress and result once a caller has persisted them elsewhere"""
+        self._progress.pop(request_id, None)
+        self._results.pop(request_id, None)
+        listing = self._listings.pop(request_id, None)
+        if listing is not None:
+            for key in _index_keys(listing.status, listing.tenant):
+                self._unindex(key, listing)
+    
+    def _load(self, record: Optional[R]) -> Optional[R]:
+        if record is None or self.codec is None:
+            return record
+        # Hand out a copy so decompressing it does not expand the stored record
+        return copy.copy(record)
+    
+    def _update_listing(self, record: Union[SummaryProgress, SummaryResult]) -> None:
+        now = self._clock()
+        listing = self._listings.get(record.request_id)
+        if listing is None:
+            listing = SummaryListing(
+                request_id=record.request_id,
+                status=record.status,
+                tenant=record.tenant,
+                created_at=now,
+                updated_at=now,
+                version=record.version
+            )
+            self._listings[record.request_id] = listing
+            for key in _index_keys(listing.status, listing.tenant):
+                bisect.insort(self._indexes[key], (listing.created_at, listing.request_id))
+            return
+        
+        if record.status != listing.status:
+            # Only the status indexes change; creation time and tenant are fixed
+            for key in _status_keys(listing.status, listing.tenant):
+                self._unindex(key, listing)
+            for key in _status_keys(record.status, listing.tenant):
+                bisect.insort(self._indexes[key], (listing.created_at, listing.request_id))
+        listing.status = record.status
+        listing.version = record.version
+        listing.updated_at = now
+    
+    def _unindex(self, key: IndexKey, listing: SummaryListing) -> None:
+        index = self._indexes[key]
+        position = bisect.bisect_left(index, (listing.created_at, listing.request_id))
+        if position < len(index) and index[position][1] == listing.request_id:
+            del index[position]
+        if not index:
+            del self._indexes[key]
+
+
+def _status_keys(status: SummaryStatus, tenant: str) -> Tuple[IndexKey, ...]:
+    return ((status, None), (status, tenant))
+
+
+def _index_keys(status: SummaryStatus, tenant: str) -> Tuple[IndexKey, ...]:
+    return ((None, None), (None, tenant)) + _status_keys(status, tenant)
@@ -0,0 +1,75 @@
+import logging
+from typing import Dict, Optional
+
+from src.domain import UsageMeter
+from src.domain.interfaces import LLMService
+
+from .circuit_breaker import CircuitBreakerLLMService
+from .llm_service import LangChainLLMService
+
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingLLMService(LLMService):
+    """
+    Routes each summarization stage to its own LLMService.
+    
+    Initial and partial summaries go to initial_service, refine and condense steps to
+    refine_service, and the final consolidation to final_service. Stages without a
+    dedicated service fall back to initial_service.
+    """
+    
+    def __init__(
+        self,
+        initial_service: LLMService,
+        refine_service: Optional[LLMService] = None,
+        final_service: Optional[LLMService] = None
+    ):
+        self.initial_service = initial_service
+        self.refine_service = refine_service or initial_service
+        self.final_service = final_service or initial_service
+        logger.info("Initialized routing LLM service")
+    
+    async def generate_initial_summary(self, content: str) -> str:
+        return await self.initial_service.generate_initial_summary(content)
+    
+    async def refine_summary(self, existing_summary: str, new_content: str) -> str:
+        return await self.refine_service.refine_summary(existing_summary, new_content)
+    
+    async def condense_summary(self, summary: str, max_tokens: int) -> str:
+        return await self.refine_service.condense_summary(summary, max_tokens)
+    
+    async def consolidate_summaries(self, partial_summaries: str) -> str:
+        return await self.final_service.consolidate_summaries(partial_summaries)
+
+
+def build_llm_service(
+    api_key: Optional[str],
+    model_name: Optional[str] = None,
+    refine_model_name: Optional[str] = None,
+    final_model_name: Optional[str] = None,
+    fallback_model_name: Optional[str] = None,
+    usage_meter: Optional[UsageMeter] = None
+) -> CircuitBreakerLLMService:
+    """
+    Route each summarization stage to its configured model, one client per model,
+    behind a circuit breaker that fails over to the fallback model when configured
+    """
+    services: Dict[Optional[str], LangChainLLMService] = {}
+    
+    def service_for(name: Optional[str]) -> LangChainLLMService:
+        if name not in services:
+            services[name] = (
+                LangChainLLMService(api_key=api_key, model_name=name, usage_meter=usage_meter)
+                if name else LangChainLLMService(api_key=api_key, usage_meter=usage_meter)
+            )
+        return services[name]
+    
+    primary = RoutingLLMService(
+        initial_service=service_for(model_name),
+        refine_service=service_for(refine_model_name or model_name),
+        final_service=service_for(final_model_name or model_name)
+    )
+    fallback = service_for(fallback_model_name) if fallback_model_name else None
+    return CircuitBreakerLLMService(primary, fallback=fallback)
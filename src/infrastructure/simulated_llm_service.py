@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from src.domain import LLMService, TokenUsage, UsageMeter, estimate_tokens, record_usage
+from src.domain.tokens import CHARS_PER_TOKEN
+
+from .llm_service import model_prices
+
+
+logger = logging.getLogger(__name__)
+
+_FILLER = "Simulated summary sentence covering the key points of the source material. "
+
+
+class SimulatedAPIError(Exception):
+    """A provider error as the simulator raises it: 400 for oversized requests, 429 for rate limits, 529 for overload"""
+    
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"Error code: {status_code} - {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _TokenBucket:
+    """Per-minute limit that refills continuously, like provider rate limits"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self.updated = 0.0
+    
+    def wait_for(self, amount: float, now: float) -> float:
+        """Seconds until amount is available; amount must not exceed capacity"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        return max(amount - self.level, 0.0) / self.rate
+    
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+class SimulatedLLMService(LLMService):
+    """
+    LLMService that models a provider's latency, throughput, rate limits and errors
+    without calling one, for load tests and capacity planning.
+    
+    A call takes time_to_first_token (plus input_tokens / prefill_tokens_per_second when
+    set) and then output_tokens / tokens_per_second, with +/- jitter. Output is
+    output_ratio of the input, between min_output_tokens and max_output_tokens, so
+    summary sizes and their growth across refine steps follow the real pipeline.
+    
+    requests_per_minute and input_tokens_per_minute are enforced with token buckets:
+    a call over the limit gets a 429 with a retry-after and uses up none of either
+    limit, while one needing more than a whole minute's allowance gets a 400. Other
+    attempts fail with a 529 at error_rate. Like the provider SDK, 429s and 529s are
+    retried up to max_retries times, honouring retry-after or backing off
+    exponentially.
+    
+    Everything runs speedup times faster than real time, limits included, so traces
+    can be replayed quickly; durations reported by snapshot() are in simulated seconds.
+    Usage is priced as model_name and recorded like LangChainLLMService does.
+    """
+    
+    def __init__(
+        self,
+        tokens_per_second: float = 60.0,
+        time_to_first_token: float = 0.8,
+        prefill_tokens_per_second: Optional[float] = None,
+        requests_per_minute: Optional[float] = None,
+        input_tokens_per_minute: Optional[float] = None,
+        error_rate: float = 0.0,
+        max_retries: int = 2,
+        output_ratio: float = 0.2,
+        min_output_tokens: int = 50,
+        max_output_tokens: int = 1024,
+        jitter: float = 0.2,
+        speedup: float = 1.0,
+        model_name: str = "claude-3-5-sonnet-latest",
+        usage_meter: Optional[UsageMeter] = None,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if tokens_per_second <= 0 or speedup <= 0:
+            raise ValueError("tokens_per_second and speedup must be positive")
+        if not 0 <= error_rate <= 1 or not 0 <= jitter < 1:
+            raise ValueError("error_rate must be in [0, 1] and jitter in [0, 1)")
+        
+        self.tokens_per_second = tokens_per_second
+        self.time_to_first_token = time_to_first_token
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self.error_rate = error_rate
+        # Options parsed from the environment arrive as floats
+        self.max_retries = int(max_retries)
+        self.output_ratio = output_ratio
+        self.min_output_tokens = int(min_output_tokens)
+        self.max_output_tokens = int(max_output_tokens)
+        self.jitter = jitter
+        self.speedup = speedup
+        self.model_name = model_name
+        self.usage_meter = usage_meter
+        self.prices = model_prices(model_name)
+        self._random = random.Random(seed)
+        self._clock = clock
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._input_tokens = _TokenBucket(input_tokens_per_minute) if input_tokens_per_minute else None
+        
+        self._calls = 0
+        self._attempts = 0
+        self._rate_limited = 0
+        self._errors = 0
+        self._failed_calls = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=100_000)
+        logger.info("Initialized simulated LLM service (%s tok/s, %sx speed-up)", tokens_per_second, speedup)
+    
+    async def generate_initial_summary(self, content: str) -> str:
+        return await self._complete(content)
+    
+    async def refine_summary(self, existing_summary: str, new_content: str) -> str:
+        return await self._complete(existing_summary + new_content)
+    
+    async def condense_summary(self, summary: str, max_tokens: int) -> str:
+        return await self._complete(summary, max_output_tokens=max_tokens)
+    
+    async def consolidate_summaries(self, partial_summaries: str) -> str:
+        return await self._complete(partial_summaries)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "calls": self._calls,
+            "attempts": self._attempts,
+            "rate_limited": self._rate_limited,
+            "errors": self._errors,
+            "failed_calls": self._failed_calls,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "latency_p50_seconds": round(latencies[len(latencies) // 2], 3) if latencies else None,
+            "latency_p99_seconds": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)], 3) if latencies else None
+        }
+    
+    async def _complete(self, prompt: str, max_output_tokens: Optional[int] = None) -> str:
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = int(input_tokens * self.output_ratio)
+        output_tokens = max(self.min_output_tokens, min(output_tokens, self.max_output_tokens))
+        if max_output_tokens is not None:
+            output_tokens = min(output_tokens, max_output_tokens)
+        
+        self._calls += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = self._now()
+        try:
+            for attempt in range(self.max_retries + 1):
+                self._attempts += 1
+                try:
+                    await self._attempt(input_tokens, output_tokens)
+                    break
+                except SimulatedAPIError as e:
+                    if attempt == self.max_retries or e.status_code not in (429, 529):
+                        self._failed_calls += 1
+                        raise
+                    backoff = e.retry_after if e.retry_after is not None else min(0.5 * 2 ** attempt, 8.0)
+                    await self._sleep(backoff)
+        finally:
+            self._in_flight -= 1
+        self._latencies.append(self._now() - started)
+        
+        usage = TokenUsage(input_tokens=input_tokens, output_tokens=output_tokens, llm_calls=1)
+        if self.prices:
+            input_price, output_price = self.prices
+            usage.cost_usd = (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+        record_usage(usage)
+        if self.usage_meter is not None:
+            self.usage_meter.record(f"simulated:{self.model_name}", usage)
+        
+        repeats = output_tokens * CHARS_PER_TOKEN // len(_FILLER) + 1
+        return (_FILLER * repeats)[:output_tokens * CHARS_PER_TOKEN]
+    
+    async def _attempt(self, input_tokens: int, output_tokens: int) -> None:
+        now = self._now()
+        limits = [
+            (bucket, amount)
+            for bucket, amount in ((self._requests, 1), (self._input_tokens, input_tokens))
+            if bucket is not None
+        ]
+        if any(amount > bucket.capacity for bucket, amount in limits):
+            # No wait would ever admit it, so retrying is pointless
+            raise SimulatedAPIError(400, "invalid_request_error: request exceeds the per-minute rate limit")
+        
+        # Only take from the buckets once all of them admit the attempt
+        waits = [bucket.wait_for(amount, now) for bucket, amount in limits]
+        if any(waits):
+            self._rate_limited += 1
+            raise SimulatedAPIError(429, "rate_limit_error", retry_after=max(waits))
+        for bucket, amount in limits:
+            bucket.take(amount)
+        
+        duration = self.time_to_first_token + output_tokens / self.tokens_per_second
+        if self.prefill_tokens_per_second:
+            duration += input_tokens / self.prefill_tokens_per_second
+        duration *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        
+        if self._random.random() < self.error_rate:
+            # Overloaded errors arrive after a partial wait, not instantly
+            await self._sleep(self.time_to_first_token)
+            self._errors += 1
+            raise SimulatedAPIError(529, "overloaded_error")
+        await self._sleep(duration)
+    
+    def _now(self) -> float:
+        """Simulated seconds"""
+        return self._clock() * self.speedup
+    
+    async def _sleep(self, simulated_seconds: float) -> None:
+        await asyncio.sleep(simulated_seconds / self.speedup)
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+from src.domain import (
+    Document,
+    JobKind,
+    JobPriority,
+    JobQueue,
+    QueuedJob,
+    SummaryRequest,
+    SummaryStrategy
+)
+
+from .compression import TextCodec
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary_jobs (
+    job_id TEXT PRIMARY KEY,
+    request_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    priority_rank INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    tenant TEXT NOT NULL DEFAULT 'default',
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS summary_jobs_claim ON summary_jobs (state, priority_rank, created_at);
+CREATE INDEX IF NOT EXISTS summary_jobs_request ON summary_jobs (request_id, state);
+CREATE TABLE IF NOT EXISTS summary_tenant_claims (
+    tenant TEXT PRIMARY KEY,
+    claim_seq INTEGER NOT NULL
+);
+"""
+
+# Columns added after the table was first released, with their definitions
+_ADDED_COLUMNS = {
+    "tenant": "TEXT NOT NULL DEFAULT 'default'",
+    "cancel_requested": "INTEGER NOT NULL DEFAULT 0"
+}
+
+
+async def _encode_request(request: SummaryRequest, codec: TextCodec) -> bytes:
+    return await codec.encode_async(json.dumps({
+        "request_id": request.request_id,
+        "documents": [
+            {"content": doc.content, "title": doc.title, "metadata": doc.metadata} for doc in request.documents
+        ],
+        "strategy": request.strategy.value,
+        "callback_url": request.callback_url,
+        "tenant": request.tenant,
+        "priority": request.priority.value
+    }))
+
+
+def _decode_request(payload: Union[str, bytes], codec: TextCodec) -> SummaryRequest:
+    # Jobs enqueued before compression hold the JSON text itself
+    if isinstance(payload, str) or payload.startswith(b"{"):
+        data: Dict[str, Any] = json.loads(payload)
+    else:
+        data = json.loads(codec.decode(payload))
+    return SummaryRequest(
+        request_id=data["request_id"],
+        documents=[Document(**doc) for doc in data["documents"]],
+        strategy=SummaryStrategy(data["strategy"]),
+        callback_url=data["callback_url"],
+        tenant=data["tenant"],
+        priority=JobPriority(data["priority"])
+    )
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Durable job table with visibility-timeout leases, shared by every worker process
+    that opens the same database file.
+    
+    claim() atomically hands a pending job of the highest priority to one worker for
+    lease_seconds. Within a priority, tenants take turns: the next job comes from the
+    tenant whose last claim is oldest, and within a tenant jobs go oldest first, so one
+    tenant's flood cannot hold back the others. Tenant weights only apply within each
+    worker's JobRunner. The worker extends the lease with heartbeat() and removes
+    the job with complete(). A job whose lease runs out (its worker died) becomes
+    claimable again, until max_attempts claims have been used up; reap_expired() then
+    marks it failed so its status can be recorded. Jobs already claimed cannot be
+    cancelled in the table; request_cancel() flags them for their worker, which checks
+    cancel_requested() on each heartbeat. Completed jobs are deleted at once; failed
+    and cancelled rows are kept for retention_seconds after they were enqueued and
+    purged by reap_expired().
+    """
+    
+    def __init__(
+        self,
+        path: str = "summary_jobs.db",
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+        codec: Optional[TextCodec] = None,
+        retention_seconds: float = 7 * 24 * 3600
+    ):
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be positive")
+        
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        # Document payloads are the bulk of the table; compress them like stored summaries
+        self.codec = codec or TextCodec("none")
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Autocommit mode; writes open their own IMMEDIATE transactions
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA busy_timeout = 5000")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        logger.info("Initialized SQLite job queue at %s", path)
+    
+    async def enqueue(self, request: SummaryRequest, kind: JobKind) -> str:
+        job_id = str(uuid.uuid4())
+        # Compress before taking the connection lock, which serializes every queue operation
+        payload = await _encode_request(request, self.codec)
+        
+        def insert(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "INSERT INTO summary_jobs "
+                "(job_id, request_id, kind, payload, priority_rank, state, created_at, tenant) "
+                "VALUES (?, ?, ?, ?, ?, 'pending', ?, ?)",
+                (
+                    job_id,
+                    request.request_id,
+                    kind.value,
+                    payload,
+                    request.priority.rank,
+                    self._clock(),
+                    request.tenant
+                )
+            )
+        
+        await self._run(insert)
+        logger.debug("Enqueued %s job %s for request %s", kind.value, job_id, request.request_id)
+        return job_id
+    
+    async def claim(self, worker_id: str, lease_seconds: float) -> Optional[QueuedJob]:
+        def claim_next(conn: sqlite3.Connection) -> Optional[QueuedJob]:
+            now = self._clock()
+            # Tenants never claimed from sort first, then the one served longest ago
+            row = conn.execute(
+                "SELECT job.job_id, job.kind, job.payload, job.attempts, job.tenant FROM summary_jobs AS job "
+                "LEFT JOIN summary_tenant_claims AS claims ON claims.tenant = job.tenant "
+                "WHERE job.state = 'pending' "
+                "OR (job.state = 'leased' AND job.lease_expires_at < ? AND job.attempts < ?) "
+                "ORDER BY job.priority_rank, COALESCE(claims.claim_seq, 0), job.created_at LIMIT 1",
+                (now, self.max_attempts)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            job_id, kind, payload, attempts, tenant = row
+            conn.execute(
+                "UPDATE summary_jobs SET state = 'leased', worker_id = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1 WHERE job_id = ?",
+                (worker_id, now + lease_seconds, job_id)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO summary_tenant_claims (tenant, claim_seq) "
+                "VALUES (?, (SELECT COALESCE(MAX(claim_seq), 0) + 1 FROM summary_tenant_claims))",
+                (tenant,)
+            )
+            return QueuedJob(
+                job_id=job_id,
+                kind=JobKind(kind),
+                request=_decode_request(payload, self.codec),
+                attempts=attempts + 1
+            )
+        
+        job = await self._run(claim_next)
+        if job is not None and job.attempts > 1:
+            logger.warning("Worker %s reclaimed job %s (attempt %s)", worker_id, job.job_id, job.attempts)
+        return job
+    
+    async def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease; False means it expired and another worker may own the job"""
+        def extend(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "UPDATE summary_jobs SET lease_expires_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND state = 'leased'",
+                (self._clock() + lease_seconds, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+        
+        return await self._run(extend)
+    
+    async def complete(self, job_id: str, worker_id: str) -> None:
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM summary_jobs WHERE job_id = ? AND worker_id = ?", (job_id, worker_id))
+        
+        await self._run(delete)
+    
+    async def release(self, job_id: str, worker_id: str, error: str) -> None:
+        """Give a job back after an error; it is retried until max_attempts, then failed"""
+        def requeue(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "UPDATE summary_jobs SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                "worker_id = NULL, lease_expires_at = NULL, last_error = ? "
+                "WHERE job_id = ? AND worker_id = ? AND state = 'leased'",
+                (self.max_attempts, error, job_id, worker_id)
+            )
+        
+        await self._run(requeue)
+    
+    async def cancel(self, request_id: str) -> bool:
+        """Cancel jobs for a request that no worker has claimed yet"""
+        def cancel_pending(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "UPDATE summary_jobs SET state = 'cancelled' WHERE request_id = ? AND state = 'pending'",
+                (request_id,)
+            )
+            return cursor.rowcount > 0
+        
+        return await self._run(cancel_pending)
+    
+    async def request_cancel(self, request_id: str) -> bool:
+        """Flag claimed jobs of a request, so the workers running them cancel them"""
+        def flag_leased(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "UPDATE summary_jobs SET cancel_requested = 1 WHERE request_id = ? AND state = 'leased'",
+                (request_id,)
+            )
+            return cursor.rowcount > 0
+        
+        return await self._run(flag_leased)
+    
+    async def cancel_requested(self, job_id: str) -> bool:
+        def read_flag(conn: sqlite3.Connection) -> bool:
+            row = conn.execute("SELECT cancel_requested FROM summary_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return bool(row and row[0])
+        
+        return await self._run(read_flag, transaction=False)
+    
+    async def reap_expired(self) -> List[QueuedJob]:
+        """
+        Fail jobs whose last allowed lease expired, returning them so callers can record
+        it, and purge failed and cancelled rows older than the retention period
+        """
+        def reap(conn: sqlite3.Connection) -> List[QueuedJob]:
+            now = self._clock()
+            purged = conn.execute(
+                "DELETE FROM summary_jobs WHERE state IN ('failed', 'cancelled') AND created_at < ?",
+                (now - self.retention_seconds,)
+            ).rowcount
+            if purged:
+                logger.info("Purged %s finished jobs past retention", purged)
+            rows = conn.execute(
+                "SELECT job_id, kind, payload, attempts FROM summary_jobs "
+                "WHERE state = 'leased' AND lease_expires_at < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            ).fetchall()
+            for job_id, _, _, attempts in rows:
+                conn.execute(
+                    "UPDATE summary_jobs SET state = 'failed', last_error = ? WHERE job_id = ?",
+                    (f"Lease expired after {attempts} attempts", job_id)
+                )
+            return [
+                QueuedJob(
+                    job_id=job_id, kind=JobKind(kind), request=_decode_request(payload, self.codec), attempts=attempts
+                )
+                for job_id, kind, payload, attempts in rows
+            ]
+        
+        return await self._run(reap)
+    
+    async def counts(self) -> Dict[str, int]:
+        """Number of jobs per state"""
+        def count(conn: sqlite3.Connection) -> Dict[str, int]:
+            return dict(conn.execute("SELECT state, COUNT(*) FROM summary_jobs GROUP BY state").fetchall())
+        
+        return await self._run(count, transaction=False)
+    
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+    
+    async def _run(self, operation: Callable[[sqlite3.Connection], T], transaction: bool = True) -> T:
+        # SQLite calls block, so they run off the event loop
+        def execute() -> T:
+            with self._lock:
+                if not transaction:
+                    return operation(self._conn)
+                with self._transaction() as conn:
+                    return operation(conn)
+        
+        return await asyncio.to_thread(execute)
+    
+    def _migrate(self) -> None:
+        # Inside the write lock, so processes opening an old file together add each column once
+        with self._transaction() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(summary_jobs)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE summary_jobs ADD COLUMN {column} {definition}")
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two processes never claim the same job
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import random
+import socket
+import time
+from dataclasses import asdict
+from urllib.parse import urlsplit, urlunsplit
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.domain import CompletionNotifier, SummaryResult
+
+
+logger = logging.getLogger(__name__)
+
+# NAT64 and 6to4 addresses look global but are translated to an embedded IPv4 address
+_TRANSLATED_NETWORKS = tuple(
+    ipaddress.ip_network(network) for network in ("64:ff9b::/96", "64:ff9b:1::/48", "2002::/16")
+)
+
+
+class WebhookNotifier(CompletionNotifier):
+    """
+    Delivers final summary results to client callback URLs.
+    
+    notify() only enqueues, so summary workers never wait on a slow receiver. A small
+    pool of delivery workers drains the bounded queue through one pooled HTTP client,
+    retrying network errors, 429 and 5xx responses with jittered exponential backoff.
+    When a secret is configured each request is signed with HMAC-SHA256 over
+    "<timestamp>.<body>" in the X-Summary-Signature header.
+    
+    Callback URLs must be http(s) and resolve only to public addresses, so clients
+    cannot point the service at loopback, private or link-local hosts; the check runs
+    when a job is accepted and again before each delivery, as DNS may have changed.
+    Deliveries connect to the address that passed the check rather than resolving the
+    host again, so a rebinding DNS server cannot swap in a private address afterwards.
+    allow_private_targets lifts the check for deployments whose receivers are internal.
+    
+    close() gives queued callbacks up to drain_timeout seconds to be delivered.
+    """
+    
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        max_queue_size: int = 1000,
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 10.0,
+        allow_private_targets: bool = False,
+        drain_timeout: float = 10.0
+    ):
+        if max_queue_size <= 0 or workers <= 0 or max_attempts <= 0:
+            raise ValueError("max_queue_size, workers and max_attempts must be positive")
+        
+        self.secret = secret
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.allow_private_targets = allow_private_targets
+        self.drain_timeout = drain_timeout
+        self.dropped = 0
+        
+        self._queue: Optional["asyncio.Queue[Tuple[str, SummaryResult]]"] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        logger.info("Initialized webhook notifier (queue size %s, %s workers)", max_queue_size, workers)
+    
+    async def notify(self, callback_url: str, result: SummaryResult) -> None:
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait((callback_url, result))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Webhook queue full, dropping callback for request %s", result.request_id)
+    
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "dropped": self.dropped
+        }
+    
+    async def check_target(self, callback_url: str) -> Optional[str]:
+        """
+        Raise ValueError unless callback_url is an http(s) URL of public addresses, and
+        return the address to connect to; None when private targets are allowed.
+        """
+        parts = urlsplit(callback_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("Callback URL must be an http or https URL")
+        if self.allow_private_targets:
+            return None
+        
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                parts.hostname, parts.port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM
+            )
+        except (OSError, UnicodeError) as e:
+            raise ValueError(f"Callback host {parts.hostname} does not resolve") from e
+        addresses = []
+        for info in infos:
+            # Scoped IPv6 addresses carry a "%interface" suffix
+            address = ipaddress.ip_address(str(info[4][0]).split("%", 1)[0])
+            if not address.is_global or any(address in network for network in _TRANSLATED_NETWORKS):
+                raise ValueError(f"Callback host {parts.hostname} resolves to non-public address {address}")
+            addresses.append(str(address))
+        if not addresses:
+            raise ValueError(f"Callback host {parts.hostname} does not resolve")
+        return addresses[0]
+    
+    async def join(self) -> None:
+        """Wait until every queued callback has been delivered or given up on"""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def close(self) -> None:
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Closing webhook notifier with %s callbacks undelivered", self._queue.qsize()
+                )
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+        
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _ensure_started(self) -> "asyncio.Queue[Tuple[str, SummaryResult]]":
+        # Started lazily so the notifier can be built before an event loop exists
+        if self._queue is not None and self._client is not None:
+            return self._queue
+        
+        queue: "asyncio.Queue[Tuple[str, SummaryResult]]" = asyncio.Queue(maxsize=self.max_queue_size)
+        client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers)
+        )
+        self._queue, self._client = queue, client
+        self._worker_tasks = [
+            asyncio.create_task(self._deliver_forever(queue, client)) for _ in range(self.workers)
+        ]
+        return queue
+    
+    async def _deliver_forever(
+        self, queue: "asyncio.Queue[Tuple[str, SummaryResult]]", client: httpx.AsyncClient
+    ) -> None:
+        while True:
+            callback_url, result = await queue.get()
+            try:
+                await self._deliver(client, callback_url, result)
+            except Exception as e:
+                logger.error("Unexpected error delivering callback for request %s: %s", result.request_id, e)
+            finally:
+                queue.task_done()
+    
+    async def _deliver(self, client: httpx.AsyncClient, callback_url: str, result: SummaryResult) -> bool:
+        try:
+            address = await self.check_target(callback_url)
+        except ValueError as e:
+            logger.warning("Not delivering callback for request %s: %s", result.request_id, e)
+            return False
+        body, headers = self._build_request(result)
+        url = callback_url
+        extensions: Dict[str, Any] = {}
+        if address is not None:
+            url, host_header, extensions = _pin_to_address(callback_url, address)
+            headers["Host"] = host_header
+        
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = await client.post(url, content=body, headers=headers, extensions=extensions)
+                if response.status_code < 300:
+                    logger.info("Delivered callback for request %s on attempt %s", result.request_id, attempt)
+                    return True
+                if response.status_code != 429 and response.status_code < 500:
+                    logger.warning(
+                        "Callback for request %s rejected with %s, not retrying",
+                        result.request_id, response.status_code
+                    )
+                    return False
+                logger.warning(
+                    "Callback for request %s got %s on attempt %s",
+                    result.request_id, response.status_code, attempt
+                )
+            except httpx.HTTPError as e:
+                logger.warning("Callback for request %s failed on attempt %s: %s", result.request_id, attempt, e)
+            
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self._backoff(attempt))
+        
+        logger.error("Giving up on callback for request %s after %s attempts", result.request_id, self.max_attempts)
+        return False
+    
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
+    
+    def _build_request(self, result: SummaryResult) -> Tuple[bytes, Dict[str, str]]:
+        body = json.dumps({
+            "request_id": result.request_id,
+            "summary": result.summary,
+            "status": result.status.value,
+            "error_message": result.error_message,
+            "version": result.version,
+            "usage": asdict(result.usage)
+        }).encode("utf-8")
+        
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            timestamp = str(int(time.time()))
+            signature = hmac.new(
+                self.secret.encode("utf-8"),
+                timestamp.encode("utf-8") + b"." + body,
+                hashlib.sha256
+            ).hexdigest()
+            headers["X-Summary-Timestamp"] = timestamp
+            headers["X-Summary-Signature"] = f"sha256={signature}"
+        return body, headers
+
+
+def _pin_to_address(callback_url: str, address: str) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Rewrite callback_url to connect to address, returning the URL, the Host header to
+    send, and request extensions so TLS still verifies the certificate for the host.
+    """
+    parts = urlsplit(callback_url)
+    userinfo, _, host_port = parts.netloc.rpartition("@")
+    netloc = f"[{address}]" if ":" in address else address
+    if parts.port:
+        netloc = f"{netloc}:{parts.port}"
+    if userinfo:
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit(parts._replace(netloc=netloc)), host_port, {"sni_hostname": parts.hostname}
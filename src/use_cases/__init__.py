@@ -1,3 +1,25 @@
 from .summary_use_case import SummaryUseCase
+from .job_runner import JobRunner
+from .fair_queue import FairQueue
+from .queue_worker import QueueWorker
+from .admission import (
+    AdmissionController,
+    AdmissionDecision,
+    AdmissionOutcome,
+    AdmissionPolicy,
+    CostEstimate,
+    CostEstimator
+)
 
-__all__ = ['SummaryUseCase']
\ No newline at end of file
+__all__ = [
+    'SummaryUseCase',
+    'JobRunner',
+    'FairQueue',
+    'QueueWorker',
+    'AdmissionController',
+    'AdmissionDecision',
+    'AdmissionOutcome',
+    'AdmissionPolicy',
+    'CostEstimate',
+    'CostEstimator'
+]
@@ -0,0 +1,269 @@
+import asyncio
+import itertools
+import logging
+import math
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from src.domain import JobKind, SummaryRequest, SummaryStrategy, estimate_tokens
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionPolicy(Enum):
+    REJECT = "reject"
+    DEFER = "defer"
+    DOWNGRADE = "downgrade"
+
+
+class AdmissionOutcome(Enum):
+    ADMITTED = "admitted"
+    DEFERRED = "deferred"
+    DOWNGRADED = "downgraded"
+    REJECTED = "rejected"
+    TOO_LARGE = "too_large"
+
+
+@dataclass
+class CostEstimate:
+    tokens: int
+    llm_calls: int
+    sequential_calls: int
+    seconds: float
+
+
+@dataclass
+class AdmissionDecision:
+    outcome: AdmissionOutcome
+    strategy: SummaryStrategy
+    estimate: CostEstimate
+    estimated_completion_seconds: float
+    reservation_id: Optional[str] = None
+    
+    @property
+    def accepted(self) -> bool:
+        return self.outcome not in (AdmissionOutcome.REJECTED, AdmissionOutcome.TOO_LARGE)
+
+
+class CostEstimator:
+    """
+    Up-front token and LLM-call estimate for a summary request.
+    
+    Refine re-sends the running summary on every step, so its token cost grows with
+    document count; hierarchical pays extra roll-up calls but runs them concurrently.
+    Time is sequential_calls * seconds_per_call plus tokens / tokens_per_second.
+    """
+    
+    def __init__(
+        self,
+        summary_tokens: int = 500,
+        section_token_threshold: int = 2000,
+        precondense_min_tokens: int = 500,
+        seconds_per_call: float = 5.0,
+        tokens_per_second: float = 2000.0
+    ):
+        self.summary_tokens = summary_tokens
+        self.section_token_threshold = section_token_threshold
+        self.precondense_min_tokens = precondense_min_tokens
+        self.seconds_per_call = seconds_per_call
+        self.tokens_per_second = tokens_per_second
+    
+    def estimate(self, request: SummaryRequest, strategy: Optional[SummaryStrategy] = None) -> CostEstimate:
+        strategy = strategy or request.strategy
+        document_tokens = [estimate_tokens(doc.content) for doc in request.documents]
+        documents = len(document_tokens)
+        input_tokens = sum(document_tokens)
+        
+        if strategy == SummaryStrategy.HIERARCHICAL:
+            calls = 0
+            depth = 1
+            for tokens in document_tokens:
+                leaves = max(1, math.ceil(tokens / self.section_token_threshold))
+                calls += 2 * leaves - 1
+                depth = max(depth, 1 + math.ceil(math.log2(leaves)))
+            if documents > 1:
+                calls += 1
+                depth += 1
+            # Every call beyond the leaves re-reads a summary
+            tokens = input_tokens + (calls - documents) * self.summary_tokens
+            sequential_calls = depth
+        else:
+            calls = documents
+            tokens = input_tokens + (documents - 1) * self.summary_tokens
+            sequential_calls = documents
+            if strategy == SummaryStrategy.PIPELINED_REFINE:
+                # Large documents are read once to condense, then refined from the condensed text
+                precondensed = sum(1 for t in document_tokens[1:] if t > self.precondense_min_tokens)
+                calls += precondensed
+                tokens += precondensed * self.summary_tokens
+        
+        seconds = sequential_calls * self.seconds_per_call + tokens / self.tokens_per_second
+        return CostEstimate(
+            tokens=tokens,
+            llm_calls=calls,
+            sequential_calls=sequential_calls,
+            seconds=seconds
+        )
+
+
+class AdmissionController:
+    """
+    Admits jobs against a budget of estimated tokens in flight.
+    
+    Admitted jobs reserve their estimated tokens until released. A job that does not
+    fit is rejected, deferred until capacity frees up, or (DOWNGRADE) switched to the
+    cheapest strategy and deferred if it still does not fit. Appends always refine the
+    existing summary, so they are estimated as refine jobs and never downgraded. Jobs
+    larger than max_job_tokens are always refused as too large. Deferred jobs may
+    reserve at most max_deferred_tokens (default: capacity_tokens) beyond capacity;
+    past that they are rejected, unless nothing else is reserved. Without a capacity
+    budget every job is admitted and only the estimate is reported.
+    """
+    
+    def __init__(
+        self,
+        estimator: CostEstimator,
+        capacity_tokens: Optional[int] = None,
+        policy: AdmissionPolicy = AdmissionPolicy.DEFER,
+        max_job_tokens: Optional[int] = None,
+        max_deferred_tokens: Optional[int] = None
+    ):
+        if capacity_tokens is not None and capacity_tokens <= 0:
+            raise ValueError("capacity_tokens must be positive")
+        if max_deferred_tokens is not None and max_deferred_tokens < 0:
+            raise ValueError("max_deferred_tokens must not be negative")
+        
+        self.estimator = estimator
+        self.capacity_tokens = capacity_tokens
+        self.policy = policy
+        self.max_job_tokens = max_job_tokens
+        self.max_deferred_tokens = capacity_tokens if max_deferred_tokens is None else max_deferred_tokens
+        
+        # Keyed by reservation id; appends reuse request ids
+        self._reserved: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._reservation_ids = itertools.count(1)
+        self._capacity_changed: Optional[asyncio.Condition] = None
+        # Jobs waiting in running(), oldest first
+        self._waiting: Deque[object] = deque()
+    
+    @property
+    def reserved_tokens(self) -> int:
+        return sum(self._reserved.values())
+    
+    @property
+    def running_tokens(self) -> int:
+        return sum(self._running.values())
+    
+    def admit(self, request: SummaryRequest, kind: JobKind = JobKind.CREATE) -> AdmissionDecision:
+        strategy = SummaryStrategy.REFINE if kind == JobKind.APPEND else request.strategy
+        estimate = self.estimator.estimate(request, strategy)
+        
+        if self.max_job_tokens is not None and estimate.tokens > self.max_job_tokens:
+            return self._decide(AdmissionOutcome.TOO_LARGE, strategy, estimate)
+        if self.capacity_tokens is None or self._fits(estimate):
+            return self._reserve(request, AdmissionOutcome.ADMITTED, strategy, estimate)
+        
+        if self.policy == AdmissionPolicy.REJECT:
+            return self._decide(AdmissionOutcome.REJECTED, strategy, estimate)
+        
+        if self.policy == AdmissionPolicy.DOWNGRADE and kind == JobKind.CREATE:
+            candidates = [
+                (self.estimator.estimate(request, candidate), candidate) for candidate in SummaryStrategy
+            ]
+            cheapest_estimate, cheapest_strategy = min(candidates, key=lambda pair: pair[0].tokens)
+            if cheapest_estimate.tokens < estimate.tokens:
+                estimate, strategy = cheapest_estimate, cheapest_strategy
+                logger.info("Downgrading request %s to %s strategy", request.request_id, strategy.value)
+                if self._fits(estimate):
+                    return self._reserve(request, AdmissionOutcome.DOWNGRADED, strategy, estimate)
+        
+        return self._defer(request, strategy, estimate)
+    
+    @asynccontextmanager
+    async def running(self, decision: AdmissionDecision) -> AsyncIterator[None]:
+        """
+        Hold the job until its reserved tokens fit in capacity, releasing them on exit.
+        Jobs start in the order they entered, so later small jobs cannot overtake and
+        starve a large one.
+        """
+        reservation_id = decision.reservation_id or ""
+        tokens = self._reserved.get(reservation_id, 0)
+        condition = self._condition()
+        ticket = object()
+        try:
+            async with condition:
+                self._waiting.append(ticket)
+                try:
+                    await condition.wait_for(lambda: self._waiting[0] is ticket and self._can_start(tokens))
+                finally:
+                    self._waiting.remove(ticket)
+                    # The next job in line may fit as well
+                    condition.notify_all()
+                self._running[reservation_id] = tokens
+            yield
+        finally:
+            self._running.pop(reservation_id, None)
+            self._reserved.pop(reservation_id, None)
+            async with condition:
+                condition.notify_all()
+    
+    def release(self, decision: AdmissionDecision) -> None:
+        """Drop the reservation of a job that is handed off instead of run through running()"""
+        self._reserved.pop(decision.reservation_id or "", None)
+    
+    def _fits(self, estimate: CostEstimate, beyond_capacity: int = 0) -> bool:
+        if self.capacity_tokens is None:
+            return True
+        return self.reserved_tokens + estimate.tokens <= self.capacity_tokens + beyond_capacity
+    
+    def _defer(self, request: SummaryRequest, strategy: SummaryStrategy, estimate: CostEstimate) -> AdmissionDecision:
+        # A job that fits no backlog still gets its turn once nothing else is reserved
+        if self._reserved and not self._fits(estimate, self.max_deferred_tokens or 0):
+            logger.info("Deferred backlog full, rejecting request %s", request.request_id)
+            return self._decide(AdmissionOutcome.REJECTED, strategy, estimate)
+        return self._reserve(request, AdmissionOutcome.DEFERRED, strategy, estimate)
+    
+    def _can_start(self, tokens: int) -> bool:
+        if self.capacity_tokens is None or not self._running:
+            return True
+        return self.running_tokens + tokens <= self.capacity_tokens
+    
+    def _reserve(
+        self,
+        request: SummaryRequest,
+        outcome: AdmissionOutcome,
+        strategy: SummaryStrategy,
+        estimate: CostEstimate
+    ) -> AdmissionDecision:
+        decision = self._decide(outcome, strategy, estimate)
+        decision.reservation_id = f"{request.request_id}:{next(self._reservation_ids)}"
+        self._reserved[decision.reservation_id] = estimate.tokens
+        return decision
+    
+    def _decide(
+        self,
+        outcome: AdmissionOutcome,
+        strategy: SummaryStrategy,
+        estimate: CostEstimate
+    ) -> AdmissionDecision:
+        # Work already admitted ahead of this job drains at the estimator's throughput
+        queued_seconds = 0.0
+        if self.capacity_tokens is not None and outcome in (AdmissionOutcome.DEFERRED, AdmissionOutcome.REJECTED):
+            queued_seconds = self.reserved_tokens / self.estimator.tokens_per_second
+        return AdmissionDecision(
+            outcome=outcome,
+            strategy=strategy,
+            estimate=estimate,
+            estimated_completion_seconds=round(queued_seconds + estimate.seconds, 1)
+        )
+    
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the controller can be built before an event loop exists
+        if self._capacity_changed is None:
+            self._capacity_changed = asyncio.Condition()
+        return self._capacity_changed
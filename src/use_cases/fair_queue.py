@@ -0,0 +1,89 @@
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+
+from src.domain import JobPriority
+
+
+T = TypeVar("T")
+
+
+class FairQueue(Generic[T]):
+    """
+    Weighted fair queue across tenants with strict priority between classes.
+    
+    Within a priority class each item gets a virtual finish tag of
+    max(virtual_time, tenant's last tag) + cost / weight, and the smallest tag is served
+    first. A tenant flooding the queue therefore only advances its own tags, while a
+    tenant with twice the weight gets roughly twice the share. Higher priority classes
+    are always served before lower ones.
+    
+    A tenant with nothing queued is forgotten: its next tag would start from the
+    virtual time anyway, so tenant ids sent by clients do not pile up here.
+    """
+    
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 1.0):
+        if default_weight <= 0 or any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError("Tenant weights must be positive")
+        
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self._heaps: Dict[JobPriority, List[Tuple[float, int, str, T]]] = defaultdict(list)
+        self._virtual_time: Dict[JobPriority, float] = defaultdict(float)
+        self._last_tag: Dict[Tuple[JobPriority, str], float] = defaultdict(float)
+        self._depth: Dict[str, int] = defaultdict(int)
+        self._queued: Dict[int, str] = {}
+        self._sequence = itertools.count()
+    
+    def __len__(self) -> int:
+        return sum(self._depth.values())
+    
+    def depth(self, tenant: str) -> int:
+        return self._depth.get(tenant, 0)
+    
+    def depths(self) -> Dict[str, int]:
+        return {tenant: depth for tenant, depth in self._depth.items() if depth}
+    
+    def push(self, item: T, tenant: str, priority: JobPriority, cost: float = 1.0) -> int:
+        """Enqueue item and return a handle usable with remove()"""
+        weight = self.weights.get(tenant, self.default_weight)
+        start = max(self._virtual_time[priority], self._last_tag[(priority, tenant)])
+        tag = start + max(cost, 0.0) / weight
+        self._last_tag[(priority, tenant)] = tag
+        
+        handle = next(self._sequence)
+        heapq.heappush(self._heaps[priority], (tag, handle, tenant, item))
+        self._queued[handle] = tenant
+        self._depth[tenant] += 1
+        return handle
+    
+    def pop(self) -> Optional[Tuple[str, T]]:
+        """Dequeue the next (tenant, item), or None when empty"""
+        for priority in sorted(self._heaps, key=lambda p: p.rank):
+            heap = self._heaps[priority]
+            while heap:
+                tag, handle, tenant, item = heapq.heappop(heap)
+                if self._queued.pop(handle, None) is None:
+                    continue
+                self._virtual_time[priority] = tag
+                self._dequeued(tenant)
+                return tenant, item
+        return None
+    
+    def remove(self, handle: int) -> bool:
+        """Lazily drop a still queued item, e.g. when its job is cancelled while waiting"""
+        tenant = self._queued.pop(handle, None)
+        if tenant is None:
+            return False
+        self._dequeued(tenant)
+        return True
+    
+    def _dequeued(self, tenant: str) -> None:
+        self._depth[tenant] -= 1
+        if self._depth[tenant]:
+            return
+        # Served tags are behind the virtual time and removed items were never served
+        del self._depth[tenant]
+        for priority in JobPriority:
+            self._last_tag.pop((priority, tenant), None)
@@ -0,0 +1,260 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from contextlib import AsyncExitStack
+from typing import Any, AsyncContextManager, Awaitable, Callable, Deque, Dict, Optional, Set, TypeVar
+
+from src.domain import JobPriority
+
+from .fair_queue import FairQueue
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _TenantStats:
+    def __init__(self, window: int):
+        # Jobs submitted and not yet finished, whether waiting or running
+        self.active = 0
+        self.running = 0
+        self.completed = 0
+        self.queue_waits: Deque[float] = deque(maxlen=window)
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+
+def _percentile(samples: Deque[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 3)
+
+
+class JobRunner:
+    """
+    Runs summary jobs as cancellable tasks, optionally bounded by a concurrency limit.
+    
+    When the limit is reached, waiting jobs are ordered by a FairQueue: interactive jobs
+    always go first, and batch jobs share freed slots across tenants in proportion to
+    tenant_weights, so one tenant's flood cannot starve the others.
+    
+    A job's gate (its admission token budget) is entered only once the job holds a
+    slot, so the fair queue alone decides the order in which jobs start; a gate that
+    admits in arrival order keeps that order while jobs wait on tokens. Stats are
+    kept for at most max_tracked_tenants tenants; beyond that, the least recently
+    active tenants without jobs are dropped, since tenant ids come from clients.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent_jobs: Optional[int] = None,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        latency_window: int = 1000,
+        max_tracked_tenants: int = 1000
+    ):
+        if max_concurrent_jobs is not None and max_concurrent_jobs <= 0:
+            raise ValueError("max_concurrent_jobs must be positive")
+        
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.latency_window = latency_window
+        self.max_tracked_tenants = max_tracked_tenants
+        self._queue: FairQueue[asyncio.Future] = FairQueue(tenant_weights)
+        self._active_slots = 0
+        # Appends reuse the request id, so one id may have several queued tasks
+        self._tasks: Dict[str, Set[asyncio.Task]] = {}
+        self._outcomes: Set[asyncio.Task] = set()
+        # Ordered from least to most recently active tenant
+        self._stats: Dict[str, _TenantStats] = {}
+    
+    @property
+    def running_jobs(self) -> int:
+        return sum(len(tasks) for tasks in self._tasks.values())
+    
+    def is_running(self, request_id: str) -> bool:
+        return request_id in self._tasks
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tenant queue depth, running and completed jobs, queue wait and latency"""
+        depths = self._queue.depths()
+        return {
+            tenant: {
+                "queued": depths.get(tenant, 0),
+                "running": stats.running,
+                "completed": stats.completed,
+                "queue_wait_p50_seconds": _percentile(stats.queue_waits, 0.5),
+                "queue_wait_p99_seconds": _percentile(stats.queue_waits, 0.99),
+                "latency_p50_seconds": _percentile(stats.latencies, 0.5),
+                "latency_p99_seconds": _percentile(stats.latencies, 0.99)
+            }
+            for tenant, stats in self._stats.items()
+        }
+    
+    async def run(
+        self,
+        request_id: str,
+        job: Awaitable[T],
+        tenant: str = "default",
+        priority: JobPriority = JobPriority.BATCH,
+        cost: float = 1.0,
+        gate: Optional[AsyncContextManager[Any]] = None,
+        on_cancelled_before_start: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> Optional[T]:
+        """Run job to completion; returns None if it was cancelled through cancel()"""
+        return await self.submit(request_id, job, tenant, priority, cost, gate, on_cancelled_before_start)
+    
+    def submit(
+        self,
+        request_id: str,
+        job: Awaitable[T],
+        tenant: str = "default",
+        priority: JobPriority = JobPriority.BATCH,
+        cost: float = 1.0,
+        gate: Optional[AsyncContextManager[Any]] = None,
+        on_cancelled_before_start: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> "asyncio.Task[Optional[T]]":
+        """
+        Register job at once, so cancel() reaches it before it first runs, and return a
+        task resolving like run(). gate is entered once the job holds a slot and held
+        until it finishes.
+        When job is cancelled before it started, on_cancelled_before_start is awaited,
+        since nothing inside the job got the chance to record the cancellation.
+        """
+        task = asyncio.ensure_future(self._run_with_slot(job, tenant, priority, cost, gate))
+        self._tasks.setdefault(request_id, set()).add(task)
+        outcome = asyncio.ensure_future(self._outcome(request_id, job, task, on_cancelled_before_start))
+        self._outcomes.add(outcome)
+        outcome.add_done_callback(self._outcomes.discard)
+        return outcome
+    
+    def cancel(self, request_id: str) -> bool:
+        """Cancel running or queued jobs for a request, interrupting any in-flight LLM call"""
+        tasks = [task for task in self._tasks.get(request_id, set()) if not task.done()]
+        if not tasks:
+            return False
+        
+        logger.info("Cancelling %s job(s) for request %s", len(tasks), request_id)
+        for task in tasks:
+            task.cancel()
+        return True
+    
+    async def drain(self, timeout: float = 30.0) -> None:
+        """
+        Wait up to timeout seconds for running and queued jobs to finish, then cancel the
+        rest and wait until each has recorded its cancellation.
+        """
+        outcomes = list(self._outcomes)
+        if not outcomes:
+            return
+        
+        _, pending = await asyncio.wait(outcomes, timeout=timeout)
+        if pending:
+            logger.warning("Cancelling %s job(s) still unfinished at shutdown", len(pending))
+            for request_id in list(self._tasks):
+                self.cancel(request_id)
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _outcome(
+        self,
+        request_id: str,
+        job: Awaitable[T],
+        task: "asyncio.Task[T]",
+        on_cancelled_before_start: Optional[Callable[[], Awaitable[None]]]
+    ) -> Optional[T]:
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            logger.info("Job for request %s was cancelled", request_id)
+            if on_cancelled_before_start is not None and _never_started(job):
+                await on_cancelled_before_start()
+            return None
+        finally:
+            # Silence "never awaited" warnings for jobs cancelled before they started
+            if asyncio.iscoroutine(job):
+                job.close()
+            tasks = self._tasks.get(request_id, set())
+            tasks.discard(task)
+            if not tasks:
+                self._tasks.pop(request_id, None)
+    
+    async def _run_with_slot(
+        self,
+        job: Awaitable[T],
+        tenant: str,
+        priority: JobPriority,
+        cost: float,
+        gate: Optional[AsyncContextManager[Any]]
+    ) -> T:
+        stats = self._tenant_stats(tenant)
+        enqueued_at = time.monotonic()
+        
+        stats.active += 1
+        try:
+            # Acquire inside the task so cancelling a queued job also frees its place
+            await self._acquire_slot(tenant, priority, cost)
+            try:
+                async with AsyncExitStack() as stack:
+                    if gate is not None:
+                        await stack.enter_async_context(gate)
+                    stats.queue_waits.append(time.monotonic() - enqueued_at)
+                    stats.running += 1
+                    try:
+                        return await job
+                    finally:
+                        stats.running -= 1
+                        stats.completed += 1
+                        stats.latencies.append(time.monotonic() - enqueued_at)
+            finally:
+                self._release_slot()
+        finally:
+            stats.active -= 1
+    
+    def _tenant_stats(self, tenant: str) -> _TenantStats:
+        stats = self._stats.pop(tenant, None) or _TenantStats(self.latency_window)
+        self._stats[tenant] = stats
+        if len(self._stats) > self.max_tracked_tenants:
+            for idle in [name for name, other in self._stats.items() if not other.active and name != tenant]:
+                if len(self._stats) <= self.max_tracked_tenants:
+                    break
+                del self._stats[idle]
+        return stats
+    
+    async def _acquire_slot(self, tenant: str, priority: JobPriority, cost: float) -> None:
+        if self.max_concurrent_jobs is None:
+            return
+        if self._active_slots < self.max_concurrent_jobs and not len(self._queue):
+            self._active_slots += 1
+            return
+        
+        granted = asyncio.get_running_loop().create_future()
+        handle = self._queue.push(granted, tenant, priority, cost)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if not self._queue.remove(handle) and granted.done() and not granted.cancelled():
+                # The slot was handed over just as this job was cancelled; pass it on
+                self._release_slot()
+            raise
+    
+    def _release_slot(self) -> None:
+        if self.max_concurrent_jobs is None:
+            return
+        
+        while True:
+            waiter = self._queue.pop()
+            if waiter is None:
+                self._active_slots -= 1
+                return
+            _, granted = waiter
+            if not granted.done():
+                # Hand the slot straight to the next job; the active count is unchanged
+                granted.set_result(None)
+                return
+
+
+def _never_started(job: Awaitable[Any]) -> bool:
+    return asyncio.iscoroutine(job) and inspect.getcoroutinestate(job) == inspect.CORO_CREATED
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Dict, List, Optional, Set
+
+from src.domain import (
+    LEASE_LOST,
+    JobKind,
+    JobQueue,
+    QueuedJob,
+    SummaryRepository,
+    SummaryResult,
+    SummaryService,
+    SummaryStatus
+)
+
+from .job_runner import JobRunner
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueueWorker:
+    """
+    Claims jobs from a durable JobQueue and runs them through the JobRunner.
+    
+    Each of `concurrency` loops holds at most one lease, heartbeating every third of the
+    lease while its job runs. If this process dies, the leases expire and another worker
+    reclaims the jobs; if a heartbeat finds the lease lost, the local run of that job is
+    cancelled with LEASE_LOST so the job is not processed twice and the cancelled run
+    records nothing. A heartbeat that finds the job flagged by a cancel request on
+    another worker cancels the request's local run like a local cancel would. Idle
+    loops also reap jobs that ran out of attempts and record them as failed.
+    """
+    
+    def __init__(
+        self,
+        queue: JobQueue,
+        service: SummaryService,
+        runner: JobRunner,
+        repository: SummaryRepository,
+        worker_id: Optional[str] = None,
+        concurrency: int = 4,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0
+    ):
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        
+        self.queue = queue
+        self.service = service
+        self.runner = runner
+        self.repository = repository
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._loops: List[asyncio.Task] = []
+        self._lost_leases: Set[str] = set()
+        # Outcome of each job this worker is running, by job id
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._stopping: Optional[asyncio.Event] = None
+    
+    async def start(self) -> None:
+        self._stopping = asyncio.Event()
+        self._loops = [asyncio.create_task(self._loop(self._stopping)) for _ in range(self.concurrency)]
+        logger.info("Queue worker %s started with %s loops", self.worker_id, self.concurrency)
+    
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stop claiming new jobs and give in-flight jobs up to timeout seconds to finish.
+        Jobs still running then are abandoned like a lost lease, recording nothing, and
+        handed back to the queue for another worker.
+        """
+        if self._stopping is None:
+            return
+        self._stopping.set()
+        if self._loops:
+            _, pending = await asyncio.wait(self._loops, timeout=timeout)
+            if pending:
+                abandoned = list(self._in_flight.items())
+                logger.warning("Queue worker %s abandoning %s unfinished job(s)", self.worker_id, len(abandoned))
+                for job_id, outcome in abandoned:
+                    self._lost_leases.add(job_id)
+                    outcome.cancel(LEASE_LOST)
+                await asyncio.gather(*pending, return_exceptions=True)
+                for job_id, _ in abandoned:
+                    await self.queue.release(job_id, self.worker_id, "Worker stopped before the job finished")
+        self._loops = []
+        logger.info("Queue worker %s stopped", self.worker_id)
+    
+    async def run_once(self) -> bool:
+        """Claim and process a single job; returns False when none was available"""
+        job = await self.queue.claim(self.worker_id, self.lease_seconds)
+        if job is None:
+            await self._reap_expired()
+            return False
+        await self._process(job)
+        return True
+    
+    async def _loop(self, stopping: asyncio.Event) -> None:
+        while not stopping.is_set():
+            try:
+                if await self.run_once():
+                    continue
+            except Exception as e:
+                logger.error("Queue worker %s failed to poll the job queue: %s", self.worker_id, e)
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _process(self, job: QueuedJob) -> None:
+        request = job.request
+        logger.info("Worker %s processing %s job for request %s", self.worker_id, job.kind.value, request.request_id)
+        
+        if job.kind == JobKind.APPEND:
+            work = self.service.append_documents(request)
+        else:
+            work = self.service.create_summary(request)
+        
+        outcome = self.runner.submit(request.request_id, work, tenant=request.tenant, priority=request.priority)
+        self._in_flight[job.job_id] = outcome
+        heartbeat = asyncio.create_task(self._heartbeat(job, outcome))
+        try:
+            await outcome
+        except Exception as e:
+            logger.error("Job %s for request %s failed: %s", job.job_id, request.request_id, e)
+            await self.queue.release(job.job_id, self.worker_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+            self._in_flight.pop(job.job_id, None)
+        
+        if job.job_id in self._lost_leases:
+            # Another worker owns the job now; leave the queue entry to it
+            self._lost_leases.discard(job.job_id)
+            return
+        # Completed, failed inside the use case, or cancelled by the user: all are final
+        await self.queue.complete(job.job_id, self.worker_id)
+    
+    async def _heartbeat(self, job: QueuedJob, outcome: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                alive = await self.queue.heartbeat(job.job_id, self.worker_id, self.lease_seconds)
+                cancel_requested = alive and await self.queue.cancel_requested(job.job_id)
+            except Exception as e:
+                logger.warning("Heartbeat for job %s failed: %s", job.job_id, e)
+                continue
+            if not alive:
+                logger.warning("Lease for job %s was lost; cancelling the local run", job.job_id)
+                self._lost_leases.add(job.job_id)
+                # Only this job: appends to the same request may be running alongside it
+                outcome.cancel(LEASE_LOST)
+                return
+            if cancel_requested:
+                logger.info(
+                    "Cancellation requested for request %s; cancelling job %s", job.request.request_id, job.job_id
+                )
+                self.runner.cancel(job.request.request_id)
+                return
+    
+    async def _reap_expired(self) -> None:
+        for job in await self.queue.reap_expired():
+            request_id = job.request.request_id
+            error = f"Job abandoned after {job.attempts} attempts"
+            logger.error("Request %s failed: %s", request_id, error)
+            
+            progress = await self.repository.get_progress(request_id)
+            if progress is not None:
+                progress.status = SummaryStatus.FAILED
+                await self.repository.save_progress(progress)
+            if job.kind == JobKind.CREATE:
+                # A failed append keeps serving the previous result
+                await self.repository.save_result(SummaryResult(
+                    request_id=request_id,
+                    summary="",
+                    status=SummaryStatus.FAILED,
+                    error_message=error,
+                    tenant=job.request.tenant
+                ))
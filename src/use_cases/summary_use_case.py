@@ -1,15 +1,28 @@
+import asyncio
 import logging
 import uuid
-from typing import Optional
+import weakref
+from typing import List, Optional
 
 from src.domain import (
+    CompletionNotifier,
+    Document,
+    DocumentPreprocessor,
+    LEASE_LOST,
+    OutlineSection,
+    PreparedDocument,
     SummaryRequest, 
     SummaryResult, 
     SummaryProgress, 
     SummaryStatus,
+    SummaryStrategy,
     SummaryRepository,
     LLMService,
-    SummaryService
+    SummaryService,
+    TokenUsage,
+    estimate_tokens,
+    prepare_batch,
+    track_usage
 )
 
 
@@ -17,23 +30,82 @@ logger = logging.getLogger(__name__)
 
 
 class SummaryUseCase(SummaryService):
-    def __init__(self, llm_service: LLMService, repository: SummaryRepository):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        repository: SummaryRepository,
+        summary_token_budget: Optional[int] = None,
+        condense_target_ratio: float = 0.5,
+        section_token_threshold: int = 2000,
+        max_concurrency: int = 8,
+        notifier: Optional[CompletionNotifier] = None,
+        refine_lookahead: int = 2,
+        precondense_min_tokens: int = 500,
+        preprocessor: Optional[DocumentPreprocessor] = None
+    ):
+        """
+        summary_token_budget caps the size of the running summary that is re-sent on
+        every refine step. Once exceeded, the summary is condensed down to
+        summary_token_budget * condense_target_ratio tokens. None disables the governor.
+        
+        section_token_threshold and max_concurrency tune the hierarchical strategy:
+        sections at or below the threshold are summarized in a single call, and at most
+        max_concurrency LLM calls run at once per request.
+        
+        notifier, when given, receives every final result of a request that carries a
+        callback_url.
+        
+        refine_lookahead and precondense_min_tokens tune the pipelined refine strategy:
+        while one refine step runs, the next refine_lookahead documents larger than
+        precondense_min_tokens are condensed concurrently.
+        
+        preprocessor, when given, takes the CPU-bound document parsing off the event
+        loop; without one, documents are parsed inline.
+        """
+        if summary_token_budget is not None and summary_token_budget <= 0:
+            raise ValueError("summary_token_budget must be positive")
+        if not 0 < condense_target_ratio <= 1:
+            raise ValueError("condense_target_ratio must be in (0, 1]")
+        if section_token_threshold <= 0:
+            raise ValueError("section_token_threshold must be positive")
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        if refine_lookahead <= 0:
+            raise ValueError("refine_lookahead must be positive")
+        
         self.llm_service = llm_service
         self.repository = repository
+        self.summary_token_budget = summary_token_budget
+        self.condense_target_ratio = condense_target_ratio
+        self.section_token_threshold = section_token_threshold
+        self.max_concurrency = max_concurrency
+        self.notifier = notifier
+        self.refine_lookahead = refine_lookahead
+        self.precondense_min_tokens = precondense_min_tokens
+        self.preprocessor = preprocessor
+        # Entries disappear once no append holds or waits for the lock
+        self._append_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
     
     async def create_summary(self, request: SummaryRequest) -> SummaryResult:
-        logger.info(f"Starting summary creation for request {request.request_id}")
+        with track_usage() as usage:
+            return await self._create_summary(request, usage)
+    
+    async def _create_summary(self, request: SummaryRequest, usage: TokenUsage) -> SummaryResult:
+        logger.info("Starting summary creation for request %s", request.request_id)
         
         try:
             if not request.documents:
-                logger.warning(f"No documents provided for request {request.request_id}")
+                logger.warning("No documents provided for request %s", request.request_id)
                 result = SummaryResult(
                     request_id=request.request_id,
                     summary="",
                     status=SummaryStatus.FAILED,
-                    error_message="No documents provided"
+                    error_message="No documents provided",
+                    usage=usage,
+                    tenant=request.tenant
                 )
                 await self.repository.save_result(result)
+                await self._notify_completion(request, result)
                 return result
             
             # Initialize progress
@@ -42,49 +114,63 @@ class SummaryUseCase(SummaryService):
                 current_document_index=0,
                 total_documents=len(request.documents),
                 current_summary="",
-                status=SummaryStatus.IN_PROGRESS
+                status=SummaryStatus.IN_PROGRESS,
+                usage=usage,
+                tenant=request.tenant
             )
             await self.repository.save_progress(progress)
             
-            # Generate initial summary from first document
-            logger.info(f"Generating initial summary from first document for request {request.request_id}")
-            first_doc = request.documents[0]
-            initial_summary = await self.llm_service.generate_initial_summary(first_doc.content)
-            
-            progress.current_summary = initial_summary
-            progress.current_document_index = 1
-            await self.repository.save_progress(progress)
-            
-            # Refine summary with remaining documents
-            current_summary = initial_summary
-            for i, doc in enumerate(request.documents[1:], start=1):
-                logger.info(f"Refining summary with document {i + 1}/{len(request.documents)} for request {request.request_id}")
-                
-                current_summary = await self.llm_service.refine_summary(
-                    current_summary, 
-                    doc.content
-                )
-                
-                progress.current_summary = current_summary
-                progress.current_document_index = i + 1
-                await self.repository.save_progress(progress)
+            if request.strategy == SummaryStrategy.HIERARCHICAL:
+                current_summary = await self._summarize_hierarchical(request, progress)
+            elif request.strategy == SummaryStrategy.PIPELINED_REFINE:
+                current_summary = await self._summarize_refine(request, progress, pipelined=True)
+            else:
+                current_summary = await self._summarize_refine(request, progress)
             
             # Mark as completed
+            progress.current_summary = current_summary
             progress.status = SummaryStatus.COMPLETED
             await self.repository.save_progress(progress)
             
             result = SummaryResult(
                 request_id=request.request_id,
                 summary=current_summary,
-                status=SummaryStatus.COMPLETED
+                status=SummaryStatus.COMPLETED,
+                usage=usage,
+                tenant=request.tenant,
+                document_count=len(request.documents)
             )
             await self.repository.save_result(result)
+            await self._notify_completion(request, result)
             
-            logger.info(f"Successfully completed summary for request {request.request_id}")
+            logger.info("Successfully completed summary for request %s", request.request_id)
             return result
+        
+        except asyncio.CancelledError as e:
+            if _lease_lost(e):
+                logger.info("Summary creation for request %s handed off to another worker", request.request_id)
+                raise
+            logger.info("Summary creation cancelled for request %s", request.request_id)
+            
+            cancelled_progress = await self.repository.get_progress(request.request_id)
+            if cancelled_progress is not None:
+                cancelled_progress.status = SummaryStatus.CANCELLED
+                await self.repository.save_progress(cancelled_progress)
             
+            result = SummaryResult(
+                request_id=request.request_id,
+                summary=cancelled_progress.current_summary if cancelled_progress else "",
+                status=SummaryStatus.CANCELLED,
+                error_message="Cancelled",
+                usage=usage,
+                tenant=request.tenant
+            )
+            await self.repository.save_result(result)
+            await self._notify_completion(request, result)
+            raise
+        
         except Exception as e:
-            logger.error(f"Error creating summary for request {request.request_id}: {str(e)}")
+            logger.error("Error creating summary for request %s: %s", request.request_id, e)
             
             # Update progress to failed
             failed_progress = SummaryProgress(
@@ -92,7 +178,9 @@ class SummaryUseCase(SummaryService):
                 current_document_index=0,
                 total_documents=len(request.documents) if request.documents else 0,
                 current_summary="",
-                status=SummaryStatus.FAILED
+                status=SummaryStatus.FAILED,
+                usage=usage,
+                tenant=request.tenant
             )
             await self.repository.save_progress(failed_progress)
             
@@ -100,11 +188,363 @@ class SummaryUseCase(SummaryService):
                 request_id=request.request_id,
                 summary="",
                 status=SummaryStatus.FAILED,
-                error_message=str(e)
+                error_message=str(e),
+                usage=usage,
+                tenant=request.tenant
             )
             await self.repository.save_result(result)
+            await self._notify_completion(request, result)
+            return result
+    
+    async def append_documents(self, request: SummaryRequest) -> SummaryResult:
+        """
+        Extend a completed summary with new documents by continuing the refine fold
+        from the stored final summary. The previous result stays readable until the
+        new version is saved; appends to the same request are applied one at a time
+        within this process, and the version bump is a compare-and-set so an append
+        racing one in another process fails instead of overwriting it. Token usage
+        accumulates across versions.
+        """
+        with track_usage() as usage:
+            return await self._append_documents(request, usage)
+    
+    async def _append_documents(self, request: SummaryRequest, usage: TokenUsage) -> SummaryResult:
+        logger.info("Appending %s documents to request %s", len(request.documents), request.request_id)
+        
+        lock = self._append_locks.get(request.request_id)
+        if lock is None:
+            lock = self._append_locks[request.request_id] = asyncio.Lock()
+        
+        async with lock:
+            previous = await self.repository.get_result(request.request_id)
+            if previous is None or previous.status != SummaryStatus.COMPLETED:
+                raise ValueError(f"No completed summary to append to for request {request.request_id}")
+            
+            # Progress also counts the documents of appends that failed, the result does not
+            previous_total = previous.document_count
+            if not previous_total:
+                previous_progress = await self.repository.get_progress(request.request_id)
+                previous_total = previous_progress.total_documents if previous_progress else 0
+            version = previous.version + 1
+            usage.add(previous.usage)
+            
+            progress = SummaryProgress(
+                request_id=request.request_id,
+                current_document_index=previous_total,
+                total_documents=previous_total + len(request.documents),
+                current_summary=previous.summary,
+                status=SummaryStatus.IN_PROGRESS,
+                version=version,
+                usage=usage,
+                tenant=request.tenant
+            )
+            await self.repository.save_progress(progress)
+            
+            try:
+                current_summary = await self._refine_documents(
+                    request.request_id,
+                    previous.summary,
+                    request.documents,
+                    progress
+                )
+            except asyncio.CancelledError as e:
+                if _lease_lost(e):
+                    logger.info("Append for request %s handed off to another worker", request.request_id)
+                    raise
+                # Keep serving the previous result; only the update is marked cancelled
+                logger.info("Append cancelled for request %s", request.request_id)
+                progress.status = SummaryStatus.CANCELLED
+                await self.repository.save_progress(progress)
+                raise
+            except Exception as e:
+                # Keep serving the previous result; only the update is marked failed
+                logger.error("Error appending documents to request %s: %s", request.request_id, e)
+                progress.status = SummaryStatus.FAILED
+                await self.repository.save_progress(progress)
+                result = SummaryResult(
+                    request_id=request.request_id,
+                    summary=previous.summary,
+                    status=SummaryStatus.FAILED,
+                    error_message=str(e),
+                    version=previous.version,
+                    usage=usage,
+                    tenant=request.tenant,
+                    document_count=previous_total
+                )
+                await self._notify_completion(request, result)
+                return result
+            
+            result = SummaryResult(
+                request_id=request.request_id,
+                summary=current_summary,
+                status=SummaryStatus.COMPLETED,
+                version=version,
+                usage=usage,
+                tenant=request.tenant,
+                document_count=progress.total_documents
+            )
+            if not await self.repository.replace_result(result, previous.version):
+                # Another process produced this version first; keep its result
+                logger.warning(
+                    "Request %s reached version %s concurrently; append discarded", request.request_id, version
+                )
+                progress.status = SummaryStatus.FAILED
+                await self.repository.save_progress(progress)
+                result = SummaryResult(
+                    request_id=request.request_id,
+                    summary=previous.summary,
+                    status=SummaryStatus.FAILED,
+                    error_message=f"Summary was updated to version {version} concurrently; append the documents again",
+                    version=previous.version,
+                    usage=usage,
+                    tenant=request.tenant,
+                    document_count=previous_total
+                )
+                await self._notify_completion(request, result)
+                return result
+            
+            progress.status = SummaryStatus.COMPLETED
+            await self.repository.save_progress(progress)
+            await self._notify_completion(request, result)
+            
+            logger.info("Updated summary for request %s to version %s", request.request_id, version)
             return result
     
+    async def _summarize_refine(
+        self,
+        request: SummaryRequest,
+        progress: SummaryProgress,
+        pipelined: bool = False
+    ) -> str:
+        """
+        Fold documents one at a time into a running summary. When pipelined, upcoming
+        documents are pre-condensed while earlier steps run, starting with the initial
+        summary call.
+        """
+        condenser = None
+        if pipelined:
+            condenser = _LookaheadCondenser(
+                self.llm_service,
+                request.documents[1:],
+                self.refine_lookahead,
+                self.precondense_min_tokens
+            )
+            condenser.schedule_through(self.refine_lookahead - 1)
+        
+        try:
+            # Generate initial summary from first document
+            logger.info("Generating initial summary from first document for request %s", request.request_id)
+            first_doc = request.documents[0]
+            initial_summary = await self.llm_service.generate_initial_summary(first_doc.content)
+            initial_summary = await self._govern_summary_length(
+                request.request_id,
+                initial_summary
+            )
+            
+            progress.current_summary = initial_summary
+            progress.current_document_index = 1
+            await self.repository.save_progress(progress)
+            
+            # Refine summary with remaining documents
+            return await self._refine_documents(
+                request.request_id,
+                initial_summary,
+                request.documents[1:],
+                progress,
+                condenser
+            )
+        finally:
+            if condenser is not None:
+                condenser.cancel()
+    
+    async def _refine_documents(
+        self,
+        request_id: str,
+        current_summary: str,
+        documents: List[Document],
+        progress: SummaryProgress,
+        condenser: Optional["_LookaheadCondenser"] = None
+    ) -> str:
+        """Fold documents into current_summary, advancing progress after each step"""
+        for index, doc in enumerate(documents):
+            logger.info(
+                "Refining summary with document %s/%s for request %s",
+                progress.current_document_index + 1, progress.total_documents, request_id
+            )
+            
+            content = await condenser.content(index) if condenser else doc.content
+            current_summary = await self.llm_service.refine_summary(
+                current_summary,
+                content
+            )
+            current_summary = await self._govern_summary_length(request_id, current_summary)
+            
+            progress.current_summary = current_summary
+            progress.current_document_index += 1
+            await self.repository.save_progress(progress)
+        
+        return current_summary
+    
+    async def _summarize_hierarchical(
+        self,
+        request: SummaryRequest,
+        progress: SummaryProgress
+    ) -> str:
+        """Summarize each document along its heading tree, then merge document summaries"""
+        logger.info(
+            "Summarizing %s documents hierarchically for request %s", len(request.documents), request.request_id
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        final_document = len(request.documents) == 1
+        prepared = await self._prepare_documents(request.documents)
+        
+        async def summarize_document(document: PreparedDocument) -> str:
+            summary = await self._summarize_section(document.outline, semaphore, final=final_document)
+            progress.current_document_index += 1
+            await self.repository.save_progress(progress)
+            return summary
+        
+        document_summaries = await asyncio.gather(
+            *(summarize_document(document) for document in prepared)
+        )
+        
+        if len(document_summaries) == 1:
+            return document_summaries[0]
+        
+        combined = "\n\n".join(
+            f"# {doc.title}\n\n{summary}" if doc.title else summary
+            for doc, summary in zip(request.documents, document_summaries)
+        )
+        async with semaphore:
+            return await self.llm_service.consolidate_summaries(combined)
+    
+    async def _prepare_documents(self, documents: List[Document]) -> List[PreparedDocument]:
+        contents = [doc.content for doc in documents]
+        if self.preprocessor is None:
+            return prepare_batch(contents)
+        return await self.preprocessor.prepare(contents)
+    
+    async def _summarize_section(
+        self,
+        section: OutlineSection,
+        semaphore: asyncio.Semaphore,
+        final: bool = False
+    ) -> str:
+        """
+        Summarize leaves concurrently and roll child summaries up into their parent.
+        When final is set, the top-level roll-up is a consolidation step.
+        """
+        content = section.to_markdown()
+        if not content:
+            return ""
+        
+        if not section.children or estimate_tokens(content) <= self.section_token_threshold:
+            async with semaphore:
+                return await self.llm_service.generate_initial_summary(content)
+        
+        if len(section.children) == 1 and not section.body.strip():
+            # A lone child leaves nothing to merge, so it takes the parent's roll-up step
+            return await self._summarize_section(section.children[0], semaphore, final=final)
+        
+        child_summaries = await asyncio.gather(
+            *(self._summarize_section(child, semaphore) for child in section.children)
+        )
+        
+        parts = [section.heading, section.body.strip()]
+        parts.extend(
+            f"{child.heading}\n\n{summary}"
+            for child, summary in zip(section.children, child_summaries)
+        )
+        rollup = "\n\n".join(part for part in parts if part)
+        async with semaphore:
+            if final:
+                return await self.llm_service.consolidate_summaries(rollup)
+            return await self.llm_service.generate_initial_summary(rollup)
+    
+    async def _govern_summary_length(self, request_id: str, summary: str) -> str:
+        """Condense the running summary once it outgrows the configured token budget"""
+        if self.summary_token_budget is None:
+            return summary
+        
+        summary_tokens = estimate_tokens(summary)
+        if summary_tokens <= self.summary_token_budget:
+            return summary
+        
+        target_tokens = max(1, int(self.summary_token_budget * self.condense_target_ratio))
+        logger.info(
+            "Summary for request %s at ~%s tokens exceeds budget %s, condensing to ~%s",
+            request_id, summary_tokens, self.summary_token_budget, target_tokens
+        )
+        return await self.llm_service.condense_summary(summary, target_tokens)
+    
+    async def _notify_completion(self, request: SummaryRequest, result: SummaryResult) -> None:
+        if self.notifier is None or not request.callback_url:
+            return
+        try:
+            await self.notifier.notify(request.callback_url, result)
+        except Exception as e:
+            logger.error("Error scheduling callback for request %s: %s", request.request_id, e)
+    
     async def get_summary_status(self, request_id: str) -> Optional[SummaryProgress]:
-        logger.debug(f"Getting summary status for request {request_id}")
-        return await self.repository.get_progress(request_id)
\ No newline at end of file
+        logger.debug("Getting summary status for request %s", request_id)
+        return await self.repository.get_progress(request_id)
+
+
+class _LookaheadCondenser:
+    """Condenses upcoming refine inputs concurrently with the refine step in flight"""
+    
+    def __init__(
+        self,
+        llm_service: LLMService,
+        documents: List[Document],
+        lookahead: int,
+        min_tokens: int
+    ):
+        self.llm_service = llm_service
+        self.documents = documents
+        self.lookahead = lookahead
+        self.min_tokens = min_tokens
+        self._tasks: List[Optional["asyncio.Task[str]"]] = [None] * len(documents)
+        self._scheduled = 0
+    
+    def schedule_through(self, index: int) -> None:
+        """Start condensing every not yet scheduled document up to index"""
+        last = min(index, len(self.documents) - 1)
+        while self._scheduled <= last:
+            doc = self.documents[self._scheduled]
+            # Short documents are cheaper to refine with directly than to condense first
+            if estimate_tokens(doc.content) > self.min_tokens:
+                self._tasks[self._scheduled] = asyncio.create_task(
+                    self.llm_service.generate_initial_summary(doc.content)
+                )
+            self._scheduled += 1
+    
+    async def content(self, index: int) -> str:
+        """
+        Refine input for document index; keeps the look-ahead window full. A failed
+        pre-condensation falls back to the document itself.
+        """
+        self.schedule_through(index + self.lookahead)
+        task = self._tasks[index]
+        if task is None:
+            return self.documents[index].content
+        self._tasks[index] = None
+        try:
+            return await task
+        except Exception as e:
+            logger.warning("Pre-condensing document %s failed, refining with it whole: %s", index, e)
+            return self.documents[index].content
+    
+    def cancel(self) -> None:
+        for task in self._tasks:
+            if task is None:
+                continue
+            if task.done() and not task.cancelled():
+                # Mark failures of unused pre-condensations as retrieved
+                task.exception()
+            task.cancel()
+
+
+def _lease_lost(error: asyncio.CancelledError) -> bool:
+    return bool(error.args) and error.args[0] == LEASE_LOST
@@ -1,29 +1,98 @@
+import asyncio
 import logging
+import math
 import uuid
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, FastAPI, HTTPException, BackgroundTasks, Depends, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.domain import Document, SummaryRequest, SummaryService
-from src.use_cases import SummaryUseCase
-from src.infrastructure import LangChainLLMService, InMemorySummaryRepository
+from src.domain import (
+    Document,
+    JobKind,
+    JobPriority,
+    JobQueue,
+    LLMService,
+    SummaryRepository,
+    SummaryRequest,
+    SummaryProgress,
+    SummaryResult,
+    SummaryService,
+    SummaryStatus,
+    SummaryStrategy,
+    TokenUsage,
+    UsageMeter
+)
+from src.use_cases import (
+    AdmissionController,
+    AdmissionDecision,
+    AdmissionOutcome,
+    AdmissionPolicy,
+    CostEstimator,
+    JobRunner,
+    QueueWorker,
+    SummaryUseCase
+)
+from src.infrastructure import (
+    CircuitBreakerLLMService,
+    CircuitState,
+    InMemorySummaryRepository,
+    LoopMonitor,
+    ProcessPoolPreprocessor,
+    RedisSummaryRepository,
+    SimulatedLLMService,
+    SQLiteJobQueue,
+    TextCodec,
+    WebhookNotifier,
+    build_llm_service
+)
+from .diagnostics import bearer_token_guard, create_debug_router
 from .models import (
+    JobPriorityRequest,
+    LoopMetricsResponse,
+    MetricsResponse,
+    PreprocessingMetricsResponse,
+    SimulatorMetricsResponse,
+    StorageMetricsResponse,
+    SummaryAppendRequest,
+    SummaryCancelResponse,
     SummaryCreateRequest,
     SummaryCreateResponse,
+    SummaryListItemResponse,
+    SummaryListResponse,
     SummaryProgressResponse,
     SummaryResponse,
     SummaryStatusResponse,
-    HealthResponse
+    SummaryStrategyRequest,
+    TenantMetricsResponse,
+    HealthResponse,
+    UsageResponse,
+    WebhookMetricsResponse
 )
 
 
 logger = logging.getLogger(__name__)
 
+router = APIRouter()
+# Cross-tenant operations endpoints (listing and metrics), only mounted behind the debug token
+operations_router = APIRouter()
+
 # Global dependency instances
-llm_service: Optional[LangChainLLMService] = None
-repository: Optional[InMemorySummaryRepository] = None
+llm_service: Optional[LLMService] = None
+circuit_breaker: Optional[CircuitBreakerLLMService] = None
+repository: Optional[SummaryRepository] = None
 summary_service: Optional[SummaryUseCase] = None
+job_runner: Optional[JobRunner] = None
+notifier: Optional[WebhookNotifier] = None
+admission: Optional[AdmissionController] = None
+job_queue: Optional[SQLiteJobQueue] = None
+queue_worker: Optional[QueueWorker] = None
+usage_meter: Optional[UsageMeter] = None
+storage_codec: Optional[TextCodec] = None
+preprocessor: Optional[ProcessPoolPreprocessor] = None
+loop_monitor: Optional[LoopMonitor] = None
+llm_simulator: Optional[SimulatedLLMService] = None
 
 
 def get_summary_service() -> SummaryService:
@@ -33,8 +102,60 @@ def get_summary_service() -> SummaryService:
     return summary_service
 
 
-def create_app(anthropic_api_key: Optional[str] = None) -> FastAPI:
-    global llm_service, repository, summary_service
+def get_admission_controller() -> AdmissionController:
+    if admission is None:
+        raise HTTPException(status_code=500, detail="Admission controller not initialized")
+    return admission
+
+
+def get_job_runner() -> JobRunner:
+    if job_runner is None:
+        raise HTTPException(status_code=500, detail="Job runner not initialized")
+    return job_runner
+
+
+def get_repository() -> SummaryRepository:
+    if repository is None:
+        raise HTTPException(status_code=500, detail="Summary repository not initialized")
+    return repository
+
+
+def get_job_queue() -> Optional[JobQueue]:
+    """The durable job queue, or None when jobs run in the accepting process"""
+    return job_queue
+
+
+def create_app(
+    anthropic_api_key: Optional[str] = None,
+    summary_token_budget: Optional[int] = None,
+    max_concurrent_jobs: Optional[int] = None,
+    webhook_secret: Optional[str] = None,
+    webhook_allow_private_targets: bool = False,
+    model_name: Optional[str] = None,
+    refine_model_name: Optional[str] = None,
+    final_model_name: Optional[str] = None,
+    fallback_model_name: Optional[str] = None,
+    admission_capacity_tokens: Optional[int] = None,
+    admission_policy: str = AdmissionPolicy.DEFER.value,
+    max_job_tokens: Optional[int] = None,
+    admission_max_deferred_tokens: Optional[int] = None,
+    tenant_weights: Optional[Dict[str, float]] = None,
+    redis_url: Optional[str] = None,
+    job_queue_path: Optional[str] = None,
+    job_lease_seconds: float = 60.0,
+    storage_compression: str = "auto",
+    preprocess_workers: Optional[int] = None,
+    debug_token: Optional[str] = None,
+    slow_callback_ms: float = 100.0,
+    llm_backend: str = "anthropic",
+    simulator_options: Optional[Dict[str, Any]] = None
+) -> FastAPI:
+    """
+    llm_backend "simulated" replaces the Anthropic models with a SimulatedLLMService
+    configured by simulator_options, for load tests and capacity planning.
+    """
+    global llm_service, circuit_breaker, repository, summary_service, job_runner, notifier, admission
+    global job_queue, queue_worker, usage_meter, storage_codec, preprocessor, loop_monitor, llm_simulator
     
     app = FastAPI(
         title="Document Summary Service",
@@ -51,46 +172,319 @@ def create_app(anthropic_api_key: Optional[str] = None) -> FastAPI:
         allow_headers=["*"],
     )
     
+    app.include_router(router)
+    if debug_token:
+        # Profiling, listing and metrics endpoints expose internals and every tenant's
+        # requests, so they only exist behind a token
+        app.include_router(create_debug_router(debug_token))
+        app.include_router(operations_router, dependencies=[Depends(bearer_token_guard(debug_token))])
+    
     # Initialize services
-    llm_service = LangChainLLMService(api_key=anthropic_api_key)
-    repository = InMemorySummaryRepository()
-    summary_service = SummaryUseCase(llm_service, repository)
+    usage_meter = UsageMeter()
+    llm_simulator = None
+    if llm_backend == "simulated":
+        # Price simulated calls like the configured model unless the options name another
+        options = {**({"model_name": model_name} if model_name else {}), **(simulator_options or {})}
+        llm_simulator = SimulatedLLMService(usage_meter=usage_meter, **options)
+        # Breaker timings are wall-clock; shrink them along with the simulated clock
+        circuit_breaker = CircuitBreakerLLMService(
+            llm_simulator,
+            latency_threshold=60.0 / llm_simulator.speedup,
+            reset_timeout=30.0 / llm_simulator.speedup
+        )
+    elif llm_backend == "anthropic":
+        circuit_breaker = build_llm_service(
+            anthropic_api_key,
+            model_name,
+            refine_model_name,
+            final_model_name,
+            fallback_model_name,
+            usage_meter=usage_meter
+        )
+    else:
+        raise ValueError(f"Unknown LLM backend: {llm_backend}")
+    llm_service = circuit_breaker
+    storage_codec = TextCodec(storage_compression)
+    redis_repository = RedisSummaryRepository.from_url(redis_url, codec=storage_codec) if redis_url else None
+    # Shared state lets any worker process answer status and result polls
+    repository = redis_repository or InMemorySummaryRepository(codec=storage_codec)
+    notifier = WebhookNotifier(secret=webhook_secret, allow_private_targets=webhook_allow_private_targets)
+    # Without worker processes, documents are parsed on the event loop
+    preprocessor = ProcessPoolPreprocessor(max_workers=preprocess_workers) if preprocess_workers else None
+    summary_service = SummaryUseCase(
+        llm_service,
+        repository,
+        summary_token_budget=summary_token_budget,
+        notifier=notifier,
+        preprocessor=preprocessor
+    )
+    job_runner = JobRunner(max_concurrent_jobs=max_concurrent_jobs, tenant_weights=tenant_weights)
+    admission = AdmissionController(
+        CostEstimator(
+            summary_tokens=summary_token_budget or 500,
+            section_token_threshold=summary_service.section_token_threshold,
+            precondense_min_tokens=summary_service.precondense_min_tokens
+        ),
+        capacity_tokens=admission_capacity_tokens,
+        policy=AdmissionPolicy(admission_policy),
+        max_job_tokens=max_job_tokens,
+        max_deferred_tokens=admission_max_deferred_tokens
+    )
+    
+    job_queue = None
+    queue_worker = None
+    if job_queue_path:
+        # Jobs outlive the process that accepted them; any worker sharing the file runs them
+        job_queue = SQLiteJobQueue(job_queue_path, codec=storage_codec)
+        queue_worker = QueueWorker(
+            job_queue,
+            summary_service,
+            job_runner,
+            repository,
+            concurrency=max_concurrent_jobs or 4,
+            lease_seconds=job_lease_seconds
+        )
+        app.router.add_event_handler("startup", queue_worker.start)
+        app.router.add_event_handler("shutdown", queue_worker.stop)
+        app.router.add_event_handler("shutdown", job_queue.close)
+    
+    loop_monitor = LoopMonitor(slow_callback_seconds=slow_callback_ms / 1000)
+    app.router.add_event_handler("startup", loop_monitor.start)
+    app.router.add_event_handler("shutdown", loop_monitor.stop)
+    
+    # Shutdown handlers run in order: finish or cancel jobs first, so their completion
+    # and cancellation callbacks are queued, then deliver webhooks, then disconnect
+    app.router.add_event_handler("shutdown", job_runner.drain)
+    app.router.add_event_handler("shutdown", notifier.close)
+    if redis_repository is not None:
+        app.router.add_event_handler("shutdown", redis_repository.close)
+    if preprocessor is not None:
+        app.router.add_event_handler("shutdown", preprocessor.close)
     
     logger.info("FastAPI application initialized with all services")
     
     return app
 
 
-app = create_app()
+def start_job(
+    request: SummaryRequest,
+    kind: JobKind,
+    service: SummaryService,
+    runner: JobRunner,
+    controller: AdmissionController,
+    decision: AdmissionDecision
+) -> "asyncio.Task[Optional[SummaryResult]]":
+    """Hand a job to the runner before the response is sent, so it can be cancelled at once"""
+    if kind == JobKind.APPEND:
+        # A cancelled append leaves the completed summary it would have extended untouched
+        work = service.append_documents(request)
+        on_cancelled_before_start = None
+    else:
+        work = service.create_summary(request)
+        
+        async def on_cancelled_before_start() -> None:
+            await record_cancellation_before_start(request.request_id, request.callback_url)
+    
+    outcome = runner.submit(
+        request.request_id,
+        work,
+        tenant=request.tenant,
+        priority=request.priority,
+        cost=decision.estimate.tokens,
+        gate=controller.running(decision),
+        on_cancelled_before_start=on_cancelled_before_start
+    )
+    # The gate only releases the reservation of a job that got to run
+    outcome.add_done_callback(lambda _: controller.release(decision))
+    return outcome
 
 
-async def process_summary_async(request: SummaryRequest, service: SummaryService):
-    """Background task to process summary asynchronously"""
-    logger.info(f"Starting background processing for request {request.request_id}")
+async def process_job_async(
+    request: SummaryRequest, kind: JobKind, outcome: "asyncio.Task[Optional[SummaryResult]]"
+) -> None:
+    """Background task that waits for a job started by start_job and logs how it ended"""
     try:
-        await service.create_summary(request)
-        logger.info(f"Completed background processing for request {request.request_id}")
+        await outcome
+        logger.info("Completed background %s job for request %s", kind.value, request.request_id)
     except Exception as e:
-        logger.error(f"Error in background processing for request {request.request_id}: {str(e)}")
+        logger.error("Error in background %s job for request %s: %s", kind.value, request.request_id, e)
+
+
+async def save_pending_progress(request: SummaryRequest) -> None:
+    """Make a new job visible to status polls and cancellation before it starts"""
+    await get_repository().save_progress(SummaryProgress(
+        request_id=request.request_id,
+        current_document_index=0,
+        total_documents=len(request.documents),
+        current_summary="",
+        status=SummaryStatus.PENDING,
+        tenant=request.tenant
+    ))
+
 
+async def enqueue_job(
+    request: SummaryRequest,
+    kind: JobKind,
+    queue: JobQueue,
+    controller: AdmissionController,
+    decision: AdmissionDecision
+) -> None:
+    """Hand a job to the durable queue, where any worker process can claim it"""
+    # Whichever worker claims the job bounds its concurrency; nothing runs here
+    controller.release(decision)
+    await queue.enqueue(request, kind)
 
-@app.get("/health", response_model=HealthResponse)
+
+async def record_cancellation_before_start(request_id: str, callback_url: Optional[str] = None) -> None:
+    """Mark a new job cancelled before it started, as the use case does for running ones"""
+    repository = get_repository()
+    progress = await repository.get_progress(request_id)
+    if progress is None or progress.status != SummaryStatus.PENDING:
+        # A queued append leaves the completed summary it would have extended untouched
+        return
+    progress.status = SummaryStatus.CANCELLED
+    await repository.save_progress(progress)
+    result = SummaryResult(
+        request_id=request_id,
+        summary="",
+        status=SummaryStatus.CANCELLED,
+        error_message="Cancelled",
+        tenant=progress.tenant
+    )
+    await repository.save_result(result)
+    if callback_url and notifier is not None:
+        await notifier.notify(callback_url, result)
+
+
+def resolve_scheduling(
+    tenant: Optional[str],
+    priority: Optional[JobPriorityRequest],
+    tenant_header: Optional[str],
+    priority_header: Optional[str]
+) -> Tuple[str, JobPriority]:
+    """Pick the tenant and priority class for a job, headers taking precedence over body fields"""
+    resolved_tenant = (tenant_header or tenant or "default").strip() or "default"
+    if priority_header:
+        try:
+            return resolved_tenant, JobPriority(priority_header.strip().lower())
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid X-Priority header: expected one of {[p.value for p in JobPriority]}"
+            )
+    return resolved_tenant, JobPriority(priority.value) if priority else JobPriority.BATCH
+
+
+def admit_or_raise(
+    controller: AdmissionController,
+    request: SummaryRequest,
+    kind: JobKind = JobKind.CREATE
+) -> AdmissionDecision:
+    """Run admission control, turning a refusal into the matching HTTP error"""
+    decision = controller.admit(request, kind)
+    if decision.outcome == AdmissionOutcome.TOO_LARGE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Estimated job cost of {decision.estimate.tokens} tokens exceeds the per-job limit"
+        )
+    if not decision.accepted:
+        logger.warning("Rejected request %s: over capacity", request.request_id)
+        raise HTTPException(
+            status_code=429,
+            detail="Summary capacity exhausted, retry later",
+            headers={"Retry-After": str(math.ceil(decision.estimated_completion_seconds))}
+        )
+    return decision
+
+
+async def check_callback_url(request: SummaryRequest) -> None:
+    """Refuse callback URLs the notifier would not deliver to"""
+    if request.callback_url is None or notifier is None:
+        return
+    try:
+        await notifier.check_target(request.callback_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def usage_response(usage: TokenUsage) -> UsageResponse:
+    return UsageResponse(
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        total_tokens=usage.total_tokens,
+        llm_calls=usage.llm_calls,
+        cost_usd=round(usage.cost_usd, 6)
+    )
+
+
+def admission_response(request_id: str, decision: AdmissionDecision, message: str) -> SummaryCreateResponse:
+    if decision.outcome == AdmissionOutcome.DEFERRED:
+        message = f"{message}; queued until capacity frees up"
+    elif decision.outcome == AdmissionOutcome.DOWNGRADED:
+        message = f"{message} with the {decision.strategy.value} strategy to fit capacity"
+    
+    return SummaryCreateResponse(
+        request_id=request_id,
+        status=SummaryStatusResponse.PENDING,
+        message=message,
+        admission=decision.outcome.value,
+        strategy=SummaryStrategyRequest(decision.strategy.value),
+        estimated_tokens=decision.estimate.tokens,
+        estimated_llm_calls=decision.estimate.llm_calls,
+        estimated_completion_seconds=decision.estimated_completion_seconds
+    )
+
+
+@router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return HealthResponse(status="healthy", message="Service is running")
+    if circuit_breaker is None:
+        return HealthResponse(status="healthy", message="Service is running", llm_circuit=None)
+    
+    snapshot = circuit_breaker.snapshot()
+    if snapshot["state"] == CircuitState.CLOSED.value:
+        return HealthResponse(status="healthy", message="Service is running", llm_circuit=snapshot)
+    if snapshot["fallback_configured"]:
+        message = "Primary LLM is degraded; calls are routed to the fallback"
+    else:
+        message = "Primary LLM is degraded and no fallback is configured"
+    return HealthResponse(status="degraded", message=message, llm_circuit=snapshot)
+
+
+@operations_router.get("/metrics", response_model=MetricsResponse)
+async def get_metrics(runner: JobRunner = Depends(get_job_runner)) -> MetricsResponse:
+    """Per-tenant scheduler queue depth and latency percentiles"""
+    return MetricsResponse(
+        running_jobs=runner.running_jobs,
+        tenants={tenant: TenantMetricsResponse(**metrics) for tenant, metrics in runner.metrics().items()},
+        models={
+            name: usage_response(usage) for name, usage in (usage_meter.snapshot() if usage_meter else {}).items()
+        },
+        storage=StorageMetricsResponse(**storage_codec.snapshot()) if storage_codec else None,
+        preprocessing=PreprocessingMetricsResponse(**preprocessor.snapshot()) if preprocessor else None,
+        event_loop=LoopMetricsResponse(**loop_monitor.snapshot()) if loop_monitor else None,
+        llm_simulator=SimulatorMetricsResponse(**llm_simulator.snapshot()) if llm_simulator else None,
+        webhooks=WebhookMetricsResponse(**notifier.snapshot()) if notifier else None
+    )
 
 
-@app.post("/summaries", response_model=SummaryCreateResponse)
+@router.post("/summaries", response_model=SummaryCreateResponse)
 async def create_summary(
     request: SummaryCreateRequest,
     background_tasks: BackgroundTasks,
-    service: SummaryService = Depends(get_summary_service)
+    service: SummaryService = Depends(get_summary_service),
+    runner: JobRunner = Depends(get_job_runner),
+    controller: AdmissionController = Depends(get_admission_controller),
+    queue: Optional[JobQueue] = Depends(get_job_queue),
+    x_tenant_id: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None)
 ):
     """Create a new summary request"""
-    logger.info(f"Received summary creation request with {len(request.documents)} documents")
+    logger.info("Received summary creation request with %s documents", len(request.documents))
     
     try:
         request_id = str(uuid.uuid4())
+        tenant, priority = resolve_scheduling(request.tenant, request.priority, x_tenant_id, x_priority)
         
         # Convert web models to domain models
         documents = [
@@ -104,32 +498,152 @@ async def create_summary(
         
         summary_request = SummaryRequest(
             request_id=request_id,
-            documents=documents
+            documents=documents,
+            strategy=SummaryStrategy(request.strategy.value),
+            callback_url=str(request.callback_url) if request.callback_url else None,
+            tenant=tenant,
+            priority=priority
         )
         
-        # Start background processing
-        background_tasks.add_task(process_summary_async, summary_request, service)
+        await check_callback_url(summary_request)
+        decision = admit_or_raise(controller, summary_request)
+        summary_request.strategy = decision.strategy
+        
+        # Queued or running jobs are visible to status polls before they start
+        await save_pending_progress(summary_request)
+        if queue is not None:
+            await enqueue_job(summary_request, JobKind.CREATE, queue, controller, decision)
+        else:
+            outcome = start_job(summary_request, JobKind.CREATE, service, runner, controller, decision)
+            background_tasks.add_task(process_job_async, summary_request, JobKind.CREATE, outcome)
         
-        logger.info(f"Started background processing for request {request_id}")
+        logger.info("Started background processing for request %s", request_id)
         
-        return SummaryCreateResponse(
+        return admission_response(
+            request_id,
+            decision,
+            "Summary request created and processing started"
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error creating summary request: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to create summary request: {str(e)}")
+
+
+@operations_router.get("/summaries", response_model=SummaryListResponse)
+async def list_summaries(
+    status: Optional[SummaryStatusResponse] = None,
+    tenant: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only requests created at or after this time"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    summaries: SummaryRepository = Depends(get_repository)
+) -> SummaryListResponse:
+    """List requests of all tenants in creation order, without their summaries (requires `DEBUG_TOKEN`)"""
+    if since is not None and since.tzinfo is None:
+        # Naive timestamps are taken as UTC
+        since = since.replace(tzinfo=timezone.utc)
+    
+    try:
+        page = await summaries.list_summaries(
+            status=SummaryStatus(status.value) if status else None,
+            tenant=tenant,
+            since=since.timestamp() if since else None,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error listing summaries: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to list summaries: {str(e)}")
+    
+    return SummaryListResponse(
+        items=[
+            SummaryListItemResponse(
+                request_id=listing.request_id,
+                status=SummaryStatusResponse(listing.status.value),
+                tenant=listing.tenant,
+                created_at=datetime.fromtimestamp(listing.created_at, tz=timezone.utc),
+                updated_at=datetime.fromtimestamp(listing.updated_at, tz=timezone.utc),
+                version=listing.version
+            )
+            for listing in page.items
+        ],
+        next_cursor=page.next_cursor
+    )
+
+
+@router.post("/summaries/{request_id}/documents", response_model=SummaryCreateResponse)
+async def append_documents(
+    request_id: str,
+    request: SummaryAppendRequest,
+    background_tasks: BackgroundTasks,
+    service: SummaryService = Depends(get_summary_service),
+    runner: JobRunner = Depends(get_job_runner),
+    controller: AdmissionController = Depends(get_admission_controller),
+    queue: Optional[JobQueue] = Depends(get_job_queue),
+    x_tenant_id: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None)
+) -> SummaryCreateResponse:
+    """Append documents to a completed summary, producing a new summary version"""
+    logger.info("Received %s documents to append to request %s", len(request.documents), request_id)
+    
+    try:
+        result = await repository.get_result(request_id) if repository else None
+        if not result:
+            raise HTTPException(status_code=404, detail="Summary request not found")
+        if result.status != SummaryStatus.COMPLETED:
+            raise HTTPException(status_code=409, detail="Summary request has not completed successfully")
+        
+        tenant, priority = resolve_scheduling(request.tenant, request.priority, x_tenant_id, x_priority)
+        summary_request = SummaryRequest(
             request_id=request_id,
-            status=SummaryStatusResponse.PENDING,
-            message="Summary request created and processing started"
+            documents=[
+                Document(
+                    content=doc.content,
+                    title=doc.title,
+                    metadata=doc.metadata
+                )
+                for doc in request.documents
+            ],
+            callback_url=str(request.callback_url) if request.callback_url else None,
+            tenant=tenant,
+            priority=priority
         )
         
+        await check_callback_url(summary_request)
+        decision = admit_or_raise(controller, summary_request, JobKind.APPEND)
+        
+        # Readers keep getting the current version until the update completes
+        if queue is not None:
+            await enqueue_job(summary_request, JobKind.APPEND, queue, controller, decision)
+        else:
+            outcome = start_job(summary_request, JobKind.APPEND, service, runner, controller, decision)
+            background_tasks.add_task(process_job_async, summary_request, JobKind.APPEND, outcome)
+        
+        return admission_response(
+            request_id,
+            decision,
+            f"Documents appended; summary version {result.version + 1} is being produced"
+        )
+    
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error creating summary request: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to create summary request: {str(e)}")
+        logger.error("Error appending documents to request %s: %s", request_id, e)
+        raise HTTPException(status_code=500, detail=f"Failed to append documents: {str(e)}")
 
 
-@app.get("/summaries/{request_id}/status", response_model=SummaryProgressResponse)
+@router.get("/summaries/{request_id}/status", response_model=SummaryProgressResponse)
 async def get_summary_status(
     request_id: str,
     service: SummaryService = Depends(get_summary_service)
 ):
     """Get the current status of a summary request"""
-    logger.debug(f"Getting status for request {request_id}")
+    logger.debug("Getting status for request %s", request_id)
     
     try:
         progress = await service.get_summary_status(request_id)
@@ -142,23 +656,25 @@ async def get_summary_status(
             status=SummaryStatusResponse(progress.status.value),
             current_document_index=progress.current_document_index,
             total_documents=progress.total_documents,
-            current_summary=progress.current_summary
+            current_summary=progress.current_summary,
+            version=progress.version,
+            usage=usage_response(progress.usage)
         )
-        
+    
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting summary status for request {request_id}: {str(e)}")
+        logger.error("Error getting summary status for request %s: %s", request_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to get summary status: {str(e)}")
 
 
-@app.get("/summaries/{request_id}", response_model=SummaryResponse)
+@router.get("/summaries/{request_id}", response_model=SummaryResponse)
 async def get_summary(
     request_id: str,
     service: SummaryService = Depends(get_summary_service)
 ):
     """Get the final summary result"""
-    logger.debug(f"Getting summary result for request {request_id}")
+    logger.debug("Getting summary result for request %s", request_id)
     
     try:
         # First check if we have a completed result
@@ -170,7 +686,9 @@ async def get_summary(
                     request_id=result.request_id,
                     summary=result.summary,
                     status=SummaryStatusResponse(result.status.value),
-                    error_message=result.error_message
+                    error_message=result.error_message,
+                    version=result.version,
+                    usage=usage_response(result.usage)
                 )
         
         # If no result, check progress
@@ -183,11 +701,70 @@ async def get_summary(
             request_id=progress.request_id,
             summary=progress.current_summary,
             status=SummaryStatusResponse(progress.status.value),
-            error_message=None
+            error_message=None,
+            version=progress.version,
+            usage=usage_response(progress.usage)
         )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting summary for request %s: %s", request_id, e)
+        raise HTTPException(status_code=500, detail=f"Failed to get summary: {str(e)}")
+
+
+@router.delete("/summaries/{request_id}", response_model=SummaryCancelResponse)
+async def cancel_summary(
+    request_id: str,
+    response: Response,
+    service: SummaryService = Depends(get_summary_service),
+    runner: JobRunner = Depends(get_job_runner),
+    queue: Optional[JobQueue] = Depends(get_job_queue)
+) -> SummaryCancelResponse:
+    """
+    Cancel a running summary request, freeing its LLM capacity immediately. A queued job
+    another worker is running is flagged instead and cancelled by that worker on its
+    next heartbeat, answered with 202.
+    """
+    logger.info("Received cancellation for request %s", request_id)
+    
+    try:
+        if runner.cancel(request_id):
+            return SummaryCancelResponse(
+                request_id=request_id,
+                status=SummaryStatusResponse.CANCELLED,
+                message="Summary request cancelled"
+            )
         
+        progress = await service.get_summary_status(request_id)
+        if not progress:
+            raise HTTPException(status_code=404, detail="Summary request not found")
+        
+        if queue is not None and await queue.cancel(request_id):
+            await record_cancellation_before_start(request_id)
+            return SummaryCancelResponse(
+                request_id=request_id,
+                status=SummaryStatusResponse.CANCELLED,
+                message="Queued summary request cancelled"
+            )
+        if queue is not None and await queue.request_cancel(request_id):
+            response.status_code = 202
+            return SummaryCancelResponse(
+                request_id=request_id,
+                status=SummaryStatusResponse(progress.status.value),
+                message="Cancellation requested; the worker running the summary will stop it shortly"
+            )
+        
+        raise HTTPException(
+            status_code=409,
+            detail=f"Summary request is not running (status: {progress.status.value})"
+        )
+    
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting summary for request {request_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get summary: {str(e)}")
\ No newline at end of file
+        logger.error("Error cancelling summary for request %s: %s", request_id, e)
+        raise HTTPException(status_code=500, detail=f"Failed to cancel summary: {str(e)}")
+
+
+app = create_app()
@@ -0,0 +1,110 @@
+import asyncio
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import tracemalloc
+from typing import Callable, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from .models import MemoryAllocationResponse, MemoryResponse
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SORT_KEYS = ("cumulative", "tottime", "calls")
+
+# cProfile hooks the whole interpreter, so only one profile may run at a time
+_profile_running = False
+
+
+def bearer_token_guard(token: str) -> Callable[..., None]:
+    """Dependency that requires `Authorization: Bearer <token>`"""
+    def verify_token(authorization: Optional[str] = Header(None)) -> None:
+        if authorization is None or not hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+            raise HTTPException(status_code=401, detail="Invalid debug token", headers={"WWW-Authenticate": "Bearer"})
+    
+    return verify_token
+
+
+def create_debug_router(token: str) -> APIRouter:
+    """
+    Profiling and memory endpoints under /debug, each requiring `Authorization: Bearer <token>`.
+    Only mounted when a token is configured.
+    """
+    router = APIRouter(prefix="/debug", dependencies=[Depends(bearer_token_guard(token))])
+    
+    @router.get("/profile", response_class=PlainTextResponse)
+    async def profile(
+        seconds: float = Query(5.0, gt=0, le=60, description="How long to profile the event loop thread"),
+        sort: str = Query("cumulative", description=f"One of {', '.join(PROFILE_SORT_KEYS)}"),
+        limit: int = Query(50, ge=1, le=500, description="Number of functions to report")
+    ) -> str:
+        """Profile everything the event loop runs for the given time and return pstats output"""
+        global _profile_running
+        if sort not in PROFILE_SORT_KEYS:
+            raise HTTPException(status_code=400, detail=f"sort must be one of {list(PROFILE_SORT_KEYS)}")
+        if _profile_running:
+            raise HTTPException(status_code=409, detail="A profile is already running")
+        
+        logger.info("Profiling the event loop for %s seconds", seconds)
+        # Every coroutine runs on this thread, so the profile covers all request handling
+        profiler = cProfile.Profile()
+        _profile_running = True
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+            _profile_running = False
+        
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+    
+    @router.get("/memory", response_model=MemoryResponse)
+    async def memory(
+        limit: int = Query(25, ge=1, le=200, description="Number of allocation sites to report"),
+        frames: int = Query(1, ge=1, le=50, description="Stack depth recorded when tracing starts")
+    ) -> MemoryResponse:
+        """
+        Top allocation sites by size. The first call starts tracemalloc, which slows
+        allocations down until DELETE /debug/memory stops it; call again for results.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.warning("Started tracemalloc with %s frames", frames)
+            return MemoryResponse(tracing=True, tracing_started=True, traced_bytes=0, peak_bytes=0, top=[])
+        
+        def top_allocations() -> List[tracemalloc.Statistic]:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>")
+            ))
+            return snapshot.statistics("lineno")[:limit]
+        
+        # Snapshots of a large heap take long enough to stall the loop themselves
+        statistics = await asyncio.to_thread(top_allocations)
+        traced_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        return MemoryResponse(
+            tracing=True,
+            tracing_started=False,
+            traced_bytes=traced_bytes,
+            peak_bytes=peak_bytes,
+            top=[
+                MemoryAllocationResponse(location=str(stat.traceback[0]), size_bytes=stat.size, count=stat.count)
+                for stat in statistics
+            ]
+        )
+    
+    @router.delete("/memory", response_model=MemoryResponse)
+    async def stop_memory_tracing() -> MemoryResponse:
+        """Stop tracemalloc and discard its traces"""
+        tracemalloc.stop()
+        return MemoryResponse(tracing=False, tracing_started=False, traced_bytes=0, peak_bytes=0, top=[])
+    
+    return router
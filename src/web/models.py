@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, HttpUrl
+from typing import Any, Dict, List, Optional
 from enum import Enum
 
 
@@ -8,6 +9,18 @@ class SummaryStatusResponse(str, Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class SummaryStrategyRequest(str, Enum):
+    REFINE = "refine"
+    HIERARCHICAL = "hierarchical"
+    PIPELINED_REFINE = "pipelined_refine"
+
+
+class JobPriorityRequest(str, Enum):
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
 
 
 class DocumentRequest(BaseModel):
@@ -17,25 +30,80 @@ class DocumentRequest(BaseModel):
 
 
 class SummaryCreateRequest(BaseModel):
-    documents: List[DocumentRequest] = Field(..., description="List of documents to summarize", min_items=1)
+    documents: List[DocumentRequest] = Field(..., description="List of documents to summarize", min_length=1)
+    strategy: SummaryStrategyRequest = Field(
+        SummaryStrategyRequest.REFINE,
+        description=(
+            "refine folds documents sequentially; pipelined_refine does the same while condensing "
+            "upcoming documents concurrently; hierarchical summarizes markdown sections "
+            "concurrently and rolls them up"
+        )
+    )
+    callback_url: Optional[HttpUrl] = Field(None, description="URL that receives the final result as a signed POST")
+    tenant: Optional[str] = Field(
+        None, description="Tenant the job is scheduled under; the X-Tenant-ID header takes precedence"
+    )
+    priority: Optional[JobPriorityRequest] = Field(
+        None,
+        description="interactive jobs are always scheduled before batch jobs; the X-Priority header takes precedence"
+    )
+
+
+class SummaryAppendRequest(BaseModel):
+    documents: List[DocumentRequest] = Field(
+        ..., description="Documents to fold into the existing summary", min_length=1
+    )
+    callback_url: Optional[HttpUrl] = Field(None, description="URL that receives the updated result as a signed POST")
+    tenant: Optional[str] = Field(
+        None, description="Tenant the job is scheduled under; the X-Tenant-ID header takes precedence"
+    )
+    priority: Optional[JobPriorityRequest] = Field(
+        None,
+        description="interactive jobs are always scheduled before batch jobs; the X-Priority header takes precedence"
+    )
 
 
 class SummaryCreateResponse(BaseModel):
     request_id: str = Field(..., description="Unique identifier for the summary request")
     status: SummaryStatusResponse = Field(..., description="Current status of the summary")
     message: str = Field(..., description="Human-readable message about the request")
+    admission: Optional[str] = Field(None, description="Admission outcome: admitted, deferred or downgraded")
+    strategy: Optional[SummaryStrategyRequest] = Field(None, description="Strategy the job will run with")
+    estimated_tokens: Optional[int] = Field(None, description="Estimated LLM tokens the job will consume")
+    estimated_llm_calls: Optional[int] = Field(None, description="Estimated number of LLM calls")
+    estimated_completion_seconds: Optional[float] = Field(
+        None, description="Estimated seconds until the result is ready"
+    )
+
+
+class SummaryCancelResponse(BaseModel):
+    request_id: str = Field(..., description="Unique identifier for the summary request")
+    status: SummaryStatusResponse = Field(..., description="Status of the summary after cancellation")
+    message: str = Field(..., description="Human-readable message about the cancellation")
 
 
 class SummaryStatusRequest(BaseModel):
     request_id: str = Field(..., description="Unique identifier for the summary request")
 
 
+class UsageResponse(BaseModel):
+    input_tokens: int = Field(default=0, description="Prompt tokens billed across all LLM calls")
+    output_tokens: int = Field(default=0, description="Completion tokens billed across all LLM calls")
+    total_tokens: int = Field(default=0, description="Input plus output tokens")
+    llm_calls: int = Field(default=0, description="Number of LLM calls made")
+    cost_usd: float = Field(default=0.0, description="Estimated spend from list prices; 0 for unpriced models")
+
+
 class SummaryProgressResponse(BaseModel):
     request_id: str = Field(..., description="Unique identifier for the summary request")
     status: SummaryStatusResponse = Field(..., description="Current status of the summary")
     current_document_index: int = Field(..., description="Index of currently processed document")
     total_documents: int = Field(..., description="Total number of documents to process")
     current_summary: str = Field(..., description="Current summary (markdown formatted)")
+    version: int = Field(1, description="Summary version being produced; increases with each append")
+    usage: UsageResponse = Field(
+        default_factory=UsageResponse, description="Tokens and spend so far, across all versions"
+    )
 
 
 class SummaryResponse(BaseModel):
@@ -43,8 +111,125 @@ class SummaryResponse(BaseModel):
     summary: str = Field(..., description="Final summary in markdown format")
     status: SummaryStatusResponse = Field(..., description="Status of the summary")
     error_message: Optional[str] = Field(None, description="Error message if status is failed")
+    version: int = Field(1, description="Version of the returned summary; increases with each append")
+    usage: UsageResponse = Field(
+        default_factory=UsageResponse, description="Tokens and spend behind this summary, across all versions"
+    )
+
+
+class SummaryListItemResponse(BaseModel):
+    request_id: str = Field(..., description="Unique identifier for the summary request")
+    status: SummaryStatusResponse = Field(..., description="Latest status of the request")
+    tenant: str = Field(..., description="Tenant that submitted the request")
+    created_at: datetime = Field(..., description="When the request was first recorded")
+    updated_at: datetime = Field(..., description="When its status last changed or progressed")
+    version: int = Field(1, description="Latest summary version")
+
+
+class SummaryListResponse(BaseModel):
+    items: List[SummaryListItemResponse] = Field(..., description="One page of requests, oldest first")
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page; null on the last page")
 
 
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Health status of the service")
-    message: str = Field(..., description="Health status message")
\ No newline at end of file
+    message: str = Field(..., description="Health status message")
+    llm_circuit: Optional[Dict[str, Any]] = Field(None, description="State of the primary LLM circuit breaker")
+
+
+class TenantMetricsResponse(BaseModel):
+    queued: int = Field(..., description="Jobs waiting for a slot")
+    running: int = Field(..., description="Jobs currently running")
+    completed: int = Field(..., description="Jobs finished since startup, including failed and cancelled ones")
+    queue_wait_p50_seconds: Optional[float] = Field(
+        None, description="Median time spent waiting for a slot and admission tokens"
+    )
+    queue_wait_p99_seconds: Optional[float] = Field(
+        None, description="99th percentile time spent waiting for a slot and admission tokens"
+    )
+    latency_p50_seconds: Optional[float] = Field(None, description="Median time from submission to completion")
+    latency_p99_seconds: Optional[float] = Field(
+        None, description="99th percentile time from submission to completion"
+    )
+
+
+class StorageMetricsResponse(BaseModel):
+    algorithm: str = Field(..., description="Compression used for stored summaries and job payloads")
+    raw_bytes: int = Field(..., description="Uncompressed bytes written since startup")
+    stored_bytes: int = Field(..., description="Bytes actually stored for them")
+    ratio: float = Field(..., description="raw_bytes / stored_bytes")
+    compressions: int = Field(..., description="Values compressed")
+    decompressions: int = Field(..., description="Values decompressed on read")
+    compress_seconds: float = Field(..., description="CPU time spent compressing")
+    decompress_seconds: float = Field(..., description="CPU time spent decompressing")
+
+
+class PreprocessingMetricsResponse(BaseModel):
+    max_workers: Optional[int] = Field(None, description="Worker processes, or None for one per CPU")
+    pool_running: bool = Field(..., description="Whether the worker pool is started")
+    pooled_batches: int = Field(..., description="Batches of documents parsed by the pool since startup")
+    inline_documents: int = Field(..., description="Documents parsed on the event loop since startup")
+
+
+class SimulatorMetricsResponse(BaseModel):
+    calls: int = Field(..., description="Simulated LLM calls made")
+    attempts: int = Field(..., description="Provider attempts, including retried ones")
+    rate_limited: int = Field(..., description="Attempts answered with a simulated 429")
+    errors: int = Field(..., description="Attempts that failed with a simulated provider error")
+    failed_calls: int = Field(..., description="Calls that failed after all retries")
+    in_flight: int = Field(..., description="Calls currently in progress")
+    peak_in_flight: int = Field(..., description="Most calls in progress at once")
+    latency_p50_seconds: Optional[float] = Field(None, description="Median call latency")
+    latency_p99_seconds: Optional[float] = Field(None, description="99th percentile call latency")
+
+
+class WebhookMetricsResponse(BaseModel):
+    queued: int = Field(..., description="Callbacks waiting for a delivery worker")
+    dropped: int = Field(..., description="Callbacks dropped since startup because the queue was full")
+
+
+class LoopStallResponse(BaseModel):
+    task: str = Field(..., description="Task (and coroutine) running when the loop was found blocked")
+    location: str = Field(..., description="Innermost frame of the blocking code")
+    detected_at: float = Field(..., description="Epoch seconds when the stall was detected")
+    blocked_ms: float = Field(..., description="How long the loop was blocked")
+
+
+class LoopMetricsResponse(BaseModel):
+    samples: int = Field(..., description="Lag samples in the current window")
+    lag_p50_ms: float = Field(..., description="Median event-loop lag")
+    lag_p99_ms: float = Field(..., description="99th percentile event-loop lag")
+    lag_max_ms: float = Field(..., description="Worst event-loop lag in the window")
+    stalls: int = Field(..., description="Stalls over the slow-callback threshold since startup")
+    recent_stalls: List[LoopStallResponse] = Field(default_factory=list, description="Most recent stalls, newest first")
+
+
+class MemoryAllocationResponse(BaseModel):
+    location: str = Field(..., description="File and line of the allocation site")
+    size_bytes: int = Field(..., description="Bytes currently allocated there")
+    count: int = Field(..., description="Live allocations")
+
+
+class MemoryResponse(BaseModel):
+    tracing: bool = Field(..., description="Whether tracemalloc is tracing")
+    tracing_started: bool = Field(..., description="True when this call started tracing; call again for results")
+    traced_bytes: int = Field(..., description="Memory currently traced")
+    peak_bytes: int = Field(..., description="Peak traced memory since tracing started")
+    top: List[MemoryAllocationResponse] = Field(..., description="Largest allocation sites")
+
+
+class MetricsResponse(BaseModel):
+    running_jobs: int = Field(..., description="Jobs currently running or queued")
+    tenants: Dict[str, TenantMetricsResponse] = Field(..., description="Scheduler metrics per tenant")
+    models: Dict[str, UsageResponse] = Field(
+        default_factory=dict, description="Token usage and spend per model since startup"
+    )
+    storage: Optional[StorageMetricsResponse] = Field(None, description="Storage compression ratio and CPU cost")
+    preprocessing: Optional[PreprocessingMetricsResponse] = Field(
+        None, description="Document preprocessing pool state, when enabled"
+    )
+    event_loop: Optional[LoopMetricsResponse] = Field(None, description="Event-loop lag and recent stalls")
+    llm_simulator: Optional[SimulatorMetricsResponse] = Field(
+        None, description="Simulated provider calls, 429s and errors, when simulating"
+    )
+    webhooks: Optional[WebhookMetricsResponse] = Field(None, description="Completion callback queue and drops")
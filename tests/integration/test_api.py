@@ -1,14 +1,16 @@
 import pytest
 import asyncio
+import httpx
 from unittest.mock import Mock, AsyncMock, patch
 from fastapi.testclient import TestClient
 from src.web import create_app
-from src.domain import SummaryStatus
+from src.web import api
+from src.domain import SummaryProgress, SummaryResult, SummaryStatus
 
 
 @pytest.fixture
 def mock_llm_service():
-    with patch('src.web.api.LangChainLLMService') as mock:
+    with patch('src.infrastructure.routing_llm_service.LangChainLLMService') as mock:
         service = Mock()
         service.generate_initial_summary = AsyncMock(return_value="Test summary")
         service.refine_summary = AsyncMock(return_value="Refined summary")
@@ -34,6 +36,17 @@ def client(mock_llm_service, mock_repository):
     return TestClient(app)
 
 
+async def _one_running_one_queued(client):
+    """Poll the listing until one job runs and one waits for a slot; return their ids"""
+    while True:
+        listing = (await client.get("/summaries")).json()["items"]
+        statuses = {item["request_id"]: item["status"] for item in listing}
+        if sorted(statuses.values()) == ["in_progress", "pending"]:
+            by_status = {status: request_id for request_id, status in statuses.items()}
+            return by_status["in_progress"], by_status["pending"]
+        await asyncio.sleep(0.01)
+
+
 class TestAPI:
     def test_health_check(self, client):
         # Act
@@ -44,6 +57,7 @@ class TestAPI:
         data = response.json()
         assert data["status"] == "healthy"
         assert "message" in data
+        assert data["llm_circuit"]["state"] == "closed"
     
     def test_create_summary(self, client):
         # Arrange
@@ -65,6 +79,8 @@ class TestAPI:
         assert "request_id" in data
         assert data["status"] == "pending"
         assert "message" in data
+        assert data["admission"] == "admitted"
+        assert data["estimated_completion_seconds"] > 0
     
     def test_create_summary_empty_documents(self, client):
         # Arrange
@@ -112,4 +128,327 @@ class TestAPI:
         response = client.options("/summaries")
         
         # Assert
-        assert "access-control-allow-origin" in response.headers
\ No newline at end of file
+        assert "access-control-allow-origin" in response.headers
+    
+    def test_append_documents(self, client):
+        # Arrange
+        asyncio.run(api.repository.save_result(SummaryResult(
+            request_id="test-123",
+            summary="Stored summary",
+            status=SummaryStatus.COMPLETED
+        )))
+        request_data = {"documents": [{"content": "# New\n\nMore content."}]}
+        
+        # Act
+        response = client.post("/summaries/test-123/documents", json=request_data)
+        
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["request_id"] == "test-123"
+        assert data["status"] == "pending"
+    
+    def test_append_documents_not_found(self, client):
+        # Act
+        response = client.post("/summaries/nonexistent/documents", json={"documents": [{"content": "x"}]})
+        
+        # Assert
+        assert response.status_code == 404
+    
+    def test_append_documents_not_completed(self, client):
+        # Arrange
+        asyncio.run(api.repository.save_result(SummaryResult(
+            request_id="test-123",
+            summary="",
+            status=SummaryStatus.FAILED
+        )))
+        
+        # Act
+        response = client.post("/summaries/test-123/documents", json={"documents": [{"content": "x"}]})
+        
+        # Assert
+        assert response.status_code == 409
+    
+    def test_cancel_summary_not_found(self, client):
+        # Act
+        response = client.delete("/summaries/nonexistent")
+        
+        # Assert
+        assert response.status_code == 404
+    
+    def test_cancel_finished_summary(self, client):
+        # Arrange
+        asyncio.run(api.repository.save_progress(SummaryProgress(
+            request_id="test-123",
+            current_document_index=1,
+            total_documents=1,
+            current_summary="Done",
+            status=SummaryStatus.COMPLETED
+        )))
+        
+        # Act
+        response = client.delete("/summaries/test-123")
+        
+        # Assert
+        assert response.status_code == 409
+    
+    def test_create_summary_over_capacity_is_rejected(self, mock_llm_service, mock_repository):
+        # Arrange
+        client = TestClient(create_app(
+            anthropic_api_key="test-key",
+            admission_capacity_tokens=10,
+            admission_policy="reject"
+        ))
+        request_data = {"documents": [{"content": "x" * 1000}]}
+        
+        # Act
+        response = client.post("/summaries", json=request_data)
+        
+        # Assert
+        assert response.status_code == 429
+        assert "retry-after" in response.headers
+    
+    def test_metrics_report_per_tenant_scheduling(self, mock_llm_service):
+        # Arrange
+        client = TestClient(create_app(anthropic_api_key="test-key", debug_token="secret"))
+        client.headers["Authorization"] = "Bearer secret"
+        request_data = {"documents": [{"content": "Test document"}], "priority": "interactive"}
+        
+        # Act
+        created = client.post("/summaries", json=request_data, headers={"X-Tenant-ID": "search"})
+        summary = client.get(f"/summaries/{created.json()['request_id']}")
+        response = client.get("/metrics")
+        
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tenants"]["search"]["completed"] == 1
+        assert data["tenants"]["search"]["queued"] == 0
+        assert data["models"] == {}
+        assert data["storage"]["algorithm"] in ("zstd", "zlib")
+        assert summary.json()["usage"]["total_tokens"] == 0
+    
+    def test_list_summaries_filters_and_pages(self, mock_llm_service):
+        # Arrange
+        client = TestClient(create_app(anthropic_api_key="test-key", debug_token="secret"))
+        client.headers["Authorization"] = "Bearer secret"
+        for tenant in ("search", "search", "billing"):
+            client.post(
+                "/summaries", json={"documents": [{"content": "Test document"}]}, headers={"X-Tenant-ID": tenant}
+            )
+        
+        # Act
+        first = client.get("/summaries", params={"tenant": "search", "limit": 1})
+        second = client.get("/summaries", params={"tenant": "search", "cursor": first.json()["next_cursor"]})
+        recent = client.get("/summaries", params={"since": "2100-01-01T00:00:00"})
+        invalid = client.get("/summaries", params={"cursor": "not-a-cursor"})
+        
+        # Assert
+        assert first.status_code == 200
+        assert len(first.json()["items"]) == 1
+        assert first.json()["items"][0]["tenant"] == "search"
+        assert "summary" not in first.json()["items"][0]
+        assert len(second.json()["items"]) == 1
+        assert second.json()["next_cursor"] is None
+        assert recent.json() == {"items": [], "next_cursor": None}
+        assert invalid.status_code == 400
+    
+    def test_operations_endpoints_require_debug_token(self, mock_llm_service):
+        # Arrange
+        unprotected = TestClient(create_app(anthropic_api_key="test-key"))
+        client = TestClient(create_app(anthropic_api_key="test-key", debug_token="secret"))
+        
+        # Act & Assert
+        assert unprotected.get("/summaries").status_code == 405
+        assert client.get("/summaries").status_code == 401
+        assert client.get("/summaries", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert unprotected.get("/metrics").status_code == 404
+        assert client.get("/metrics").status_code == 401
+    
+    def test_debug_endpoints_require_configured_token(self, mock_llm_service):
+        # Arrange
+        unprotected = TestClient(create_app(anthropic_api_key="test-key"))
+        client = TestClient(create_app(anthropic_api_key="test-key", debug_token="secret"))
+        
+        # Act & Assert
+        assert unprotected.get("/debug/memory").status_code == 404
+        assert client.get("/debug/memory").status_code == 401
+        assert client.get("/debug/memory", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    
+    def test_debug_profile_and_memory(self, mock_llm_service):
+        # Arrange
+        client = TestClient(create_app(anthropic_api_key="test-key", debug_token="secret"))
+        headers = {"Authorization": "Bearer secret"}
+        
+        # Act
+        profile = client.get("/debug/profile", params={"seconds": 0.05, "sort": "tottime"}, headers=headers)
+        started = client.get("/debug/memory", headers=headers)
+        allocations = client.get("/debug/memory", params={"limit": 5}, headers=headers)
+        stopped = client.delete("/debug/memory", headers=headers)
+        
+        # Assert
+        assert profile.status_code == 200
+        assert "function calls" in profile.text
+        assert started.json()["tracing_started"] is True
+        assert allocations.json()["tracing_started"] is False
+        assert len(allocations.json()["top"]) <= 5
+        assert stopped.json()["tracing"] is False
+    
+    def test_metrics_report_event_loop_lag(self, mock_llm_service):
+        # Arrange
+        with TestClient(create_app(anthropic_api_key="test-key", debug_token="secret")) as client:
+            # Act
+            response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        
+        # Assert
+        assert response.json()["event_loop"]["stalls"] == 0
+    
+    def test_metrics_report_preprocessing_pool(self, mock_llm_service):
+        # Arrange
+        app = create_app(anthropic_api_key="test-key", preprocess_workers=1, debug_token="secret")
+        with TestClient(app) as client:
+            # Act
+            response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        
+        # Assert
+        assert response.json()["preprocessing"] == {
+            "max_workers": 1,
+            "pool_running": False,
+            "pooled_batches": 0,
+            "inline_documents": 0
+        }
+    
+    def test_simulated_backend_completes_summaries(self):
+        # Arrange
+        client = TestClient(create_app(
+            llm_backend="simulated",
+            simulator_options={"speedup": 1000, "seed": 1},
+            debug_token="secret"
+        ))
+        
+        # Act
+        created = client.post("/summaries", json={"documents": [{"content": "Test document"}]})
+        summary = client.get(f"/summaries/{created.json()['request_id']}")
+        metrics = client.get("/metrics", headers={"Authorization": "Bearer secret"}).json()
+        
+        # Assert
+        assert summary.json()["status"] == "completed"
+        assert metrics["llm_simulator"]["calls"] == 1
+        assert "simulated:claude-3-5-sonnet-latest" in metrics["models"]
+    
+    @pytest.mark.asyncio
+    async def test_cancel_job_waiting_for_slot_records_cancellation(self):
+        # Arrange
+        app = create_app(
+            llm_backend="simulated",
+            simulator_options={"time_to_first_token": 60},
+            max_concurrent_jobs=1,
+            debug_token="secret"
+        )
+        transport = httpx.ASGITransport(app=app)
+        headers = {"Authorization": "Bearer secret"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+            posts = [
+                asyncio.create_task(client.post("/summaries", json={"documents": [{"content": "Test document"}]}))
+                for _ in range(2)
+            ]
+            running, queued = await asyncio.wait_for(_one_running_one_queued(client), timeout=5)
+            
+            # Act
+            cancel = await client.delete(f"/summaries/{queued}")
+            await client.delete(f"/summaries/{running}")
+            await asyncio.gather(*posts)
+            summary = await client.get(f"/summaries/{queued}")
+            status = await client.get(f"/summaries/{queued}/status")
+        
+        # Assert
+        assert cancel.status_code == 200
+        assert summary.json()["status"] == "cancelled"
+        assert status.json()["status"] == "cancelled"
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_job_releases_its_reservation(self):
+        # Arrange
+        app = create_app(
+            llm_backend="simulated",
+            simulator_options={"time_to_first_token": 60},
+            max_concurrent_jobs=1,
+            debug_token="secret"
+        )
+        transport = httpx.ASGITransport(app=app)
+        headers = {"Authorization": "Bearer secret"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+            posts = [
+                asyncio.create_task(client.post("/summaries", json={"documents": [{"content": "Test document"}]}))
+                for _ in range(2)
+            ]
+            running, queued = await asyncio.wait_for(_one_running_one_queued(client), timeout=5)
+            reserved_while_queued = api.admission.reserved_tokens
+            
+            # Act
+            await client.delete(f"/summaries/{queued}")
+            await asyncio.sleep(0.01)
+            reserved_after_cancel = api.admission.reserved_tokens
+            await client.delete(f"/summaries/{running}")
+            await asyncio.gather(*posts)
+            await asyncio.sleep(0.01)
+        
+        # Assert
+        assert 0 < reserved_after_cancel < reserved_while_queued
+        assert api.admission.reserved_tokens == 0
+    
+    def test_unknown_llm_backend_is_rejected(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            create_app(llm_backend="unknown")
+    
+    def test_create_summary_invalid_priority_header(self, client):
+        # Act
+        response = client.post(
+            "/summaries",
+            json={"documents": [{"content": "Test document"}]},
+            headers={"X-Priority": "urgent"}
+        )
+        
+        # Assert
+        assert response.status_code == 400
+    
+    def test_create_summary_rejects_private_callback_url(self, client):
+        # Act
+        response = client.post(
+            "/summaries",
+            json={"documents": [{"content": "Test document"}], "callback_url": "http://169.254.169.254/latest"}
+        )
+        
+        # Assert
+        assert response.status_code == 400
+    
+    def test_queued_summary_is_pending_until_claimed_and_cancellable(self, mock_llm_service, tmp_path):
+        # Arrange
+        client = TestClient(create_app(anthropic_api_key="test-key", job_queue_path=str(tmp_path / "jobs.db")))
+        response = client.post("/summaries", json={"documents": [{"content": "Test document"}]})
+        request_id = response.json()["request_id"]
+        
+        # Act
+        status = client.get(f"/summaries/{request_id}/status")
+        cancel = client.delete(f"/summaries/{request_id}")
+        
+        # Assert
+        assert status.json()["status"] == "pending"
+        assert cancel.status_code == 200
+        assert client.get(f"/summaries/{request_id}").json()["status"] == "cancelled"
+    
+    def test_cancel_of_job_claimed_elsewhere_is_requested(self, mock_llm_service, tmp_path):
+        # Arrange
+        client = TestClient(create_app(anthropic_api_key="test-key", job_queue_path=str(tmp_path / "jobs.db")))
+        response = client.post("/summaries", json={"documents": [{"content": "Test document"}]})
+        request_id = response.json()["request_id"]
+        job = asyncio.run(api.job_queue.claim("other-worker", lease_seconds=60))
+        
+        # Act
+        cancel = client.delete(f"/summaries/{request_id}")
+        
+        # Assert
+        assert cancel.status_code == 202
+        assert cancel.json()["status"] == "pending"
+        assert asyncio.run(api.job_queue.cancel_requested(job.job_id)) is True
@@ -0,0 +1,183 @@
+import asyncio
+import pytest
+from src.domain import Document, JobKind, SummaryRequest, SummaryStrategy
+from src.use_cases import (
+    AdmissionController,
+    AdmissionOutcome,
+    AdmissionPolicy,
+    CostEstimator
+)
+
+
+def _request(request_id="test-123", documents=3, chars=4000, strategy=SummaryStrategy.REFINE):
+    return SummaryRequest(
+        documents=[Document(content="x" * chars) for _ in range(documents)],
+        request_id=request_id,
+        strategy=strategy
+    )
+
+
+class TestCostEstimator:
+    def test_refine_estimate(self):
+        # Arrange
+        estimator = CostEstimator(summary_tokens=100, seconds_per_call=1, tokens_per_second=1000)
+        
+        # Act
+        estimate = estimator.estimate(_request(documents=3, chars=4000))
+        
+        # Assert
+        assert estimate.llm_calls == 3
+        assert estimate.sequential_calls == 3
+        assert estimate.tokens == 3 * 1000 + 2 * 100
+        assert estimate.seconds == pytest.approx(3 + 3.2)
+    
+    def test_hierarchical_runs_fewer_sequential_calls(self):
+        # Arrange
+        estimator = CostEstimator(section_token_threshold=1000)
+        request = _request(documents=1, chars=32000)
+        
+        # Act
+        refine = estimator.estimate(request, SummaryStrategy.REFINE)
+        hierarchical = estimator.estimate(request, SummaryStrategy.HIERARCHICAL)
+        
+        # Assert
+        assert hierarchical.llm_calls == 15
+        assert hierarchical.sequential_calls == 4
+        assert hierarchical.tokens > refine.tokens
+
+
+class TestAdmissionController:
+    def test_admits_without_capacity_budget(self):
+        # Arrange
+        controller = AdmissionController(CostEstimator())
+        
+        # Act
+        decision = controller.admit(_request())
+        
+        # Assert
+        assert decision.outcome == AdmissionOutcome.ADMITTED
+        assert decision.estimated_completion_seconds > 0
+    
+    def test_rejects_over_capacity(self):
+        # Arrange
+        controller = AdmissionController(CostEstimator(), capacity_tokens=5000, policy=AdmissionPolicy.REJECT)
+        controller.admit(_request("first"))
+        
+        # Act
+        decision = controller.admit(_request("second"))
+        
+        # Assert
+        assert decision.outcome == AdmissionOutcome.REJECTED
+        assert not decision.accepted
+    
+    def test_rejects_once_deferred_backlog_is_full(self):
+        # Arrange
+        controller = AdmissionController(CostEstimator(), capacity_tokens=5000, max_deferred_tokens=3000)
+        controller.admit(_request("first"))
+        deferred = controller.admit(_request("second"))
+        
+        # Act
+        decision = controller.admit(_request("third"))
+        
+        # Assert
+        assert deferred.outcome == AdmissionOutcome.DEFERRED
+        assert decision.outcome == AdmissionOutcome.REJECTED
+        assert controller.reserved_tokens == 8000
+    
+    def test_refuses_jobs_over_max_job_tokens(self):
+        # Arrange
+        controller = AdmissionController(CostEstimator(), max_job_tokens=100)
+        
+        # Act
+        decision = controller.admit(_request())
+        
+        # Assert
+        assert decision.outcome == AdmissionOutcome.TOO_LARGE
+    
+    def test_downgrades_to_cheaper_strategy(self):
+        # Arrange
+        controller = AdmissionController(
+            CostEstimator(section_token_threshold=500),
+            capacity_tokens=20000,
+            policy=AdmissionPolicy.DOWNGRADE
+        )
+        controller.admit(_request("first", documents=1, chars=40000))
+        
+        # Act
+        decision = controller.admit(_request("second", documents=1, chars=40000, strategy=SummaryStrategy.HIERARCHICAL))
+        
+        # Assert
+        assert decision.outcome == AdmissionOutcome.DOWNGRADED
+        assert decision.strategy == SummaryStrategy.REFINE
+    
+    def test_never_downgrades_appends(self):
+        # Arrange
+        controller = AdmissionController(CostEstimator(), capacity_tokens=30000, policy=AdmissionPolicy.DOWNGRADE)
+        controller.admit(_request("first", documents=1, chars=40000))
+        append = _request("second", documents=20, chars=4000, strategy=SummaryStrategy.HIERARCHICAL)
+        
+        # Act
+        decision = controller.admit(append, JobKind.APPEND)
+        
+        # Assert
+        assert controller.estimator.estimate(append, SummaryStrategy.HIERARCHICAL).tokens < decision.estimate.tokens
+        assert decision.outcome == AdmissionOutcome.DEFERRED
+        assert decision.strategy == SummaryStrategy.REFINE
+    
+    @pytest.mark.asyncio
+    async def test_deferred_job_waits_for_capacity(self):
+        # Arrange
+        controller = AdmissionController(CostEstimator(), capacity_tokens=5000)
+        first = controller.admit(_request("first"))
+        second = controller.admit(_request("second"))
+        started = []
+        release = asyncio.Event()
+        
+        async def job(name, decision):
+            async with controller.running(decision):
+                started.append(name)
+                if name == "first":
+                    await release.wait()
+        
+        # Act
+        tasks = [asyncio.create_task(job("first", first)), asyncio.create_task(job("second", second))]
+        await asyncio.sleep(0.01)
+        started_before_release = list(started)
+        release.set()
+        await asyncio.gather(*tasks)
+        
+        # Assert
+        assert second.outcome == AdmissionOutcome.DEFERRED
+        assert started_before_release == ["first"]
+        assert started == ["first", "second"]
+        assert controller.reserved_tokens == 0
+    
+    @pytest.mark.asyncio
+    async def test_deferred_jobs_start_in_arrival_order(self):
+        # Arrange
+        controller = AdmissionController(CostEstimator(), capacity_tokens=5000)
+        small = controller.admit(_request("small", documents=1))
+        large = controller.admit(_request("large", documents=4))
+        later_small = controller.admit(_request("later-small", documents=1))
+        started = []
+        release = asyncio.Event()
+        
+        async def job(name, decision):
+            async with controller.running(decision):
+                started.append(name)
+                await release.wait()
+        
+        # Act
+        tasks = [asyncio.create_task(job("small", small))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(job("large", large)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(job("later-small", later_small)))
+        await asyncio.sleep(0.01)
+        started_while_small_runs = list(started)
+        release.set()
+        await asyncio.gather(*tasks)
+        
+        # Assert
+        assert started_while_small_runs == ["small"]
+        assert started == ["small", "large", "later-small"]
@@ -0,0 +1,154 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from bulk import ResultWriter, build_service, iter_items, run_bulk
+from src.domain import LLMService
+
+
+@pytest.fixture
+def mock_llm_service():
+    service = Mock(spec=LLMService)
+    service.generate_initial_summary = AsyncMock(return_value="Initial summary")
+    service.refine_summary = AsyncMock(return_value="Refined summary")
+    return service
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    root = tmp_path / "docs"
+    (root / "nested").mkdir(parents=True)
+    (root / "a.md").write_text("# A\n\nFirst document.")
+    (root / "nested" / "b.md").write_text("# B\n\nSecond document.")
+    (root / "notes.txt").write_text("Not markdown")
+    return root
+
+
+class TestIterItems:
+    def test_directory_yields_markdown_files(self, source_tree):
+        # Act
+        items = list(iter_items(str(source_tree)))
+        
+        # Assert
+        assert [item.item_id for item in items] == ["a.md", "nested/b.md"]
+        assert items[0].documents[0].title == "a"
+    
+    def test_manifest_supports_paths_content_and_documents(self, source_tree):
+        # Arrange
+        manifest = source_tree / "manifest.ndjson"
+        manifest.write_text("\n".join([
+            json.dumps({"path": "a.md"}),
+            json.dumps({"id": "inline", "content": "Inline content"}),
+            "",
+            json.dumps({"id": "multi", "documents": [{"content": "One"}, {"content": "Two"}]})
+        ]))
+        
+        # Act
+        items = list(iter_items(str(manifest)))
+        
+        # Assert
+        assert [item.item_id for item in items] == ["a.md", "inline", "multi"]
+        assert len(items[2].documents) == 2
+    
+    def test_unreadable_inputs_become_failed_items(self, source_tree):
+        # Arrange
+        (source_tree / "latin1.md").write_bytes("caf\xe9".encode("latin-1"))
+        manifest = source_tree / "manifest.ndjson"
+        manifest.write_bytes(b"\n".join([
+            b"{not json",
+            json.dumps({"id": "no-content"}).encode(),
+            b"\xff\xfe",
+            json.dumps({"path": "missing.md"}).encode(),
+            json.dumps({"id": "inline", "content": "Inline content"}).encode()
+        ]))
+        
+        # Act
+        files = list(iter_items(str(source_tree)))
+        entries = list(iter_items(str(manifest)))
+        
+        # Assert
+        assert [item.item_id for item in files if item.error] == ["latin1.md"]
+        assert [item.error is not None for item in entries] == [True, True, True, True, False]
+        assert entries[-1].documents[0].content == "Inline content"
+
+
+class TestRunBulk:
+    @pytest.mark.asyncio
+    async def test_writes_jsonl_and_resumes(self, source_tree, tmp_path, mock_llm_service):
+        # Arrange
+        output = tmp_path / "out" / "results.jsonl"
+        service = build_service(mock_llm_service)
+        
+        # Act
+        first = await run_bulk(iter_items(str(source_tree)), service, service.repository, ResultWriter(str(output)))
+        second = await run_bulk(iter_items(str(source_tree)), service, service.repository, ResultWriter(str(output)))
+        
+        # Assert
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [record["id"] for record in records] == ["a.md", "nested/b.md"]
+        assert all(record["status"] == "completed" for record in records)
+        assert (first.completed, first.skipped) == (2, 0)
+        assert (second.completed, second.skipped) == (0, 2)
+        assert mock_llm_service.generate_initial_summary.call_count == 2
+        assert await service.repository.get_result("a.md") is None
+    
+    @pytest.mark.asyncio
+    async def test_directory_output_retries_failed_items(self, source_tree, tmp_path, mock_llm_service):
+        # Arrange
+        output = tmp_path / "summaries"
+        mock_llm_service.generate_initial_summary = AsyncMock(
+            side_effect=[Exception("boom"), "Summary", "Retried summary"]
+        )
+        service = build_service(mock_llm_service)
+        
+        # Act
+        first = await run_bulk(
+            iter_items(str(source_tree)), service, service.repository, ResultWriter(str(output)), concurrency=1
+        )
+        second = await run_bulk(
+            iter_items(str(source_tree)), service, service.repository, ResultWriter(str(output)), concurrency=1
+        )
+        
+        # Assert
+        assert (first.completed, first.failed) == (1, 1)
+        assert (second.completed, second.skipped) == (1, 1)
+        assert (output / "a.md.summary.md").read_text() == "Retried summary"
+        assert (output / "nested" / "b.md.summary.md").read_text() == "Summary"
+    
+    @pytest.mark.asyncio
+    async def test_numeric_manifest_ids_name_output_files(self, source_tree, tmp_path, mock_llm_service):
+        # Arrange
+        manifest = source_tree / "manifest.ndjson"
+        manifest.write_text(json.dumps({"id": 42, "content": "Inline content"}))
+        output = tmp_path / "summaries"
+        service = build_service(mock_llm_service)
+        
+        # Act
+        report = await run_bulk(iter_items(str(manifest)), service, service.repository, ResultWriter(str(output)))
+        
+        # Assert
+        assert report.completed == 1
+        assert (output / "42.summary.md").exists()
+    
+    @pytest.mark.asyncio
+    async def test_unreadable_file_fails_alone(self, source_tree, tmp_path, mock_llm_service):
+        # Arrange
+        (source_tree / "a.txt").write_text("Same stem as a.md")
+        (source_tree / "binary.dat").write_bytes(b"\xff\xfe\x00")
+        output = tmp_path / "summaries"
+        service = build_service(mock_llm_service)
+        
+        # Act
+        stats = await run_bulk(
+            iter_items(str(source_tree), pattern="**/*.*"), service, service.repository, ResultWriter(str(output))
+        )
+        
+        # Assert
+        assert (stats.completed, stats.failed) == (4, 1)
+        assert (output / "a.md.summary.md").exists()
+        assert (output / "a.txt.summary.md").exists()
+    
+    @pytest.mark.asyncio
+    async def test_rejects_non_positive_concurrency(self, tmp_path, mock_llm_service):
+        service = build_service(mock_llm_service)
+        with pytest.raises(ValueError):
+            await run_bulk(iter([]), service, service.repository, ResultWriter(str(tmp_path)), concurrency=0)
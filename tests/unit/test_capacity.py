@@ -0,0 +1,67 @@
+import json
+import pytest
+from capacity import format_report, load_trace, run_scenario, synthetic_trace
+from src.domain import JobPriority, SummaryStrategy
+
+
+class TestTraces:
+    def test_load_trace_orders_and_offsets_timestamps(self, tmp_path):
+        # Arrange
+        trace_file = tmp_path / "trace.ndjson"
+        trace_file.write_text("\n".join([
+            json.dumps({"timestamp": 1005.5, "document_tokens": [200, 300], "strategy": "hierarchical"}),
+            "",
+            json.dumps({
+                "timestamp": 1000.0,
+                "documents": [{"content": "Inline", "title": "a"}],
+                "tenant": "acme",
+                "priority": "interactive"
+            })
+        ]))
+        
+        # Act
+        trace = load_trace(str(trace_file))
+        
+        # Assert
+        assert [entry.offset_seconds for entry in trace] == [0.0, 5.5]
+        assert trace[0].tenant == "acme"
+        assert trace[0].priority == JobPriority.INTERACTIVE
+        assert trace[0].documents[0].title == "a"
+        assert trace[1].strategy == SummaryStrategy.HIERARCHICAL
+        assert len(trace[1].documents) == 2
+        assert trace[1].documents[0].content.startswith("# Document")
+    
+    def test_synthetic_trace_is_reproducible(self):
+        # Act
+        first = synthetic_trace(20, rate_per_second=2, document_tokens=100, seed=7)
+        second = synthetic_trace(20, rate_per_second=2, document_tokens=100, seed=7)
+        
+        # Assert
+        assert [entry.offset_seconds for entry in first] == [entry.offset_seconds for entry in second]
+        assert first[0].offset_seconds == 0.0
+        assert all(len(entry.documents) == 3 for entry in first)
+
+
+class TestRunScenario:
+    @pytest.mark.asyncio
+    async def test_replays_trace_against_simulated_backend(self):
+        # Arrange
+        trace = synthetic_trace(4, rate_per_second=1, document_tokens=200, documents_per_request=2, seed=1)
+        
+        # Act
+        result = await run_scenario(
+            trace,
+            concurrency=2,
+            strategy=SummaryStrategy.REFINE,
+            speedup=200,
+            simulator_options={"seed": 1},
+            poll_interval=0.005
+        )
+        
+        # Assert
+        assert (result.submitted, result.completed, result.failed) == (4, 4, 0)
+        assert result.llm_calls == 8
+        assert result.peak_llm_in_flight <= 2
+        assert result.latency_p50_seconds > 0
+        assert result.cost_usd > 0
+        assert "refine" in format_report([result])
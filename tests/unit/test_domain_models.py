@@ -1,5 +1,7 @@
 import pytest
 from src.domain.models import Document, SummaryRequest, SummaryResult, SummaryProgress, SummaryStatus
+from src.domain.outline import build_outline, parse_outline, scan_outline
+from src.domain.usage import TokenUsage, UsageMeter, record_usage, track_usage
 
 
 class TestDocument:
@@ -80,4 +82,69 @@ class TestSummaryStatus:
         assert SummaryStatus.PENDING.value == "pending"
         assert SummaryStatus.IN_PROGRESS.value == "in_progress"
         assert SummaryStatus.COMPLETED.value == "completed"
-        assert SummaryStatus.FAILED.value == "failed"
\ No newline at end of file
+        assert SummaryStatus.FAILED.value == "failed"
+        assert SummaryStatus.CANCELLED.value == "cancelled"
+
+
+class TestParseOutline:
+    def test_builds_heading_tree(self):
+        markdown = "Intro\n\n# A\n\nText A\n\n## A.1\n\nText A.1\n\n# B\n\nText B"
+        
+        root = parse_outline(markdown)
+        
+        assert root.body == "Intro"
+        assert [child.title for child in root.children] == ["A", "B"]
+        assert root.children[0].body == "Text A"
+        assert root.children[0].children[0].title == "A.1"
+        assert root.children[0].children[0].body == "Text A.1"
+    
+    def test_ignores_headings_in_code_fences(self):
+        markdown = "# A\n\n```\n# not a heading\n```"
+        
+        root = parse_outline(markdown)
+        
+        assert len(root.children) == 1
+        assert root.children[0].children == []
+        assert "# not a heading" in root.children[0].body
+    
+    def test_to_markdown_round_trips_sections(self):
+        markdown = "# A\n\nText A\n\n## A.1\n\nText A.1"
+        
+        root = parse_outline(markdown)
+        
+        assert root.to_markdown() == markdown
+    
+    def test_scan_outline_returns_offsets_that_rebuild_the_tree(self):
+        markdown = "Intro\r\n# A #\r\nText A\r\n## A.1\r\nText A.1"
+        
+        spans = scan_outline(markdown)
+        
+        assert all(isinstance(offset, int) for span in spans for offset in span)
+        assert build_outline(markdown, spans) == parse_outline(markdown)
+        assert parse_outline(markdown).children[0].title == "A"
+        assert parse_outline(markdown).children[0].children[0].body == "Text A.1"
+
+
+class TestUsageTracking:
+    def test_records_into_innermost_tracked_usage(self):
+        with track_usage() as outer:
+            record_usage(TokenUsage(input_tokens=10, output_tokens=1, llm_calls=1))
+            with track_usage() as inner:
+                record_usage(TokenUsage(input_tokens=5, output_tokens=2, llm_calls=1))
+        
+        assert (outer.input_tokens, outer.llm_calls) == (10, 1)
+        assert inner.total_tokens == 7
+    
+    def test_untracked_usage_is_ignored(self):
+        record_usage(TokenUsage(input_tokens=10))
+    
+    def test_meter_totals_per_model(self):
+        meter = UsageMeter()
+        
+        meter.record("model-a", TokenUsage(input_tokens=10, llm_calls=1, cost_usd=0.1))
+        meter.record("model-a", TokenUsage(input_tokens=5, llm_calls=1, cost_usd=0.1))
+        meter.record("model-b", TokenUsage(output_tokens=3, llm_calls=1))
+        
+        snapshot = meter.snapshot()
+        assert snapshot["model-a"] == TokenUsage(input_tokens=15, llm_calls=2, cost_usd=0.2)
+        assert snapshot["model-b"].output_tokens == 3
@@ -0,0 +1,79 @@
+import pytest
+from src.domain import JobPriority
+from src.use_cases import FairQueue
+
+
+class TestFairQueue:
+    def test_interactive_jobs_are_served_first(self):
+        # Arrange
+        queue = FairQueue()
+        queue.push("batch", "a", JobPriority.BATCH)
+        queue.push("interactive", "b", JobPriority.INTERACTIVE)
+        
+        # Act
+        first = queue.pop()
+        
+        # Assert
+        assert first == ("b", "interactive")
+    
+    def test_flooding_tenant_does_not_starve_others(self):
+        # Arrange
+        queue = FairQueue()
+        for i in range(10):
+            queue.push(f"a{i}", "a", JobPriority.BATCH)
+        queue.push("b0", "b", JobPriority.BATCH)
+        
+        # Act
+        order = [queue.pop()[1] for _ in range(3)]
+        
+        # Assert
+        assert "b0" in order[:2]
+    
+    def test_weights_set_share_of_slots(self):
+        # Arrange
+        queue = FairQueue(weights={"a": 3})
+        for i in range(30):
+            queue.push(i, "a", JobPriority.BATCH)
+            queue.push(i, "b", JobPriority.BATCH)
+        
+        # Act
+        tenants = [queue.pop()[0] for _ in range(20)]
+        
+        # Assert
+        assert tenants.count("a") == 15
+        assert tenants.count("b") == 5
+    
+    def test_remove_drops_queued_item(self):
+        # Arrange
+        queue = FairQueue()
+        handle = queue.push("first", "a", JobPriority.BATCH)
+        queue.push("second", "a", JobPriority.BATCH)
+        
+        # Act
+        removed = queue.remove(handle)
+        
+        # Assert
+        assert removed is True
+        assert queue.depths() == {"a": 1}
+        assert queue.pop() == ("a", "second")
+        assert queue.pop() is None
+        assert queue.remove(handle) is False
+    
+    def test_forgets_tenants_with_nothing_queued(self):
+        # Arrange
+        queue = FairQueue()
+        handles = [queue.push(i, f"tenant-{i}", JobPriority.BATCH) for i in range(100)]
+        
+        # Act
+        queue.pop()
+        for handle in handles[1:]:
+            queue.remove(handle)
+        
+        # Assert
+        assert len(queue) == 0
+        assert queue._last_tag == {}
+        assert queue._depth == {}
+    
+    def test_rejects_non_positive_weight(self):
+        with pytest.raises(ValueError):
+            FairQueue(weights={"a": 0})
@@ -1,7 +1,45 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import sqlite3
+import threading
+import time
+import fakeredis
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import AsyncMock, Mock, patch
-from src.infrastructure import LangChainLLMService, InMemorySummaryRepository
-from src.domain import SummaryProgress, SummaryResult, SummaryStatus
+from langchain_core.messages import AIMessage
+from src.infrastructure import (
+    CircuitBreakerLLMService,
+    CircuitOpenError,
+    CircuitState,
+    InMemorySummaryRepository,
+    LangChainLLMService,
+    LoopMonitor,
+    ProcessPoolPreprocessor,
+    RedisSummaryRepository,
+    RoutingLLMService,
+    SQLiteJobQueue,
+    SimulatedAPIError,
+    SimulatedLLMService,
+    TextCodec,
+    WebhookNotifier
+)
+from src.domain import (
+    Document,
+    JobKind,
+    JobPriority,
+    LLMService,
+    SummaryProgress,
+    SummaryRequest,
+    SummaryResult,
+    SummaryStatus,
+    TokenUsage,
+    UsageMeter,
+    prepare_batch,
+    track_usage
+)
 
 
 class TestLangChainLLMService:
@@ -42,6 +80,28 @@ class TestLangChainLLMService:
             "context": "New content"
         })
     
+    @pytest.mark.asyncio
+    async def test_records_usage_per_request_and_model(self):
+        # Arrange
+        meter = UsageMeter()
+        with patch('src.infrastructure.llm_service.init_chat_model'):
+            service = LangChainLLMService(api_key="test-key", model_name="claude-3-5-haiku-latest", usage_meter=meter)
+        message = AIMessage(
+            content="Generated summary",
+            usage_metadata={"input_tokens": 1000, "output_tokens": 200, "total_tokens": 1200}
+        )
+        service.initial_summary_chain = Mock(ainvoke=AsyncMock(return_value=message))
+        
+        # Act
+        with track_usage() as usage:
+            result = await service.generate_initial_summary("Test content")
+        
+        # Assert
+        assert result == "Generated summary"
+        assert (usage.input_tokens, usage.output_tokens, usage.llm_calls) == (1000, 200, 1)
+        assert usage.cost_usd == pytest.approx(0.0016)
+        assert meter.snapshot()["claude-3-5-haiku-latest"] == usage
+    
     @pytest.mark.asyncio
     async def test_generate_initial_summary_error(self, mock_llm):
         # Arrange
@@ -96,6 +156,20 @@ class TestInMemorySummaryRepository:
         # Assert
         assert result is None
     
+    @pytest.mark.asyncio
+    async def test_replace_result_checks_version(self, repository):
+        # Arrange
+        await repository.save_result(SummaryResult("test-123", "Summary", SummaryStatus.COMPLETED))
+        
+        # Act
+        stale = SummaryResult("test-123", "Stale", SummaryStatus.COMPLETED, version=3)
+        current = SummaryResult("test-123", "New", SummaryStatus.COMPLETED, version=2)
+        replaced = (await repository.replace_result(stale, 2), await repository.replace_result(current, 1))
+        
+        # Assert
+        assert replaced == (False, True)
+        assert (await repository.get_result("test-123")).version == 2
+    
     @pytest.mark.asyncio
     async def test_save_and_get_result(self, repository):
         # Arrange
@@ -149,4 +223,1116 @@ class TestInMemorySummaryRepository:
         # Assert
         assert result == updated_progress
         assert result.current_document_index == 2
-        assert result.current_summary == "Updated"
\ No newline at end of file
+        assert result.current_summary == "Updated"
+
+
+class TestSummaryListing:
+    def _clock(self):
+        ticks = iter(range(1, 1000))
+        return lambda: float(next(ticks))
+    
+    async def _save(self, repository, request_id, status, tenant="default"):
+        await repository.save_progress(SummaryProgress(
+            request_id=request_id,
+            current_document_index=0,
+            total_documents=1,
+            current_summary="Summary text",
+            status=status,
+            tenant=tenant
+        ))
+    
+    @pytest.fixture
+    def repositories(self):
+        server = fakeredis.FakeServer()
+        return [
+            InMemorySummaryRepository(clock=self._clock()),
+            RedisSummaryRepository(fakeredis.aioredis.FakeRedis(server=server), clock=self._clock())
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_filters_by_status_tenant_and_since(self, repositories):
+        for repository in repositories:
+            # Arrange
+            await self._save(repository, "a", SummaryStatus.IN_PROGRESS, "search")
+            await self._save(repository, "b", SummaryStatus.IN_PROGRESS, "billing")
+            await self._save(repository, "c", SummaryStatus.IN_PROGRESS, "search")
+            await repository.save_result(SummaryResult(
+                request_id="a",
+                summary="Done",
+                status=SummaryStatus.COMPLETED,
+                tenant="search"
+            ))
+            
+            # Act
+            stuck = await repository.list_summaries(status=SummaryStatus.IN_PROGRESS)
+            search = await repository.list_summaries(tenant="search")
+            stuck_search = await repository.list_summaries(status=SummaryStatus.IN_PROGRESS, tenant="search")
+            recent = await repository.list_summaries(since=2.0)
+            
+            # Assert
+            assert [item.request_id for item in stuck.items] == ["b", "c"]
+            assert [item.request_id for item in search.items] == ["a", "c"]
+            assert [item.request_id for item in stuck_search.items] == ["c"]
+            assert [item.request_id for item in recent.items] == ["b", "c"]
+            assert search.items[0].status == SummaryStatus.COMPLETED
+            assert search.items[0].created_at == 1.0
+            assert search.items[0].updated_at == 4.0
+            assert stuck.next_cursor is None
+    
+    @pytest.mark.asyncio
+    async def test_cursor_pages_through_index(self, repositories):
+        for repository in repositories:
+            # Arrange
+            for number in range(5):
+                await self._save(repository, f"job-{number}", SummaryStatus.PENDING)
+            
+            # Act
+            pages = [await repository.list_summaries(limit=2)]
+            while pages[-1].next_cursor:
+                pages.append(await repository.list_summaries(cursor=pages[-1].next_cursor, limit=2))
+            
+            # Assert
+            assert [[item.request_id for item in page.items] for page in pages] == [
+                ["job-0", "job-1"], ["job-2", "job-3"], ["job-4"]
+            ]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_raises(self, repositories):
+        for repository in repositories:
+            with pytest.raises(ValueError):
+                await repository.list_summaries(cursor="not-a-cursor")
+
+
+class TestProcessPoolPreprocessor:
+    @pytest.fixture
+    def contents(self):
+        return [f"# Doc {number}\n\nIntro\n\n## Part\n\n" + "Body text. " * 50 * number for number in range(1, 7)]
+    
+    @pytest.mark.asyncio
+    async def test_pooled_results_match_inline(self, contents):
+        # Arrange
+        preprocessor = ProcessPoolPreprocessor(max_workers=2, batch_chars=1500, inline_chars=0)
+        
+        # Act
+        try:
+            prepared = await preprocessor.prepare(contents)
+        finally:
+            await preprocessor.close()
+        
+        # Assert
+        assert prepared == prepare_batch(contents)
+        assert preprocessor.snapshot()["pooled_batches"] > 1
+        assert preprocessor.snapshot()["inline_documents"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_small_requests_skip_the_pool(self, contents):
+        # Arrange
+        preprocessor = ProcessPoolPreprocessor(inline_chars=10_000_000)
+        
+        # Act
+        prepared = await preprocessor.prepare(contents)
+        
+        # Assert
+        assert prepared == prepare_batch(contents)
+        assert preprocessor.snapshot()["pool_running"] is False
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_inline_when_pool_is_unavailable(self, contents):
+        # Arrange
+        preprocessor = ProcessPoolPreprocessor(inline_chars=0)
+        
+        # Act
+        with patch("src.infrastructure.process_pool.ProcessPoolExecutor", side_effect=OSError("no semaphores")):
+            prepared = await preprocessor.prepare(contents)
+        
+        # Assert
+        assert prepared == prepare_batch(contents)
+        assert preprocessor.snapshot()["inline_documents"] == len(contents)
+    
+    def test_rejects_non_positive_workers(self):
+        with pytest.raises(ValueError):
+            ProcessPoolPreprocessor(max_workers=0)
+
+
+class TestLoopMonitor:
+    @pytest.mark.asyncio
+    async def test_attributes_stall_to_blocking_task(self):
+        # Arrange
+        monitor = LoopMonitor(interval=0.01, slow_callback_seconds=0.05)
+        
+        async def render_report():
+            time.sleep(0.2)
+        
+        await monitor.start()
+        
+        # Act
+        try:
+            await asyncio.sleep(0.05)
+            await asyncio.create_task(render_report(), name="report-42")
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+        snapshot = monitor.snapshot()
+        
+        # Assert
+        assert snapshot["stalls"] == 1
+        stall = snapshot["recent_stalls"][0]
+        assert "report-42" in stall["task"]
+        assert "render_report" in stall["task"]
+        assert "in render_report" in stall["location"]
+        assert stall["blocked_ms"] >= 150
+        assert snapshot["lag_max_ms"] >= 150
+    
+    @pytest.mark.asyncio
+    async def test_no_stalls_when_loop_is_responsive(self):
+        # Arrange
+        monitor = LoopMonitor(interval=0.01, slow_callback_seconds=0.1)
+        await monitor.start()
+        
+        # Act
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+        
+        # Assert
+        assert monitor.snapshot()["stalls"] == 0
+        assert monitor.snapshot()["samples"] > 0
+
+
+class TestTextCodec:
+    @pytest.mark.parametrize("algorithm", ["zlib", "none"])
+    def test_round_trip(self, algorithm):
+        # Arrange
+        codec = TextCodec(algorithm, min_size=16)
+        text = "Summary paragraph with ümlauts. " * 200
+        
+        # Act
+        encoded = codec.encode(text)
+        
+        # Assert
+        assert codec.decode(encoded) == text
+        assert codec.stats.compressions == 1
+        assert codec.stats.decompressions == 1
+    
+    def test_compresses_large_values_and_stores_small_ones_raw(self):
+        # Arrange
+        codec = TextCodec("zlib", min_size=64)
+        
+        # Act
+        small = codec.encode("short")
+        large = codec.encode("repetitive summary text " * 100)
+        
+        # Assert
+        assert small == b"rshort"
+        assert len(large) < 200
+        assert codec.snapshot()["ratio"] > 5
+    
+    def test_reads_values_written_with_another_algorithm(self):
+        # Arrange
+        text = "Summary " * 500
+        encoded = TextCodec("zlib", min_size=0).encode(text)
+        
+        # Act & Assert
+        assert TextCodec("none").decode(encoded) == text
+    
+    def test_unknown_algorithm_raises(self):
+        with pytest.raises(ValueError):
+            TextCodec("lz4")
+    
+    @pytest.mark.asyncio
+    async def test_encode_async_offloads_large_values(self):
+        # Arrange
+        codec = TextCodec("zlib", min_size=0, offload_size=1000)
+        
+        # Act
+        with patch("src.infrastructure.compression.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            small = await codec.encode_async("short")
+            large = await codec.encode_async("Summary " * 500)
+        
+        # Assert
+        assert to_thread.call_count == 1
+        assert codec.decode(small) == "short"
+        assert codec.decode(large) == "Summary " * 500
+
+
+class TestCompressedInMemorySummaryRepository:
+    @pytest.mark.asyncio
+    async def test_result_is_decompressed_lazily(self):
+        # Arrange
+        codec = TextCodec("zlib", min_size=0)
+        repository = InMemorySummaryRepository(codec=codec)
+        result_obj = SummaryResult(
+            request_id="test-123", summary="Final summary " * 100, status=SummaryStatus.COMPLETED
+        )
+        await repository.save_result(result_obj)
+        
+        # Act
+        result = await repository.get_result("test-123")
+        status = result.status
+        
+        # Assert
+        assert status == SummaryStatus.COMPLETED
+        assert codec.stats.decompressions == 0
+        assert result.summary == result_obj.summary
+        assert codec.stats.decompressions == 1
+        assert result == result_obj
+    
+    @pytest.mark.asyncio
+    async def test_returned_progress_does_not_alias_stored_record(self):
+        # Arrange
+        repository = InMemorySummaryRepository(codec=TextCodec("zlib", min_size=0))
+        await repository.save_progress(SummaryProgress(
+            request_id="test-123",
+            current_document_index=1,
+            total_documents=2,
+            current_summary="Test summary",
+            status=SummaryStatus.IN_PROGRESS
+        ))
+        
+        # Act
+        progress = await repository.get_progress("test-123")
+        progress.status = SummaryStatus.FAILED
+        
+        # Assert
+        assert (await repository.get_progress("test-123")).status == SummaryStatus.IN_PROGRESS
+
+
+class TestRedisSummaryRepository:
+    @pytest.fixture
+    def server(self):
+        return fakeredis.FakeServer()
+    
+    def _worker(self, server):
+        # Each repository stands in for a separate worker process sharing one server
+        return RedisSummaryRepository(fakeredis.aioredis.FakeRedis(server=server))
+    
+    @pytest.mark.asyncio
+    async def test_progress_and_result_are_shared_across_workers(self, server):
+        # Arrange
+        writer, reader = self._worker(server), self._worker(server)
+        progress = SummaryProgress(
+            request_id="test-123",
+            current_document_index=1,
+            total_documents=2,
+            current_summary="Test summary",
+            status=SummaryStatus.IN_PROGRESS,
+            version=2,
+            usage=TokenUsage(input_tokens=100, output_tokens=20, llm_calls=1, cost_usd=0.01)
+        )
+        result_obj = SummaryResult(
+            request_id="test-123",
+            summary="Final summary",
+            status=SummaryStatus.COMPLETED
+        )
+        
+        # Act
+        await writer.save_progress(progress)
+        await writer.save_result(result_obj)
+        
+        # Assert
+        assert await reader.get_progress("test-123") == progress
+        assert await reader.get_result("test-123") == result_obj
+        assert await reader.get_result("nonexistent") is None
+    
+    @pytest.mark.asyncio
+    async def test_compressed_records_round_trip(self, server):
+        # Arrange
+        codec = TextCodec("zlib", min_size=0)
+        writer = RedisSummaryRepository(fakeredis.aioredis.FakeRedis(server=server), codec=codec)
+        result_obj = SummaryResult(
+            request_id="test-123", summary="Final summary " * 200, status=SummaryStatus.COMPLETED
+        )
+        
+        # Act
+        await writer.save_result(result_obj)
+        stored = await writer.client.get("summary:result:test-123")
+        result = await self._worker(server).get_result("test-123")
+        
+        # Assert
+        assert len(stored) < len(result_obj.summary)
+        assert result == result_obj
+    
+    @pytest.mark.asyncio
+    async def test_ttl_expires_records(self, server):
+        # Arrange
+        repository = RedisSummaryRepository(
+            fakeredis.aioredis.FakeRedis(server=server), ttl_seconds=60
+        )
+        
+        # Act
+        await repository.save_result(SummaryResult("test-123", "Summary", SummaryStatus.COMPLETED))
+        
+        # Assert
+        assert 0 < await repository.client.ttl("summary:result:test-123") <= 60
+    
+    @pytest.mark.asyncio
+    async def test_reads_records_written_before_compression(self, server):
+        # Arrange
+        repository = RedisSummaryRepository(fakeredis.aioredis.FakeRedis(server=server), codec=TextCodec("zlib"))
+        await repository.client.set("summary:result:test-123", json.dumps({
+            "request_id": "test-123",
+            "summary": "Final summary",
+            "status": "completed",
+            "error_message": None
+        }))
+        
+        # Act
+        result = await repository.get_result("test-123")
+        
+        # Assert
+        assert result == SummaryResult("test-123", "Final summary", SummaryStatus.COMPLETED)
+    
+    @pytest.mark.asyncio
+    async def test_resaving_unread_record_keeps_stored_bytes(self, server):
+        # Arrange
+        codec = TextCodec("zlib", min_size=0)
+        repository = RedisSummaryRepository(fakeredis.aioredis.FakeRedis(server=server), codec=codec)
+        await repository.save_progress(SummaryProgress("test-123", 1, 2, "Summary " * 100, SummaryStatus.IN_PROGRESS))
+        
+        # Act
+        progress = await repository.get_progress("test-123")
+        progress.status = SummaryStatus.CANCELLED
+        await repository.save_progress(progress)
+        
+        # Assert
+        assert codec.stats.compressions == 1
+        assert (await repository.get_progress("test-123")).current_summary == "Summary " * 100
+    
+    @pytest.mark.asyncio
+    async def test_events_carry_only_ids_and_status(self, server):
+        # Arrange
+        repository = RedisSummaryRepository(
+            fakeredis.aioredis.FakeRedis(server=server), codec=TextCodec("zlib", min_size=0)
+        )
+        pubsub = repository.client.pubsub()
+        await pubsub.subscribe("summary:events:test-123")
+        await pubsub.get_message(timeout=1)
+        
+        # Act
+        await repository.save_progress(SummaryProgress("test-123", 1, 2, "Summary", SummaryStatus.IN_PROGRESS))
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
+        await pubsub.aclose()
+        
+        # Assert
+        event = json.loads(message["data"])
+        assert event == {"kind": "progress", "request_id": "test-123", "status": "in_progress", "version": 1}
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_streams_progress_until_result(self, server):
+        # Arrange
+        writer, reader = self._worker(server), self._worker(server)
+        updates = []
+        
+        async def listen():
+            async for progress in reader.subscribe("test-123"):
+                updates.append(progress.current_document_index)
+        
+        listener = asyncio.create_task(listen())
+        while not (await writer.client.pubsub_numsub("summary:events:test-123"))[0][1]:
+            await asyncio.sleep(0.01)
+        
+        # Act
+        for index in (1, 2):
+            await writer.save_progress(SummaryProgress("test-123", index, 2, "Summary", SummaryStatus.IN_PROGRESS))
+        await writer.save_result(SummaryResult("test-123", "Summary", SummaryStatus.COMPLETED))
+        await asyncio.wait_for(listener, timeout=2)
+        
+        # Assert
+        assert updates == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_starts_from_current_state_and_ends_on_cancellation(self, server):
+        # Arrange
+        writer, reader = self._worker(server), self._worker(server)
+        await writer.save_progress(SummaryProgress("test-123", 1, 3, "Summary", SummaryStatus.IN_PROGRESS))
+        updates = []
+        
+        async def listen():
+            async for progress in reader.subscribe("test-123"):
+                updates.append(progress.status)
+        
+        listener = asyncio.create_task(listen())
+        while not updates:
+            await asyncio.sleep(0.01)
+        
+        # Act
+        await writer.save_progress(SummaryProgress("test-123", 1, 3, "Summary", SummaryStatus.CANCELLED))
+        await asyncio.wait_for(listener, timeout=2)
+        
+        # Assert
+        assert updates == [SummaryStatus.IN_PROGRESS, SummaryStatus.CANCELLED]
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_to_finished_request_ends_at_once(self, server):
+        # Arrange
+        writer, reader = self._worker(server), self._worker(server)
+        await writer.save_progress(SummaryProgress("test-123", 2, 2, "Summary", SummaryStatus.COMPLETED))
+        await writer.save_result(SummaryResult("test-123", "Summary", SummaryStatus.COMPLETED))
+        
+        async def listen():
+            return [progress async for progress in reader.subscribe("test-123")]
+        
+        # Act
+        updates = await asyncio.wait_for(listen(), timeout=2)
+        
+        # Assert
+        assert [progress.status for progress in updates] == [SummaryStatus.COMPLETED]
+    
+    @pytest.mark.asyncio
+    async def test_replace_result_only_over_expected_version(self, server):
+        # Arrange
+        first, second = self._worker(server), self._worker(server)
+        await first.save_result(SummaryResult("test-123", "Summary", SummaryStatus.COMPLETED))
+        
+        # Act
+        won = await first.replace_result(SummaryResult("test-123", "First", SummaryStatus.COMPLETED, version=2), 1)
+        lost = await second.replace_result(SummaryResult("test-123", "Second", SummaryStatus.COMPLETED, version=2), 1)
+        
+        # Assert
+        assert (won, lost) == (True, False)
+        assert (await second.get_result("test-123")).summary == "First"
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_keep_one_status_index_entry(self, server):
+        # Arrange
+        api, worker = self._worker(server), self._worker(server)
+        statuses = [SummaryStatus.PENDING, SummaryStatus.IN_PROGRESS, SummaryStatus.CANCELLED] * 5
+        
+        # Act
+        await asyncio.gather(*(
+            (api if index % 2 else worker).save_progress(SummaryProgress("test-123", 0, 1, "", status))
+            for index, status in enumerate(statuses)
+        ))
+        
+        # Assert
+        listing = (await api.list_summaries()).items[0]
+        for status in (SummaryStatus.PENDING, SummaryStatus.IN_PROGRESS, SummaryStatus.CANCELLED):
+            page = await api.list_summaries(status=status)
+            assert [item.request_id for item in page.items] == (["test-123"] if status == listing.status else [])
+
+
+class TestSQLiteJobQueue:
+    class _Clock:
+        def __init__(self):
+            self.now = 1000.0
+        
+        def __call__(self):
+            return self.now
+    
+    @pytest.fixture
+    def clock(self):
+        return self._Clock()
+    
+    @pytest.fixture
+    def queue(self, tmp_path, clock):
+        return SQLiteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2, clock=clock)
+    
+    def _request(self, request_id, priority=JobPriority.BATCH, tenant="search"):
+        return SummaryRequest(
+            documents=[Document(content="Content", title="Doc", metadata={"k": "v"})],
+            request_id=request_id,
+            callback_url="http://example.com/hook",
+            tenant=tenant,
+            priority=priority
+        )
+    
+    @pytest.mark.asyncio
+    async def test_claim_round_trips_request_by_priority(self, queue):
+        # Arrange
+        await queue.enqueue(self._request("batch"), JobKind.CREATE)
+        await queue.enqueue(self._request("urgent", JobPriority.INTERACTIVE), JobKind.APPEND)
+        
+        # Act
+        job = await queue.claim("worker-a", lease_seconds=30)
+        
+        # Assert
+        assert job.kind == JobKind.APPEND
+        assert job.attempts == 1
+        assert job.request == self._request("urgent", JobPriority.INTERACTIVE)
+    
+    @pytest.mark.asyncio
+    async def test_leased_job_is_invisible_until_lease_expires(self, queue, clock, tmp_path):
+        # Arrange
+        other_process = SQLiteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2, clock=clock)
+        await queue.enqueue(self._request("test-123"), JobKind.CREATE)
+        job = await queue.claim("worker-a", lease_seconds=30)
+        
+        # Act
+        while_leased = await other_process.claim("worker-b", lease_seconds=30)
+        clock.now += 31
+        reclaimed = await other_process.claim("worker-b", lease_seconds=30)
+        
+        # Assert
+        assert while_leased is None
+        assert reclaimed.job_id == job.job_id
+        assert reclaimed.attempts == 2
+        assert await queue.heartbeat(job.job_id, "worker-a", 30) is False
+        assert await other_process.heartbeat(job.job_id, "worker-b", 30) is True
+    
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_lease(self, queue, clock):
+        # Arrange
+        await queue.enqueue(self._request("test-123"), JobKind.CREATE)
+        job = await queue.claim("worker-a", lease_seconds=30)
+        
+        # Act
+        clock.now += 20
+        await queue.heartbeat(job.job_id, "worker-a", 30)
+        clock.now += 20
+        
+        # Assert
+        assert await queue.claim("worker-b", lease_seconds=30) is None
+    
+    @pytest.mark.asyncio
+    async def test_release_retries_then_fails(self, queue):
+        # Arrange
+        await queue.enqueue(self._request("test-123"), JobKind.CREATE)
+        
+        # Act
+        first = await queue.claim("worker-a", lease_seconds=30)
+        await queue.release(first.job_id, "worker-a", "boom")
+        second = await queue.claim("worker-a", lease_seconds=30)
+        await queue.release(second.job_id, "worker-a", "boom")
+        
+        # Assert
+        assert second.job_id == first.job_id
+        assert await queue.claim("worker-a", lease_seconds=30) is None
+        assert await queue.counts() == {"failed": 1}
+    
+    @pytest.mark.asyncio
+    async def test_reap_expired_fails_exhausted_jobs(self, queue, clock):
+        # Arrange
+        await queue.enqueue(self._request("test-123"), JobKind.CREATE)
+        await queue.claim("worker-a", lease_seconds=30)
+        clock.now += 31
+        await queue.claim("worker-b", lease_seconds=30)
+        clock.now += 31
+        
+        # Act
+        reaped = await queue.reap_expired()
+        
+        # Assert
+        assert [job.request.request_id for job in reaped] == ["test-123"]
+        assert await queue.claim("worker-c", lease_seconds=30) is None
+        assert await queue.reap_expired() == []
+    
+    @pytest.mark.asyncio
+    async def test_reap_expired_purges_finished_jobs_past_retention(self, tmp_path, clock):
+        # Arrange
+        queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), max_attempts=1, clock=clock, retention_seconds=3600)
+        await queue.enqueue(self._request("old"), JobKind.CREATE)
+        await queue.cancel("old")
+        clock.now += 1800
+        await queue.enqueue(self._request("recent"), JobKind.CREATE)
+        await queue.cancel("recent")
+        await queue.enqueue(self._request("pending"), JobKind.CREATE)
+        clock.now += 1801
+        
+        # Act
+        await queue.reap_expired()
+        
+        # Assert
+        assert await queue.counts() == {"cancelled": 1, "pending": 1}
+    
+    @pytest.mark.asyncio
+    async def test_claims_jobs_enqueued_before_compression(self, tmp_path, clock):
+        # Arrange
+        path = str(tmp_path / "legacy.db")
+        request = self._request("test-123")
+        legacy = SQLiteJobQueue(path, clock=clock)
+        await legacy.enqueue(request, JobKind.CREATE)
+        # Pre-compression rows hold the JSON payload as text
+        legacy._conn.execute(
+            "UPDATE summary_jobs SET payload = CAST(substr(payload, 2) AS TEXT)"
+        )
+        queue = SQLiteJobQueue(path, clock=clock, codec=TextCodec("zlib", min_size=0))
+        
+        # Act
+        job = await queue.claim("worker-a", lease_seconds=30)
+        
+        # Assert
+        assert job.request == request
+    
+    @pytest.mark.asyncio
+    async def test_complete_and_cancel(self, queue):
+        # Arrange
+        await queue.enqueue(self._request("done"), JobKind.CREATE)
+        await queue.enqueue(self._request("queued"), JobKind.CREATE)
+        job = await queue.claim("worker-a", lease_seconds=30)
+        
+        # Act
+        await queue.complete(job.job_id, "worker-a")
+        cancelled = await queue.cancel("queued")
+        
+        # Assert
+        assert cancelled is True
+        assert await queue.cancel("done") is False
+        assert await queue.counts() == {"cancelled": 1}
+    
+    @pytest.mark.asyncio
+    async def test_tenants_take_turns_within_a_priority(self, queue, clock):
+        # Arrange
+        for i in range(3):
+            await queue.enqueue(self._request(f"flood-{i}", tenant="flood"), JobKind.CREATE)
+            clock.now += 1
+        await queue.enqueue(self._request("quiet-0", tenant="quiet"), JobKind.CREATE)
+        await queue.enqueue(self._request("urgent", JobPriority.INTERACTIVE, tenant="flood"), JobKind.CREATE)
+        
+        # Act
+        claimed = []
+        while (job := await queue.claim("worker-a", lease_seconds=30)) is not None:
+            claimed.append(job.request.request_id)
+        
+        # Assert
+        assert claimed == ["urgent", "quiet-0", "flood-0", "flood-1", "flood-2"]
+    
+    @pytest.mark.asyncio
+    async def test_request_cancel_flags_only_claimed_jobs(self, queue):
+        # Arrange
+        await queue.enqueue(self._request("running"), JobKind.CREATE)
+        job = await queue.claim("worker-a", lease_seconds=30)
+        await queue.enqueue(self._request("queued"), JobKind.CREATE)
+        
+        # Act
+        flagged = await queue.request_cancel("running")
+        not_claimed = await queue.request_cancel("queued")
+        
+        # Assert
+        assert (flagged, not_claimed) == (True, False)
+        assert await queue.cancel_requested(job.job_id) is True
+    
+    @pytest.mark.asyncio
+    async def test_adds_new_columns_to_existing_table(self, tmp_path, clock):
+        # Arrange
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE summary_jobs (job_id TEXT PRIMARY KEY, request_id TEXT NOT NULL, kind TEXT NOT NULL, "
+            "payload BLOB NOT NULL, priority_rank INTEGER NOT NULL, state TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, worker_id TEXT, lease_expires_at REAL, last_error TEXT, "
+            "created_at REAL NOT NULL)"
+        )
+        conn.close()
+        queue = SQLiteJobQueue(path, clock=clock)
+        await queue.enqueue(self._request("test-123"), JobKind.CREATE)
+        
+        # Act
+        job = await queue.claim("worker-a", lease_seconds=30)
+        
+        # Assert
+        assert job.request.tenant == "search"
+        assert await queue.cancel_requested(job.job_id) is False
+
+
+class _CallbackReceiver:
+    """Local stand-in for a client's webhook endpoint"""
+    
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = []
+        receiver = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append((dict(self.headers), body))
+                status = receiver.statuses.pop(0) if receiver.statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/callback"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestWebhookNotifier:
+    @pytest.fixture
+    def result(self):
+        return SummaryResult(
+            request_id="test-123",
+            summary="Final summary",
+            status=SummaryStatus.COMPLETED
+        )
+    
+    @pytest.mark.asyncio
+    async def test_delivers_signed_result(self, result):
+        # Arrange
+        receiver = _CallbackReceiver([200])
+        notifier = WebhookNotifier(secret="s3cret", allow_private_targets=True)
+        
+        # Act
+        try:
+            await notifier.notify(receiver.url, result)
+            await notifier.join()
+        finally:
+            await notifier.close()
+            receiver.close()
+        
+        # Assert
+        assert len(receiver.requests) == 1
+        headers, body = receiver.requests[0]
+        payload = json.loads(body)
+        assert payload["request_id"] == "test-123"
+        assert payload["summary"] == "Final summary"
+        assert payload["status"] == "completed"
+        expected = hmac.new(
+            b"s3cret", headers["X-Summary-Timestamp"].encode() + b"." + body, hashlib.sha256
+        ).hexdigest()
+        assert headers["X-Summary-Signature"] == f"sha256={expected}"
+    
+    @pytest.mark.asyncio
+    async def test_retries_server_errors(self, result):
+        # Arrange
+        receiver = _CallbackReceiver([503, 500, 200])
+        notifier = WebhookNotifier(backoff_base=0.01, allow_private_targets=True)
+        
+        # Act
+        try:
+            await notifier.notify(receiver.url, result)
+            await notifier.join()
+        finally:
+            await notifier.close()
+            receiver.close()
+        
+        # Assert
+        assert len(receiver.requests) == 3
+        assert "X-Summary-Signature" not in receiver.requests[0][0]
+    
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self, result):
+        # Arrange
+        receiver = _CallbackReceiver([404])
+        notifier = WebhookNotifier(backoff_base=0.01, allow_private_targets=True)
+        
+        # Act
+        try:
+            await notifier.notify(receiver.url, result)
+            await notifier.join()
+        finally:
+            await notifier.close()
+            receiver.close()
+        
+        # Assert
+        assert len(receiver.requests) == 1
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_without_blocking(self, result):
+        # Arrange
+        notifier = WebhookNotifier(max_queue_size=1, workers=1, max_attempts=1, allow_private_targets=True)
+        
+        # Act
+        started = time.perf_counter()
+        try:
+            for _ in range(5):
+                await notifier.notify("http://127.0.0.1:9/unreachable", result)
+            elapsed = time.perf_counter() - started
+        finally:
+            await notifier.close()
+        
+        # Assert
+        assert notifier.dropped == 4
+        assert elapsed < 0.5
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("url", [
+        "http://127.0.0.1:8080/hook",
+        "http://10.0.0.5/hook",
+        "http://169.254.169.254/latest/meta-data",
+        "http://[::1]/hook",
+        "http://localhost/hook",
+        "http://[64:ff9b::a00:5]/hook",
+        "http://[2002:a00:5::1]/hook",
+        "ftp://example.com/hook"
+    ])
+    async def test_rejects_non_public_targets(self, url):
+        # Arrange
+        notifier = WebhookNotifier()
+        
+        # Act / Assert
+        with pytest.raises(ValueError):
+            await notifier.check_target(url)
+    
+    @pytest.mark.asyncio
+    async def test_does_not_deliver_to_private_target(self, result):
+        # Arrange
+        receiver = _CallbackReceiver([200])
+        notifier = WebhookNotifier()
+        
+        # Act
+        try:
+            await notifier.notify(receiver.url, result)
+            await notifier.join()
+        finally:
+            await notifier.close()
+            receiver.close()
+        
+        # Assert
+        assert receiver.requests == []
+    
+    @pytest.mark.asyncio
+    async def test_delivers_to_validated_address_without_resolving_again(self, result):
+        # Arrange
+        receiver = _CallbackReceiver([200])
+        port = receiver.server.server_port
+        notifier = WebhookNotifier()
+        
+        # Act
+        try:
+            with patch.object(notifier, "check_target", AsyncMock(return_value="127.0.0.1")):
+                await notifier.notify(f"http://callback.invalid:{port}/callback", result)
+                await notifier.join()
+        finally:
+            await notifier.close()
+            receiver.close()
+        
+        # Assert
+        assert len(receiver.requests) == 1
+        assert receiver.requests[0][0]["Host"] == f"callback.invalid:{port}"
+    
+    @pytest.mark.asyncio
+    async def test_close_delivers_queued_callbacks(self, result):
+        # Arrange
+        receiver = _CallbackReceiver([200])
+        notifier = WebhookNotifier(allow_private_targets=True)
+        await notifier.notify(receiver.url, result)
+        
+        # Act
+        try:
+            await notifier.close()
+        finally:
+            receiver.close()
+        
+        # Assert
+        assert len(receiver.requests) == 1
+        assert notifier.snapshot() == {"queued": 0, "dropped": 0}
+
+
+class TestRoutingLLMService:
+    @pytest.fixture
+    def stage_services(self):
+        services = []
+        for name in ("initial", "refine", "final"):
+            service = Mock(spec=LLMService)
+            service.generate_initial_summary = AsyncMock(return_value=name)
+            service.refine_summary = AsyncMock(return_value=name)
+            service.condense_summary = AsyncMock(return_value=name)
+            service.consolidate_summaries = AsyncMock(return_value=name)
+            services.append(service)
+        return services
+    
+    @pytest.mark.asyncio
+    async def test_routes_each_stage(self, stage_services):
+        # Arrange
+        initial, refine, final = stage_services
+        router = RoutingLLMService(initial, refine, final)
+        
+        # Act & Assert
+        assert await router.generate_initial_summary("content") == "initial"
+        assert await router.refine_summary("summary", "content") == "refine"
+        assert await router.condense_summary("summary", 100) == "refine"
+        assert await router.consolidate_summaries("partials") == "final"
+        refine.refine_summary.assert_called_once_with("summary", "content")
+        final.consolidate_summaries.assert_called_once_with("partials")
+    
+    @pytest.mark.asyncio
+    async def test_unconfigured_stages_use_initial_service(self, stage_services):
+        # Arrange
+        initial = stage_services[0]
+        router = RoutingLLMService(initial)
+        
+        # Act & Assert
+        assert await router.refine_summary("summary", "content") == "initial"
+        assert await router.consolidate_summaries("partials") == "initial"
+
+
+def _llm_stub(initial_summary):
+    service = Mock(spec=LLMService)
+    service.generate_initial_summary = AsyncMock(return_value=initial_summary)
+    return service
+
+
+class TestCircuitBreakerLLMService:
+    @pytest.mark.asyncio
+    async def test_only_probe_result_decides_half_open_circuit(self):
+        # Arrange
+        release = asyncio.Event()
+        
+        async def primary_call(content):
+            if content == "slow":
+                await release.wait()
+                return "late"
+            raise Exception("Overloaded")
+        
+        primary = _llm_stub("primary")
+        primary.generate_initial_summary.side_effect = primary_call
+        breaker = CircuitBreakerLLMService(primary, _llm_stub("fallback"), min_calls=1, reset_timeout=0.05)
+        slow_call = asyncio.create_task(breaker.generate_initial_summary("slow"))
+        await asyncio.sleep(0)
+        await breaker.generate_initial_summary("fails")
+        await asyncio.sleep(0.06)
+        
+        # Act
+        release.set()
+        late_result = await slow_call
+        
+        # Assert
+        assert late_result == "late"
+        assert breaker.state == CircuitState.HALF_OPEN
+    
+    @pytest.mark.asyncio
+    async def test_opens_after_error_rate_and_routes_to_fallback(self):
+        # Arrange
+        primary = _llm_stub("primary")
+        primary.generate_initial_summary.side_effect = Exception("Overloaded")
+        fallback = _llm_stub("fallback")
+        breaker = CircuitBreakerLLMService(primary, fallback, min_calls=2, reset_timeout=60)
+        
+        # Act
+        results = [await breaker.generate_initial_summary("content") for _ in range(4)]
+        
+        # Assert
+        assert results == ["fallback"] * 4
+        assert breaker.state == CircuitState.OPEN
+        assert primary.generate_initial_summary.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_slow_calls_count_as_failures(self):
+        # Arrange
+        breaker = CircuitBreakerLLMService(
+            _llm_stub("primary"), _llm_stub("fallback"), min_calls=1, latency_threshold=-1
+        )
+        
+        # Act
+        result = await breaker.generate_initial_summary("content")
+        
+        # Assert
+        assert result == "primary"
+        assert breaker.state == CircuitState.OPEN
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes_circuit(self):
+        # Arrange
+        primary = _llm_stub("primary")
+        primary.generate_initial_summary.side_effect = [Exception("Overloaded"), "primary"]
+        breaker = CircuitBreakerLLMService(primary, _llm_stub("fallback"), min_calls=1, reset_timeout=0)
+        await breaker.generate_initial_summary("content")
+        
+        # Act
+        result = await breaker.generate_initial_summary("content")
+        
+        # Assert
+        assert result == "primary"
+        assert breaker.state == CircuitState.CLOSED
+    
+    @pytest.mark.asyncio
+    async def test_open_without_fallback_fails_fast(self):
+        # Arrange
+        primary = _llm_stub("primary")
+        primary.generate_initial_summary.side_effect = Exception("Overloaded")
+        breaker = CircuitBreakerLLMService(primary, min_calls=1, reset_timeout=60)
+        with pytest.raises(Exception, match="Overloaded"):
+            await breaker.generate_initial_summary("content")
+        
+        # Act & Assert
+        with pytest.raises(CircuitOpenError):
+            await breaker.generate_initial_summary("content")
+        assert primary.generate_initial_summary.call_count == 1
+        assert breaker.snapshot()["state"] == "open"
+
+
+class TestSimulatedLLMService:
+    @pytest.mark.asyncio
+    async def test_latency_follows_token_rate_and_speedup(self):
+        # Arrange
+        service = SimulatedLLMService(
+            tokens_per_second=100, time_to_first_token=1.0, jitter=0, speedup=100, min_output_tokens=100
+        )
+        
+        # Act
+        start = time.perf_counter()
+        summary = await service.generate_initial_summary("short content")
+        elapsed = time.perf_counter() - start
+        
+        # Assert
+        assert summary
+        assert 0.015 <= elapsed < 0.5
+        assert service.snapshot()["latency_p50_seconds"] == pytest.approx(2.0, abs=0.5)
+    
+    @pytest.mark.asyncio
+    async def test_records_usage_with_model_prices(self):
+        # Arrange
+        meter = UsageMeter()
+        service = SimulatedLLMService(speedup=1000, usage_meter=meter, model_name="claude-3-5-sonnet-latest")
+        
+        # Act
+        with track_usage() as usage:
+            await service.refine_summary("existing summary", "x" * 4000)
+        
+        # Assert
+        assert usage.llm_calls == 1
+        assert usage.input_tokens >= 1000
+        assert usage.cost_usd > 0
+        assert meter.snapshot()["simulated:claude-3-5-sonnet-latest"].llm_calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_requests_over_rate_limit_get_429(self):
+        # Arrange
+        service = SimulatedLLMService(requests_per_minute=1, max_retries=0, speedup=1000, clock=lambda: 0.0)
+        await service.generate_initial_summary("content")
+        
+        # Act & Assert
+        with pytest.raises(SimulatedAPIError) as error:
+            await service.generate_initial_summary("content")
+        assert error.value.status_code == 429
+        assert error.value.retry_after == pytest.approx(60)
+        assert service.snapshot()["rate_limited"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_request_larger_than_token_limit_fails_without_retries(self):
+        # Arrange
+        service = SimulatedLLMService(input_tokens_per_minute=100, max_retries=2, speedup=1000, clock=lambda: 0.0)
+        
+        # Act & Assert
+        with pytest.raises(SimulatedAPIError) as error:
+            await service.generate_initial_summary("x" * 1000)
+        assert error.value.status_code == 400
+        assert service.snapshot()["attempts"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_token_limited_attempt_does_not_use_request_limit(self):
+        # Arrange
+        service = SimulatedLLMService(
+            requests_per_minute=2, input_tokens_per_minute=100, max_retries=0, speedup=1000, clock=lambda: 0.0
+        )
+        await service.generate_initial_summary("x" * 360)
+        
+        # Act
+        with pytest.raises(SimulatedAPIError) as error:
+            await service.generate_initial_summary("x" * 360)
+        
+        # Assert
+        assert error.value.status_code == 429
+        assert service._requests.level == 1
+        assert service._input_tokens.level == 10
+    
+    @pytest.mark.asyncio
+    async def test_retries_overloaded_errors_then_fails(self):
+        # Arrange
+        service = SimulatedLLMService(error_rate=1, max_retries=2, speedup=1000)
+        
+        # Act & Assert
+        with pytest.raises(SimulatedAPIError) as error:
+            await service.consolidate_summaries("partials")
+        assert error.value.status_code == 529
+        snapshot = service.snapshot()
+        assert (snapshot["attempts"], snapshot["errors"], snapshot["failed_calls"]) == (3, 3, 1)
+        assert snapshot["in_flight"] == 0
@@ -0,0 +1,241 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from src.domain import JobPriority
+from src.use_cases import JobRunner
+
+
+class TestJobRunner:
+    @pytest.mark.asyncio
+    async def test_run_returns_job_result(self):
+        # Arrange
+        runner = JobRunner()
+        
+        async def job():
+            return "done"
+        
+        # Act
+        result = await runner.run("test-123", job())
+        
+        # Assert
+        assert result == "done"
+        assert not runner.is_running("test-123")
+    
+    @pytest.mark.asyncio
+    async def test_cancel_interrupts_in_flight_job(self):
+        # Arrange
+        runner = JobRunner()
+        started = asyncio.Event()
+        
+        async def job():
+            started.set()
+            await asyncio.sleep(60)
+        
+        run = asyncio.create_task(runner.run("test-123", job()))
+        await started.wait()
+        
+        # Act
+        cancelled = runner.cancel("test-123")
+        result = await asyncio.wait_for(run, timeout=1)
+        
+        # Assert
+        assert cancelled is True
+        assert result is None
+        assert runner.running_jobs == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job_frees_slot(self):
+        # Arrange
+        runner = JobRunner(max_concurrent_jobs=1)
+        release = asyncio.Event()
+        
+        async def blocking_job():
+            await release.wait()
+            return "first"
+        
+        async def queued_job():
+            return "second"
+        
+        first = asyncio.create_task(runner.run("first", blocking_job()))
+        second = asyncio.create_task(runner.run("second", queued_job()))
+        await asyncio.sleep(0)
+        
+        # Act
+        runner.cancel("second")
+        release.set()
+        
+        # Assert
+        assert await second is None
+        assert await first == "first"
+        assert await runner.run("third", queued_job()) == "second"
+    
+    @pytest.mark.asyncio
+    async def test_submitted_job_is_cancellable_before_it_runs(self):
+        # Arrange
+        runner = JobRunner()
+        cancelled_before_start = []
+        
+        async def job():
+            return "done"
+        
+        async def on_cancelled_before_start():
+            cancelled_before_start.append(True)
+        
+        outcome = runner.submit("test-123", job(), on_cancelled_before_start=on_cancelled_before_start)
+        
+        # Act
+        cancelled = runner.cancel("test-123")
+        
+        # Assert
+        assert cancelled is True
+        assert await outcome is None
+        assert cancelled_before_start == [True]
+        assert not runner.is_running("test-123")
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_started_job_skips_before_start_callback(self):
+        # Arrange
+        runner = JobRunner()
+        started = asyncio.Event()
+        on_cancelled_before_start = AsyncMock()
+        
+        async def job():
+            started.set()
+            await asyncio.sleep(60)
+        
+        outcome = runner.submit("test-123", job(), on_cancelled_before_start=on_cancelled_before_start)
+        await started.wait()
+        
+        # Act
+        runner.cancel("test-123")
+        
+        # Assert
+        assert await outcome is None
+        on_cancelled_before_start.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_freed_slots_are_shared_fairly_across_tenants(self):
+        # Arrange
+        runner = JobRunner(max_concurrent_jobs=1)
+        release = asyncio.Event()
+        order = []
+        
+        async def blocking_job():
+            await release.wait()
+        
+        async def job(name):
+            order.append(name)
+        
+        blocker = asyncio.create_task(runner.run("blocker", blocking_job(), tenant="flood"))
+        await asyncio.sleep(0)
+        runs = [
+            asyncio.create_task(runner.run(f"flood-{i}", job(f"flood-{i}"), tenant="flood"))
+            for i in range(3)
+        ]
+        runs.append(asyncio.create_task(runner.run("quiet", job("quiet"), tenant="quiet")))
+        runs.append(asyncio.create_task(
+            runner.run("urgent", job("urgent"), tenant="flood", priority=JobPriority.INTERACTIVE)
+        ))
+        await asyncio.sleep(0)
+        
+        # Act
+        release.set()
+        await asyncio.gather(blocker, *runs)
+        
+        # Assert
+        assert order[0] == "urgent"
+        assert order.index("quiet") <= 2
+        metrics = runner.metrics()
+        assert metrics["flood"]["completed"] == 5
+        assert metrics["quiet"]["queued"] == 0
+        assert metrics["quiet"]["latency_p99_seconds"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_gated_jobs_start_in_fair_queue_order(self):
+        # Arrange
+        runner = JobRunner(max_concurrent_jobs=1)
+        release = asyncio.Event()
+        order = []
+        # Stands in for a token budget that only one job fits at a time
+        tokens = asyncio.Lock()
+        
+        async def blocking_job():
+            await release.wait()
+        
+        async def job(name):
+            order.append(name)
+        
+        blocker = asyncio.create_task(runner.run("blocker", blocking_job(), tenant="flood", gate=tokens))
+        await asyncio.sleep(0)
+        runs = [
+            asyncio.create_task(runner.run(f"flood-{i}", job(f"flood-{i}"), tenant="flood", gate=tokens))
+            for i in range(3)
+        ]
+        runs.append(asyncio.create_task(
+            runner.run("urgent", job("urgent"), tenant="other", priority=JobPriority.INTERACTIVE, gate=tokens)
+        ))
+        await asyncio.sleep(0)
+        
+        # Act
+        release.set()
+        await asyncio.gather(blocker, *runs)
+        
+        # Assert
+        assert order[0] == "urgent"
+    
+    @pytest.mark.asyncio
+    async def test_idle_tenants_beyond_cap_are_forgotten(self):
+        # Arrange
+        runner = JobRunner(max_tracked_tenants=3)
+        
+        async def job():
+            return None
+        
+        # Act
+        for i in range(10):
+            await runner.run(f"request-{i}", job(), tenant=f"tenant-{i}")
+        
+        # Assert
+        assert list(runner.metrics()) == ["tenant-7", "tenant-8", "tenant-9"]
+    
+    @pytest.mark.asyncio
+    async def test_drain_cancels_jobs_still_running_at_timeout(self):
+        # Arrange
+        runner = JobRunner(max_concurrent_jobs=1)
+        started = asyncio.Event()
+        cancelled = []
+        on_cancelled_before_start = AsyncMock()
+        
+        async def quick_job():
+            return "quick"
+        
+        async def stuck_job():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        
+        quick = runner.submit("quick", quick_job())
+        stuck = runner.submit("stuck", stuck_job())
+        queued = runner.submit("queued", quick_job(), on_cancelled_before_start=on_cancelled_before_start)
+        await started.wait()
+        
+        # Act
+        await runner.drain(timeout=0.05)
+        
+        # Assert
+        assert await quick == "quick"
+        assert await stuck is None
+        assert await queued is None
+        assert cancelled == [True]
+        on_cancelled_before_start.assert_awaited_once()
+        assert runner.running_jobs == 0
+    
+    def test_cancel_unknown_job(self):
+        assert JobRunner().cancel("nonexistent") is False
+    
+    def test_rejects_non_positive_limit(self):
+        with pytest.raises(ValueError):
+            JobRunner(max_concurrent_jobs=0)
@@ -0,0 +1,76 @@
+import json
+import logging
+import pytest
+from config.logging import DebugSamplingFilter, DeferredFormattingQueueHandler, JsonFormatter
+
+
+def _record(level=logging.DEBUG, msg="Saving progress for request %s", args=("test-123",), lineno=10):
+    return logging.LogRecord("src.test", level, "/src/test.py", lineno, msg, args, None)
+
+
+class TestJsonFormatter:
+    def test_formats_record_as_json(self):
+        # Arrange
+        record = _record(level=logging.INFO)
+        record.request_id = "test-123"
+        
+        # Act
+        payload = json.loads(JsonFormatter().format(record))
+        
+        # Assert
+        assert payload["level"] == "INFO"
+        assert payload["logger"] == "src.test"
+        assert payload["message"] == "Saving progress for request test-123"
+        assert payload["request_id"] == "test-123"
+
+
+class TestDebugSamplingFilter:
+    def test_samples_debug_records_per_call_site(self):
+        # Arrange
+        sampling_filter = DebugSamplingFilter(sample_every=3)
+        
+        # Act
+        passed = [sampling_filter.filter(_record()) for _ in range(6)]
+        
+        # Assert
+        assert passed == [True, False, False, True, False, False]
+    
+    def test_never_drops_info_and_above(self):
+        # Arrange
+        sampling_filter = DebugSamplingFilter(sample_every=100)
+        
+        # Act & Assert
+        assert all(sampling_filter.filter(_record(level=logging.INFO)) for _ in range(5))
+    
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            DebugSamplingFilter(sample_every=0)
+
+
+class TestDeferredFormattingQueueHandler:
+    def test_leaves_message_unformatted(self):
+        # Arrange
+        handler = DeferredFormattingQueueHandler(None)
+        record = _record()
+        
+        # Act
+        prepared = handler.prepare(record)
+        
+        # Assert
+        assert prepared.msg == "Saving progress for request %s"
+        assert prepared.args == ("test-123",)
+        assert prepared.getMessage() == "Saving progress for request test-123"
+    
+    def test_formats_mutable_args_on_the_caller(self):
+        # Arrange
+        handler = DeferredFormattingQueueHandler(None)
+        documents = ["a.md"]
+        record = _record(msg="Parsing %s", args=(documents,))
+        
+        # Act
+        prepared = handler.prepare(record)
+        documents.append("b.md")
+        
+        # Assert
+        assert prepared.args is None
+        assert prepared.getMessage() == "Parsing ['a.md']"
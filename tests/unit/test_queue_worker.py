@@ -0,0 +1,218 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.domain import (
+    CompletionNotifier,
+    Document,
+    JobKind,
+    LLMService,
+    SummaryProgress,
+    SummaryRequest,
+    SummaryResult,
+    SummaryService,
+    SummaryStatus
+)
+from src.infrastructure import InMemorySummaryRepository, SQLiteJobQueue
+from src.use_cases import JobRunner, QueueWorker, SummaryUseCase
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+
+
+@pytest.fixture
+def service():
+    service = Mock(spec=SummaryService)
+    service.create_summary = AsyncMock(return_value=SummaryResult("test-123", "Summary", SummaryStatus.COMPLETED))
+    service.append_documents = AsyncMock(return_value=SummaryResult("test-123", "Summary", SummaryStatus.COMPLETED))
+    return service
+
+
+@pytest.fixture
+def repository():
+    return InMemorySummaryRepository()
+
+
+def make_request(request_id="test-123"):
+    return SummaryRequest(documents=[Document(content="Content")], request_id=request_id)
+
+
+class TestQueueWorker:
+    @pytest.mark.asyncio
+    async def test_run_once_processes_and_completes_job(self, queue, service, repository):
+        # Arrange
+        worker = QueueWorker(queue, service, JobRunner(), repository, worker_id="worker-a")
+        await queue.enqueue(make_request(), JobKind.APPEND)
+        
+        # Act
+        processed = await worker.run_once()
+        
+        # Assert
+        assert processed is True
+        service.append_documents.assert_called_once_with(make_request())
+        assert await queue.counts() == {}
+        assert await worker.run_once() is False
+    
+    @pytest.mark.asyncio
+    async def test_failed_job_is_released_for_retry(self, queue, service, repository):
+        # Arrange
+        service.append_documents = AsyncMock(side_effect=ValueError("No completed summary"))
+        worker = QueueWorker(queue, service, JobRunner(), repository, worker_id="worker-a")
+        await queue.enqueue(make_request(), JobKind.APPEND)
+        
+        # Act
+        await worker.run_once()
+        
+        # Assert
+        assert await queue.counts() == {"pending": 1}
+    
+    @pytest.mark.asyncio
+    async def test_lost_lease_cancels_local_run(self, queue, service, repository):
+        # Arrange
+        started = asyncio.Event()
+        
+        async def slow_summary(request):
+            started.set()
+            await asyncio.sleep(60)
+        
+        service.create_summary = slow_summary
+        queue.heartbeat = AsyncMock(return_value=False)
+        worker = QueueWorker(queue, service, JobRunner(), repository, worker_id="worker-a", lease_seconds=0.03)
+        await queue.enqueue(make_request(), JobKind.CREATE)
+        
+        # Act
+        await asyncio.wait_for(worker.run_once(), timeout=1)
+        
+        # Assert
+        assert started.is_set()
+        assert await queue.counts() == {"leased": 1}
+    
+    @pytest.mark.asyncio
+    async def test_lost_lease_records_nothing_and_spares_other_jobs(self, queue, repository):
+        # Arrange
+        async def slow_summary(content):
+            await asyncio.sleep(60)
+        
+        llm_service = Mock(spec=LLMService)
+        llm_service.generate_initial_summary = AsyncMock(side_effect=slow_summary)
+        notifier = Mock(spec=CompletionNotifier)
+        notifier.notify = AsyncMock()
+        runner = JobRunner()
+        worker = QueueWorker(
+            queue,
+            SummaryUseCase(llm_service, repository, notifier=notifier),
+            runner,
+            repository,
+            worker_id="worker-a",
+            lease_seconds=0.03
+        )
+        queue.heartbeat = AsyncMock(return_value=False)
+        request = SummaryRequest(
+            documents=[Document(content="Content")],
+            request_id="test-123",
+            callback_url="https://example.com/hook"
+        )
+        await queue.enqueue(request, JobKind.CREATE)
+        other_job = runner.submit("test-123", asyncio.sleep(60))
+        
+        # Act
+        await asyncio.wait_for(worker.run_once(), timeout=1)
+        
+        # Assert
+        assert not other_job.done()
+        assert (await repository.get_progress("test-123")).status == SummaryStatus.IN_PROGRESS
+        assert await repository.get_result("test-123") is None
+        notifier.notify.assert_not_called()
+        other_job.cancel()
+    
+    @pytest.mark.asyncio
+    async def test_reaps_abandoned_jobs_as_failed(self, queue, service, repository):
+        # Arrange
+        await repository.save_progress(SummaryProgress("test-123", 0, 1, "", SummaryStatus.IN_PROGRESS))
+        await queue.enqueue(make_request(), JobKind.CREATE)
+        for crashed_worker in ("crashed-a", "crashed-b"):
+            await queue.claim(crashed_worker, lease_seconds=0)
+        worker = QueueWorker(queue, service, JobRunner(), repository, worker_id="worker-a")
+        
+        # Act
+        processed = await worker.run_once()
+        
+        # Assert
+        assert processed is False
+        result = await repository.get_result("test-123")
+        assert result.status == SummaryStatus.FAILED
+        assert (await repository.get_progress("test-123")).status == SummaryStatus.FAILED
+        service.create_summary.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_start_and_stop_drain_queue(self, queue, service, repository):
+        # Arrange
+        worker = QueueWorker(
+            queue, service, JobRunner(), repository, worker_id="worker-a", concurrency=2, poll_interval=0.01
+        )
+        for i in range(3):
+            await queue.enqueue(make_request(f"test-{i}"), JobKind.CREATE)
+        
+        # Act
+        await worker.start()
+        while await queue.counts():
+            await asyncio.sleep(0.01)
+        await worker.stop()
+        
+        # Assert
+        assert service.create_summary.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_cancel_requested_elsewhere_cancels_local_run(self, queue, repository):
+        # Arrange
+        async def slow_summary(content):
+            await asyncio.sleep(60)
+        
+        llm_service = Mock(spec=LLMService)
+        llm_service.generate_initial_summary = AsyncMock(side_effect=slow_summary)
+        worker = QueueWorker(
+            queue,
+            SummaryUseCase(llm_service, repository),
+            JobRunner(),
+            repository,
+            worker_id="worker-a",
+            lease_seconds=0.03
+        )
+        await queue.enqueue(make_request(), JobKind.CREATE)
+        run = asyncio.create_task(worker.run_once())
+        while not (await queue.counts()).get("leased"):
+            await asyncio.sleep(0.01)
+        
+        # Act
+        await queue.request_cancel("test-123")
+        await asyncio.wait_for(run, timeout=1)
+        
+        # Assert
+        assert (await repository.get_result("test-123")).status == SummaryStatus.CANCELLED
+        assert await queue.counts() == {}
+    
+    @pytest.mark.asyncio
+    async def test_stop_hands_back_jobs_still_running_at_timeout(self, queue, service, repository):
+        # Arrange
+        started = asyncio.Event()
+        
+        async def slow_summary(request):
+            started.set()
+            await asyncio.sleep(60)
+        
+        service.create_summary = slow_summary
+        worker = QueueWorker(queue, service, JobRunner(), repository, worker_id="worker-a", poll_interval=0.01)
+        await queue.enqueue(make_request(), JobKind.CREATE)
+        await worker.start()
+        await started.wait()
+        
+        # Act
+        await asyncio.wait_for(worker.stop(timeout=0.05), timeout=1)
+        
+        # Assert
+        assert await queue.counts() == {"pending": 1}
+    
+    def test_rejects_non_positive_concurrency(self, queue, service, repository):
+        with pytest.raises(ValueError):
+            QueueWorker(queue, service, JobRunner(), repository, concurrency=0)
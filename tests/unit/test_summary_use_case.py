@@ -1,12 +1,19 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, Mock
 from src.domain import (
     Document, 
+    DocumentPreprocessor,
     SummaryRequest, 
     SummaryProgress, 
+    SummaryResult,
     SummaryStatus,
+    SummaryStrategy,
     LLMService,
-    SummaryRepository
+    SummaryRepository,
+    TokenUsage,
+    prepare_batch,
+    record_usage
 )
 from src.use_cases import SummaryUseCase
 
@@ -16,6 +23,7 @@ def mock_llm_service():
     service = Mock(spec=LLMService)
     service.generate_initial_summary = AsyncMock(return_value="Initial summary")
     service.refine_summary = AsyncMock(return_value="Refined summary")
+    service.consolidate_summaries = AsyncMock(return_value="Consolidated summary")
     return service
 
 
@@ -26,6 +34,7 @@ def mock_repository():
     repo.get_progress = AsyncMock()
     repo.save_result = AsyncMock()
     repo.get_result = AsyncMock()
+    repo.replace_result = AsyncMock(return_value=True)
     return repo
 
 
@@ -145,4 +154,494 @@ class TestSummaryUseCase:
         
         # Assert
         assert result is None
-        mock_repository.get_progress.assert_called_once_with("test-123")
\ No newline at end of file
+        mock_repository.get_progress.assert_called_once_with("test-123")
+
+
+class TestSummaryLengthGovernor:
+    @pytest.fixture
+    def governed_use_case(self, mock_llm_service, mock_repository):
+        mock_llm_service.condense_summary = AsyncMock(return_value="Condensed")
+        return SummaryUseCase(mock_llm_service, mock_repository, summary_token_budget=10)
+    
+    @pytest.mark.asyncio
+    async def test_condenses_when_summary_exceeds_budget(self, governed_use_case, mock_llm_service):
+        # Arrange
+        mock_llm_service.refine_summary.return_value = "x" * 400  # ~100 tokens
+        documents = [Document(content="Content 1"), Document(content="Content 2")]
+        request = SummaryRequest(documents=documents, request_id="test-123")
+        
+        # Act
+        result = await governed_use_case.create_summary(request)
+        
+        # Assert
+        assert result.summary == "Condensed"
+        mock_llm_service.condense_summary.assert_called_once_with("x" * 400, 5)
+    
+    @pytest.mark.asyncio
+    async def test_refine_consumes_condensed_summary(self, governed_use_case, mock_llm_service):
+        # Arrange
+        mock_llm_service.generate_initial_summary.return_value = "y" * 400
+        documents = [Document(content="Content 1"), Document(content="Content 2")]
+        request = SummaryRequest(documents=documents, request_id="test-123")
+        
+        # Act
+        await governed_use_case.create_summary(request)
+        
+        # Assert
+        mock_llm_service.refine_summary.assert_called_once_with("Condensed", "Content 2")
+    
+    @pytest.mark.asyncio
+    async def test_no_condense_within_budget(self, governed_use_case, mock_llm_service):
+        # Arrange
+        documents = [Document(content="Content 1"), Document(content="Content 2")]
+        request = SummaryRequest(documents=documents, request_id="test-123")
+        
+        # Act
+        result = await governed_use_case.create_summary(request)
+        
+        # Assert
+        assert result.summary == "Refined summary"
+        mock_llm_service.condense_summary.assert_not_called()
+    
+    def test_rejects_non_positive_budget(self, mock_llm_service, mock_repository):
+        with pytest.raises(ValueError):
+            SummaryUseCase(mock_llm_service, mock_repository, summary_token_budget=0)
+
+
+class TestHierarchicalStrategy:
+    @pytest.mark.asyncio
+    async def test_summarizes_leaf_sections_and_rolls_up(self, mock_llm_service, mock_repository):
+        # Arrange
+        use_case = SummaryUseCase(mock_llm_service, mock_repository, section_token_threshold=1)
+        content = "# A\n\nText A\n\n## A.1\n\nText A.1\n\n## A.2\n\nText A.2"
+        request = SummaryRequest(
+            documents=[Document(content=content)],
+            request_id="test-123",
+            strategy=SummaryStrategy.HIERARCHICAL
+        )
+        
+        # Act
+        result = await use_case.create_summary(request)
+        
+        # Assert
+        assert result.status == SummaryStatus.COMPLETED
+        assert result.summary == "Consolidated summary"
+        # The lone top-level section is rolled up directly as the consolidation step
+        mock_llm_service.consolidate_summaries.assert_called_once_with(
+            "# A\n\nText A\n\n## A.1\n\nInitial summary\n\n## A.2\n\nInitial summary"
+        )
+        assert mock_llm_service.generate_initial_summary.call_count == 2
+        mock_llm_service.generate_initial_summary.assert_any_call("## A.1\n\nText A.1")
+        mock_llm_service.generate_initial_summary.assert_any_call("## A.2\n\nText A.2")
+        mock_llm_service.refine_summary.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_small_document_uses_single_call(self, summary_use_case, mock_llm_service):
+        # Arrange
+        request = SummaryRequest(
+            documents=[Document(content="# A\n\nText\n\n## B\n\nMore")],
+            request_id="test-123",
+            strategy=SummaryStrategy.HIERARCHICAL
+        )
+        
+        # Act
+        result = await summary_use_case.create_summary(request)
+        
+        # Assert
+        assert result.summary == "Initial summary"
+        mock_llm_service.generate_initial_summary.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_merges_document_summaries_under_titles(self, summary_use_case, mock_llm_service):
+        # Arrange
+        request = SummaryRequest(
+            documents=[Document(content="One", title="Doc 1"), Document(content="Two", title="Doc 2")],
+            request_id="test-123",
+            strategy=SummaryStrategy.HIERARCHICAL
+        )
+        
+        # Act
+        await summary_use_case.create_summary(request)
+        
+        # Assert
+        assert mock_llm_service.generate_initial_summary.call_count == 2
+        mock_llm_service.consolidate_summaries.assert_called_once_with(
+            "# Doc 1\n\nInitial summary\n\n# Doc 2\n\nInitial summary"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_parses_documents_with_preprocessor(self, mock_llm_service, mock_repository):
+        # Arrange
+        preprocessor = Mock(spec=DocumentPreprocessor)
+        preprocessor.prepare = AsyncMock(side_effect=prepare_batch)
+        use_case = SummaryUseCase(mock_llm_service, mock_repository, preprocessor=preprocessor)
+        request = SummaryRequest(
+            documents=[Document(content="# A\n\nOne"), Document(content="# B\n\nTwo")],
+            request_id="test-123",
+            strategy=SummaryStrategy.HIERARCHICAL
+        )
+        
+        # Act
+        result = await use_case.create_summary(request)
+        
+        # Assert
+        assert result.status == SummaryStatus.COMPLETED
+        preprocessor.prepare.assert_called_once_with(["# A\n\nOne", "# B\n\nTwo"])
+        mock_llm_service.generate_initial_summary.assert_any_call("# A\n\nOne")
+
+
+class TestAppendDocuments:
+    @pytest.fixture
+    def completed_job(self, mock_repository):
+        mock_repository.get_result.return_value = SummaryResult(
+            request_id="test-123",
+            summary="Stored summary",
+            status=SummaryStatus.COMPLETED,
+            document_count=2
+        )
+        mock_repository.get_progress.return_value = SummaryProgress(
+            request_id="test-123",
+            current_document_index=2,
+            total_documents=2,
+            current_summary="Stored summary",
+            status=SummaryStatus.COMPLETED
+        )
+    
+    @pytest.mark.asyncio
+    async def test_continues_fold_from_stored_summary(
+        self, summary_use_case, mock_llm_service, mock_repository, completed_job
+    ):
+        # Arrange
+        request = SummaryRequest(documents=[Document(content="Content 3")], request_id="test-123")
+        
+        # Act
+        result = await summary_use_case.append_documents(request)
+        
+        # Assert
+        assert result.summary == "Refined summary"
+        assert result.status == SummaryStatus.COMPLETED
+        assert result.version == 2
+        mock_llm_service.generate_initial_summary.assert_not_called()
+        mock_llm_service.refine_summary.assert_called_once_with("Stored summary", "Content 3")
+        saved_progress = mock_repository.save_progress.call_args.args[0]
+        assert saved_progress.total_documents == 3
+        assert saved_progress.current_document_index == 3
+        assert result.document_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_counts_documents_of_last_successful_result(self, summary_use_case, mock_repository, completed_job):
+        # Arrange
+        mock_repository.get_progress.return_value = SummaryProgress(
+            request_id="test-123",
+            current_document_index=2,
+            total_documents=5,
+            current_summary="Stored summary",
+            status=SummaryStatus.FAILED,
+            version=2
+        )
+        request = SummaryRequest(documents=[Document(content="Content 3")], request_id="test-123")
+        
+        # Act
+        result = await summary_use_case.append_documents(request)
+        
+        # Assert
+        assert mock_repository.save_progress.call_args.args[0].total_documents == 3
+        assert result.document_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_failure_keeps_previous_result(
+        self, summary_use_case, mock_llm_service, mock_repository, completed_job
+    ):
+        # Arrange
+        mock_llm_service.refine_summary.side_effect = Exception("LLM Error")
+        request = SummaryRequest(documents=[Document(content="Content 3")], request_id="test-123")
+        
+        # Act
+        result = await summary_use_case.append_documents(request)
+        
+        # Assert
+        assert result.status == SummaryStatus.FAILED
+        assert result.version == 1
+        mock_repository.save_result.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_version_bump_fails_append(self, summary_use_case, mock_repository, completed_job):
+        # Arrange
+        mock_repository.replace_result.return_value = False
+        request = SummaryRequest(documents=[Document(content="Content 3")], request_id="test-123")
+        
+        # Act
+        result = await summary_use_case.append_documents(request)
+        
+        # Assert
+        assert result.status == SummaryStatus.FAILED
+        assert result.version == 1
+        assert "concurrently" in result.error_message
+        mock_repository.replace_result.assert_called_once()
+        assert mock_repository.replace_result.call_args.args[1] == 1
+        assert mock_repository.save_progress.call_args.args[0].status == SummaryStatus.FAILED
+    
+    @pytest.mark.asyncio
+    async def test_append_locks_are_released(self, summary_use_case, completed_job):
+        # Arrange
+        requests = [SummaryRequest(documents=[Document(content="Content 3")], request_id="test-123") for _ in range(2)]
+        
+        # Act
+        await asyncio.gather(*(summary_use_case.append_documents(request) for request in requests))
+        
+        # Assert
+        assert len(summary_use_case._append_locks) == 0
+    
+    @pytest.mark.asyncio
+    async def test_requires_completed_summary(self, summary_use_case, mock_repository):
+        # Arrange
+        mock_repository.get_result.return_value = None
+        request = SummaryRequest(documents=[Document(content="Content 3")], request_id="test-123")
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await summary_use_case.append_documents(request)
+
+
+class TestCancellation:
+    @pytest.mark.asyncio
+    async def test_cancel_records_cancelled_status(self, summary_use_case, mock_llm_service, mock_repository):
+        # Arrange
+        started = asyncio.Event()
+        
+        async def slow_refine(existing_summary, new_content):
+            started.set()
+            await asyncio.sleep(60)
+        
+        mock_llm_service.refine_summary.side_effect = slow_refine
+        in_flight = SummaryProgress(
+            request_id="test-123",
+            current_document_index=1,
+            total_documents=2,
+            current_summary="Initial summary",
+            status=SummaryStatus.IN_PROGRESS
+        )
+        mock_repository.get_progress.return_value = in_flight
+        documents = [Document(content="Content 1"), Document(content="Content 2")]
+        task = asyncio.create_task(summary_use_case.create_summary(
+            SummaryRequest(documents=documents, request_id="test-123")
+        ))
+        await started.wait()
+        
+        # Act
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        
+        # Assert
+        assert in_flight.status == SummaryStatus.CANCELLED
+        result = mock_repository.save_result.call_args.args[0]
+        assert result.status == SummaryStatus.CANCELLED
+        assert result.summary == "Initial summary"
+
+
+class TestCompletionNotification:
+    @pytest.mark.asyncio
+    async def test_notifies_callback_url(self, mock_llm_service, mock_repository):
+        # Arrange
+        notifier = Mock()
+        notifier.notify = AsyncMock()
+        use_case = SummaryUseCase(mock_llm_service, mock_repository, notifier=notifier)
+        request = SummaryRequest(
+            documents=[Document(content="Content 1")],
+            request_id="test-123",
+            callback_url="http://localhost/callback"
+        )
+        
+        # Act
+        result = await use_case.create_summary(request)
+        
+        # Assert
+        notifier.notify.assert_called_once_with("http://localhost/callback", result)
+    
+    @pytest.mark.asyncio
+    async def test_skips_requests_without_callback(self, mock_llm_service, mock_repository):
+        # Arrange
+        notifier = Mock()
+        notifier.notify = AsyncMock()
+        use_case = SummaryUseCase(mock_llm_service, mock_repository, notifier=notifier)
+        request = SummaryRequest(documents=[Document(content="Content 1")], request_id="test-123")
+        
+        # Act
+        await use_case.create_summary(request)
+        
+        # Assert
+        notifier.notify.assert_not_called()
+
+
+class TestPipelinedRefineStrategy:
+    @pytest.mark.asyncio
+    async def test_refines_with_precondensed_documents(self, mock_llm_service, mock_repository):
+        # Arrange
+        use_case = SummaryUseCase(mock_llm_service, mock_repository, precondense_min_tokens=1)
+        mock_llm_service.generate_initial_summary.side_effect = lambda content: f"condensed {content[:5]}"
+        documents = [Document(content="first " * 10), Document(content="second " * 10), Document(content="short")]
+        request = SummaryRequest(
+            documents=documents,
+            request_id="test-123",
+            strategy=SummaryStrategy.PIPELINED_REFINE
+        )
+        
+        # Act
+        result = await use_case.create_summary(request)
+        
+        # Assert
+        assert result.status == SummaryStatus.COMPLETED
+        assert mock_llm_service.generate_initial_summary.call_count == 3
+        assert [c.args[1] for c in mock_llm_service.refine_summary.call_args_list] == [
+            "condensed secon",
+            "condensed short"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_condenses_next_document_while_refining(self, mock_llm_service, mock_repository):
+        # Arrange
+        use_case = SummaryUseCase(mock_llm_service, mock_repository, refine_lookahead=1, precondense_min_tokens=1)
+        events = []
+        
+        async def condense(content):
+            events.append(("condense", content))
+            return content.upper()
+        
+        async def refine(existing_summary, new_content):
+            events.append(("refine", new_content))
+            await asyncio.sleep(0)
+            return f"{existing_summary}+{new_content}"
+        
+        mock_llm_service.generate_initial_summary.side_effect = condense
+        mock_llm_service.refine_summary.side_effect = refine
+        documents = [Document(content=f"document {i}") for i in range(3)]
+        request = SummaryRequest(
+            documents=documents,
+            request_id="test-123",
+            strategy=SummaryStrategy.PIPELINED_REFINE
+        )
+        
+        # Act
+        result = await use_case.create_summary(request)
+        
+        # Assert
+        assert result.summary == "DOCUMENT 0+DOCUMENT 1+DOCUMENT 2"
+        assert events.index(("condense", "document 2")) < events.index(("refine", "DOCUMENT 1"))
+    
+    @pytest.mark.asyncio
+    async def test_failed_precondense_falls_back_to_document(self, mock_llm_service, mock_repository):
+        # Arrange
+        use_case = SummaryUseCase(mock_llm_service, mock_repository, refine_lookahead=1, precondense_min_tokens=1)
+        
+        async def condense(content):
+            if content == "document 1":
+                raise Exception("Overloaded")
+            return content.upper()
+        
+        mock_llm_service.generate_initial_summary.side_effect = condense
+        mock_llm_service.refine_summary.side_effect = lambda existing, new: f"{existing}+{new}"
+        request = SummaryRequest(
+            documents=[Document(content=f"document {i}") for i in range(3)],
+            request_id="test-123",
+            strategy=SummaryStrategy.PIPELINED_REFINE
+        )
+        
+        # Act
+        result = await use_case.create_summary(request)
+        
+        # Assert
+        assert result.status == SummaryStatus.COMPLETED
+        assert result.summary == "DOCUMENT 0+document 1+DOCUMENT 2"
+    
+    @pytest.mark.asyncio
+    async def test_leaves_short_documents_uncondensed(self, summary_use_case, mock_llm_service):
+        # Arrange
+        documents = [Document(content="Content 1"), Document(content="Content 2")]
+        request = SummaryRequest(
+            documents=documents,
+            request_id="test-123",
+            strategy=SummaryStrategy.PIPELINED_REFINE
+        )
+        
+        # Act
+        await summary_use_case.create_summary(request)
+        
+        # Assert
+        mock_llm_service.generate_initial_summary.assert_called_once_with("Content 1")
+        mock_llm_service.refine_summary.assert_called_once_with("Initial summary", "Content 2")
+
+
+class TestUsageAccounting:
+    @pytest.fixture
+    def metered_llm_service(self, mock_llm_service):
+        def metered(summary, input_tokens):
+            async def call(*args):
+                await asyncio.sleep(0)
+                record_usage(TokenUsage(input_tokens=input_tokens, output_tokens=10, llm_calls=1, cost_usd=0.5))
+                return summary
+            return call
+        
+        mock_llm_service.generate_initial_summary = AsyncMock(side_effect=metered("Initial summary", 100))
+        mock_llm_service.refine_summary = AsyncMock(side_effect=metered("Refined summary", 200))
+        mock_llm_service.consolidate_summaries = AsyncMock(side_effect=metered("Consolidated summary", 50))
+        return mock_llm_service
+    
+    @pytest.mark.asyncio
+    async def test_accumulates_usage_across_concurrent_calls(self, metered_llm_service, mock_repository):
+        # Arrange
+        use_case = SummaryUseCase(metered_llm_service, mock_repository, section_token_threshold=1)
+        request = SummaryRequest(
+            documents=[Document(content="# A\n\nText A"), Document(content="# B\n\nText B")],
+            request_id="test-123",
+            strategy=SummaryStrategy.HIERARCHICAL
+        )
+        
+        # Act
+        result = await use_case.create_summary(request)
+        
+        # Assert
+        initial_calls = metered_llm_service.generate_initial_summary.call_count
+        consolidate_calls = metered_llm_service.consolidate_summaries.call_count
+        assert consolidate_calls == 1
+        assert result.usage.llm_calls == initial_calls + consolidate_calls
+        assert result.usage.input_tokens == initial_calls * 100 + 50
+        assert result.usage.cost_usd == pytest.approx(0.5 * result.usage.llm_calls)
+        saved_progress = mock_repository.save_progress.call_args.args[0]
+        assert saved_progress.usage == result.usage
+    
+    @pytest.mark.asyncio
+    async def test_append_adds_to_previous_usage(self, metered_llm_service, mock_repository):
+        # Arrange
+        mock_repository.get_result.return_value = SummaryResult(
+            request_id="test-123",
+            summary="Stored summary",
+            status=SummaryStatus.COMPLETED,
+            usage=TokenUsage(input_tokens=1000, output_tokens=100, llm_calls=2, cost_usd=1.0)
+        )
+        use_case = SummaryUseCase(metered_llm_service, mock_repository)
+        request = SummaryRequest(documents=[Document(content="Content 3")], request_id="test-123")
+        
+        # Act
+        result = await use_case.append_documents(request)
+        
+        # Assert
+        assert result.usage == TokenUsage(input_tokens=1200, output_tokens=110, llm_calls=3, cost_usd=1.5)
+    
+    @pytest.mark.asyncio
+    async def test_separate_requests_are_tracked_separately(self, metered_llm_service, mock_repository):
+        # Arrange
+        use_case = SummaryUseCase(metered_llm_service, mock_repository)
+        
+        # Act
+        first, second = await asyncio.gather(
+            use_case.create_summary(SummaryRequest(documents=[Document(content="A")], request_id="first")),
+            use_case.create_summary(SummaryRequest(
+                documents=[Document(content="A"), Document(content="B")], request_id="second"
+            ))
+        )
+        
+        # Assert
+        assert first.usage.llm_calls == 1
+        assert second.usage.llm_calls == 2
+        assert second.usage.input_tokens == 300